@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from dotenv import load_dotenv, find_dotenv
+
+# Ensure the app can find the 'src' folder
+sys.path.append(os.path.join(os.getcwd(), "src"))
+# Ensure we can find 'shared_core' (2 levels up from apps/agent_app)
+sys.path.append(os.path.abspath(os.path.join(os.getcwd(), "..", "..")))
+
+load_dotenv(find_dotenv())
+
+OFFLINE_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "offline_form_spec.json")
+DEFAULT_TURNS = [
+    "Hi, I'm Ali and I'd like to fill in the form.",
+    "full name: Ali Khan, age: 25, email: ali@test.com, cnic: 42201-1234567-1",
+]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline graph benchmark (framework overhead without model latency).")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--mode", default=os.getenv("LLM_PROVIDER_MODE", "fake"), choices=["live", "record", "replay", "fake"])
+    parser.add_argument("--latency-ms", type=float, default=None, help="Synthetic latency per replayed / fake LLM call")
+    parser.add_argument("--spec", default=OFFLINE_SPEC, help="Local OpenAPI spec served to the Scout")
+    parser.add_argument("--submit", action="store_true", help="Approve at the Review Gate and run the Submitter (needs the MCP server)")
+    parser.add_argument("--turn", action="append", dest="turns", help="User message; repeat for several turns")
+    return parser.parse_args()
+
+async def run_once(graph, turns, submit):
+    # Replay priority: a bench run against a shared scheduler must not starve interactive turns
+    config = {"configurable": {"thread_id": f"bench_{uuid.uuid4().hex}", "llm_cache_bypass": True, "llm_priority": "replay"}}
+    started = time.perf_counter()
+    for text in turns:
+        await graph.ainvoke({"messages": [("user", text)]}, config)
+    snapshot = await graph.aget_state(config)
+    reached_review = "Review_Gate" in snapshot.next
+    if submit and reached_review:
+        await graph.aupdate_state(config, {"is_approved": True})
+        await graph.ainvoke(None, config)
+    return time.perf_counter() - started, reached_review
+
+async def main():
+    args = parse_args()
+    # Must be set before the nodes import the LLM registry and the schema cache
+    os.environ["LLM_PROVIDER_MODE"] = args.mode
+    if args.spec:
+        os.environ["FORM_GET_SCHEMA_URL"] = f"file://{os.path.abspath(args.spec)}"
+        os.environ.pop("FORM_OPERATION_ID", None)
+    if args.latency_ms is not None:
+        os.environ["LLM_SYNTHETIC_LATENCY_MS"] = str(args.latency_ms)
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from src.agenticAI_full_workflow.agent.agent_workflow import AgentWorkflowBuilder
+    from src.agenticAI_full_workflow.utils.mcp_pool import mcp_pool
+    from src.agenticAI_full_workflow.utils.submission_outbox import submission_outbox
+
+    graph = await AgentWorkflowBuilder().build(checkpointer=MemorySaver(), start_mcp=args.submit)
+    turns = args.turns or DEFAULT_TURNS
+
+    # Warm-up run: imports, schema compile, first-call setup
+    await run_once(graph, turns, args.submit)
+
+    timings, reached = [], 0
+    for _ in range(args.runs):
+        elapsed, at_review = await run_once(graph, turns, args.submit)
+        timings.append(elapsed * 1000)
+        reached += at_review
+
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print("==================================================")
+    print(f" mode={args.mode}  runs={args.runs}  turns/run={len(turns)}")
+    print(f" mean={statistics.mean(timings):.1f} ms  p50={statistics.median(timings):.1f} ms  p95={p95:.1f} ms")
+    print(f" reached Review Gate: {reached}/{args.runs}")
+    print("==================================================")
+    await submission_outbox.aclose()
+    await mcp_pool.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,17 +1,41 @@
-import os
-from fastapi import FastAPI
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # Importing your refined workflow builder
 from src.agenticAI_full_workflow.agent.agent_workflow import AgentWorkflowBuilder
+from src.agenticAI_full_workflow.utils.llm_cache import extraction_cache
+from src.agenticAI_full_workflow.utils.bulk_extractor import BulkExtractor
+from src.agenticAI_full_workflow.utils.form_loader import fetch_form_metadata
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.project_nodes.agent_node import llm as agent_llm
+from src.agenticAI_full_workflow.utils.event_stream import graph_event_stream, prepare_turn
+from src.agenticAI_full_workflow.utils.model_loader import llm_registry
+from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler
+from src.agenticAI_full_workflow.utils.mcp_pool import mcp_pool
+from src.agenticAI_full_workflow.utils.submission_outbox import submission_outbox
+from src.agenticAI_full_workflow.utils.submission_dedup import submission_dedup
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One compiled graph (and checkpointer pool) per process, not per request
+    app.state.graph = await AgentWorkflowBuilder().build()
+    await llm_registry.warmup()
+    yield
+    await submission_outbox.aclose()
+    await mcp_pool.aclose()
+    await llm_registry.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +46,15 @@ app.add_middleware(
 )
 class QueryRequest(BaseModel):
     question: str
+    thread_id: Optional[str] = None
+    approve: bool = False
+
+class BulkExtractRequest(BaseModel):
+    text: str
+    operation_id: Optional[str] = None
+    concurrency: Optional[int] = None
+
+BULK_CONFIG = config_section("bulk")
 
 @app.get("/form-schema")
 async def get_form_schema():
@@ -34,29 +67,105 @@ async def get_form_schema():
         ]
     }
 
-@app.post("/query")
-async def query_travel_agent(query:QueryRequest):
+@app.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    return extraction_cache.stats()
+
+@app.get("/metrics/llm-scheduler")
+async def llm_scheduler_metrics():
+    return llm_scheduler.stats()
+
+@app.get("/metrics/mcp-pool")
+async def mcp_pool_metrics():
+    return mcp_pool.stats()
+
+@app.get("/metrics/backend")
+async def backend_metrics():
+    """
+    Circuit breaker state of the form backend, as reported by the verification MCP server.
+    """
     try:
-        print(query)
-        graph = AgentWorkflowBuilder()
-        react_app=graph()
-        #react_app = graph.build_graph()
+        result = await mcp_pool.call_tool("backend_status", arguments={}, timeout=10)
+        return result.structuredContent or json.loads(result.content[0].text)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"error": str(e)})
+
+@app.get("/metrics/outbox")
+async def outbox_metrics():
+    return await submission_outbox.stats()
 
-        png_graph = react_app.get_graph().draw_mermaid_png()
-        with open("my_graph.png", "wb") as f:
-            f.write(png_graph)
+@app.get("/metrics/submission-dedup")
+async def submission_dedup_metrics():
+    return submission_dedup.stats()
 
-        print(f"Graph saved as 'my_graph.png' in {os.getcwd()}")
-        # Assuming request is a pydantic object like: {"question": "your text"}
-        messages={"messages": [query.question]}
-        output = react_app.invoke(messages)
+@app.get("/submissions/{thread_id}")
+async def submission_status(thread_id: str):
+    """
+    Delivery status of the thread's latest approved submission.
+    """
+    row = await submission_outbox.status(thread_id)
+    if row is None:
+        return JSONResponse(status_code=404, content={"error": "No submission for this thread"})
+    return {k: row[k] for k in ("id", "status", "attempts", "last_error", "result")}
+
+@app.post("/bulk-extract")
+async def bulk_extract(request: BulkExtractRequest):
+    """
+    Splits a pasted export / long email into records and extracts them concurrently.
+    """
+    try:
+        schema = await fetch_form_metadata(request.operation_id)
+        if not schema:
+            return JSONResponse(status_code=502, content={"error": "Could not fetch form schema from API."})
+
+        max_concurrency = int(BULK_CONFIG.get("max_concurrency", 16))
+        concurrency = min(request.concurrency or int(BULK_CONFIG.get("concurrency", 8)), max_concurrency)
+        records = await BulkExtractor(agent_llm, concurrency).extract(request.text, schema)
+        return {
+            "records": records,
+            "total": len(records),
+            "complete": sum(1 for r in records if not r["missing_fields"] and not r["error"]),
+        }
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/query")
+async def query_travel_agent(query: QueryRequest, request: Request):
+    try:
+        graph = request.app.state.graph
+        thread_id = query.thread_id or str(uuid.uuid4())
+        config = {"configurable": {"thread_id": thread_id}}
+
+        inputs = await prepare_turn(graph, config, query.question, query.approve)
+        output = await graph.ainvoke(inputs, config)
 
         # If result is dict with messages:
         if isinstance(output, dict) and "messages" in output:
             final_output = output["messages"][-1].content  # Last AI response
         else:
             final_output = str(output)
-        
-        return {"answer": final_output}
+
+        return {"answer": final_output, "thread_id": thread_id}
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/query/stream")
+async def stream_travel_agent(query: QueryRequest, request: Request):
+    """
+    Same turn as /query, delivered as Server-Sent Events: node progress, Interviewer
+    tokens as they are generated, and the review summary as soon as the Inspector passes.
+    """
+    graph = request.app.state.graph
+    thread_id = query.thread_id or str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+
+    try:
+        inputs = await prepare_turn(graph, config, query.question, query.approve)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+    return StreamingResponse(
+        graph_event_stream(graph, inputs, config),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,9 +2,13 @@ from langgraph.graph import StateGraph, END, START
 from langgraph.checkpoint.memory import MemorySaver # For HITL
 from typing import Literal
 from src.agenticAI_full_workflow.utils.db_manager import db_manager
+from src.agenticAI_full_workflow.utils.mcp_pool import mcp_pool
+from src.agenticAI_full_workflow.utils.submission_outbox import submission_outbox
 from src.agenticAI_full_workflow.agent_state.state import AgentState
 from src.agenticAI_full_workflow.project_nodes.scout_node import scout_node
+from src.agenticAI_full_workflow.project_nodes.fastpath_node import fastpath_node
 from src.agenticAI_full_workflow.project_nodes.agent_node import agent_node
+from src.agenticAI_full_workflow.project_nodes.reconcile_node import reconcile_node
 from src.agenticAI_full_workflow.project_nodes.inspector_node import inspector_node
 from src.agenticAI_full_workflow.project_nodes.interviewer_nodes import interviewer_node
 from src.agenticAI_full_workflow.project_nodes.review_nodes import review_node
@@ -28,23 +32,36 @@ class AgentWorkflowBuilder:
     def __init__(self):
         print("[INFO]: Initializing Agent Workflow Builder...")
 
-    async def build(self):
-        # 1. Initialize Memory for HITL
-        memory = await db_manager.get_checkpointer()
+    async def build(self, checkpointer=None, start_mcp=True):
+        # 1. Initialize Memory for HITL (Postgres unless a checkpointer is passed, e.g. MemorySaver for offline runs)
+        memory = checkpointer if checkpointer is not None else await db_manager.get_checkpointer()
+
+        # MCP sessions live as long as the graph; offline runs that never submit can skip the spawn
+        if start_mcp:
+            await mcp_pool.start()
         workflow = StateGraph(AgentState)
 
         # 2. Add All Nodes
         workflow.add_node("Scout", scout_node)
+        workflow.add_node("FastPath", fastpath_node)
         workflow.add_node("Agent", agent_node)
+        workflow.add_node("Reconcile", reconcile_node)
         workflow.add_node("Inspector", inspector_node)
         workflow.add_node("Interviewer", interviewer_node)
         workflow.add_node("Review_Gate", review_node)
         workflow.add_node("Submitter", submitter_node)
 
         # 3. Define the Flow
-        workflow.add_edge(START, "Scout")
-        workflow.add_edge("Scout", "Agent")
-        workflow.add_edge("Agent", "Inspector")
+        # Rules first, on the last known schema; the Agent (LLM) skips itself when they completed the form
+        workflow.add_edge(START, "FastPath")
+
+        # Speculation: the Scout revalidates the schema while the Agent already extracts
+        workflow.add_edge("FastPath", "Scout")
+        workflow.add_edge("FastPath", "Agent")
+
+        # Wait for both; Reconcile reruns extraction only if the schema changed underneath it
+        workflow.add_edge(["Scout", "Agent"], "Reconcile")
+        workflow.add_edge("Reconcile", "Inspector")
 
         # After Inspection: Go to Interviewer or Review Gate
         workflow.add_conditional_edges(
@@ -62,7 +79,7 @@ class AgentWorkflowBuilder:
             routing_function_review,
             {
                 "approve": "Submitter", 
-                "re-edit": "Agent" # Loops back to fix data if human rejects
+                "re-edit": "FastPath" # Loops back to fix data if human rejects
             }
         )
 
@@ -70,7 +87,12 @@ class AgentWorkflowBuilder:
 
         # 5. Compile with Interrupt
         # We PAUSE the graph right before the Review_Gate node runs
-        return workflow.compile(checkpointer=memory, interrupt_before=["Review_Gate"])
+        graph = workflow.compile(checkpointer=memory, interrupt_before=["Review_Gate"])
+
+        # Drain workers deliver approved submissions and record the outcome on each thread
+        if start_mcp:
+            await submission_outbox.start(graph)
+        return graph
 
     def __call__(self):
         return self.build()
\ No newline at end of file
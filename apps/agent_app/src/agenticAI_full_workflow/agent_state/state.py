@@ -4,11 +4,33 @@ from langgraph.graph.message import add_messages
 class AgentState(TypedDict):
     # This replaces MessagesState
     messages: Annotated[list, add_messages]
-    # To store the fields we got from the API (Scout)
+    # Content hash of the form schema (Scout); resolved through the schema store
+    schema_ref: str
+    # Legacy: full schema embedded by older threads, or when Postgres is unavailable
     form_schema: dict 
     # To store extracted values
     extracted_data: dict
+    # Keys of extracted_data changed this turn (fast path + Agent), for incremental validation
+    changed_fields: List[str]
     # To track what is missing
     missing_fields: List[str]
+    # Inspector's per-field issues and the schema version they belong to
+    field_results: dict
+    field_results_ref: str
+    # Fields the rule-based fast path filled this turn, whether the rules explained the whole
+    # message (otherwise the values are only hints for the Agent) and whether that completed the form
+    fastpath_fields: List[str]
+    fastpath_confident: bool
+    fastpath_complete: bool
+    # Combined mode: the Agent's draft question ({"fields", "question"}); the Inspector drops it on disagreement
+    draft_followup: dict
+    # Rolling summary of turns evicted from the token-budgeted window, and the last message it covers
+    conversation_summary: str
+    summarized_upto_id: str
+    # Speculative extraction: schema version it ran on and extracted_data before the turn
+    speculation: dict
     # Approval flag
-    is_approved: bool
\ No newline at end of file
+    is_approved: bool
+    # Outbox row of the approved payload and its delivery: queued | delivered | failed
+    submission_id: int
+    submission_status: str
\ No newline at end of file
@@ -1,3 +1,5 @@
 from pathlib import Path
 import os
-config_path = Path("config/config.yaml")
\ No newline at end of file
+# Resolve relative to the app folder so the config loads no matter where the process was started from
+APP_DIR = Path(__file__).resolve().parent.parent.parent.parent
+config_path = APP_DIR / "config" / "config.yaml"
@@ -1,56 +1,143 @@
 import json
+from typing import List, Optional
+from langchain_core.runnables import RunnableConfig
 from src.agenticAI_full_workflow.agent_state.state import AgentState
-from src.agenticAI_full_workflow.utils.model_loader import ModelLoader
-from src.agenticAI_full_workflow.prompt_library.prompts import FORM_FILLER_SYSTEM_PROMPT
-from src.agenticAI_full_workflow.schemas.form_schema import create_dynamic_model
+from src.agenticAI_full_workflow.utils.model_loader import llm_registry
+from src.agenticAI_full_workflow.prompt_library.prompts import build_extraction_prompt, build_followup_rules
+from src.agenticAI_full_workflow.schemas.compiled_schema import compile_schema
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
+from src.agenticAI_full_workflow.utils.llm_cache import extraction_cache
+from src.agenticAI_full_workflow.utils.common import config_section, latest_user_text
+from src.agenticAI_full_workflow.utils.context_manager import context_manager
+from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler, priority_from_config
+from src.agenticAI_full_workflow.project_nodes.inspector_node import issue_field_name
 from shared_core.logger.logging import log
-from langchain_core.messages import trim_messages
 
-# Load the model once
-model_loader = ModelLoader()
-llm = model_loader.load_llm()
+# Shared, pooled client for this node (see llm.nodes in config.yaml)
+llm = llm_registry.get("agent")
 
-async def agent_node(state: AgentState):
+AGENT_CONFIG = config_section("agent")
+# "delta": ask only for fields still missing/invalid or mentioned again; "full": whole form every turn
+EXTRACTION_MODE = AGENT_CONFIG.get("extraction_mode", "delta")
+# "combined": the extraction call also drafts the Interviewer's question; "separate": two calls
+FOLLOWUP_MODE = AGENT_CONFIG.get("followup_mode", "separate")
+
+def select_target_fields(state: AgentState, compiled, prefilled: set, guessed: set = frozenset()) -> Optional[List[str]]:
+    """
+    Fields to ask the LLM for in delta mode, in schema order.
+    Returns None when the whole form (minus fast-path fields) should be extracted.
+    """
+    # `missing_fields` only covers the schema version the Inspector last validated; before that
+    # (first turn, or a new version from the Scout) every field is still a candidate
+    if EXTRACTION_MODE != "delta" or state.get("field_results_ref") != compiled.schema_id:
+        return None
+
+    targets = {issue_field_name(issue) for issue in state.get("missing_fields") or []}
+    # The user may be correcting a field that already passed validation
+    targets.update(compiled.mentioned_fields(latest_user_text(state.get("messages", []))))
+    # Fast-path guesses the LLM has to confirm or overwrite
+    targets.update(guessed)
+    targets -= prefilled
+    if not targets:
+        return None
+    return [name for name in compiled.field_names if name in targets]
+
+async def agent_node(state: AgentState, config: Optional[RunnableConfig] = None):
     log.info("--- [NODE]: AGENT (Extracting Data) ---")
+
+    # Rules already completed the form this turn
+    if state.get("fastpath_complete") is True:
+        log.info("Fast path resolved the form; skipping the LLM.")
+        return {}
     
-    api_schema = state.get("form_schema", {})
-    trimmed_messages = state["messages"][-6:] 
+    # Runs in parallel with the Scout: extract against the version the turn started on
+    api_schema, schema_ref = await schema_store.resolve(state, speculative=True)
     
     # DEBUG: See what the Scout actually brought back
     log.debug(f"Schema found in Agent Node: {api_schema}")
 
     if not api_schema or "fields" not in api_schema:
-        log.error("No fields found in schema! Agent cannot extract data.")
-        return state
+        log.warning("No fields found in schema (none known yet, or the fetch failed). Agent cannot extract data.")
+        # Partial update only: the Scout may be writing schema_ref in this same step
+        return {}
 
-    DynamicModel = create_dynamic_model(api_schema)
+    # Model, structured runnable and field index are built once per schema version
+    compiled = compile_schema(api_schema, schema_ref)
+
+    # Newest turns that fit the Agent's token budget, plus the rolling summary of older ones
+    trimmed_messages, context_updates = await context_manager.window(state, "agent", llm)
     
-    # Help the LLM by listing the exact keys it needs to find
-    field_names = [f['name'] for f in api_schema['fields']]
+    # Help the LLM by listing the exact keys it needs to find.
+    # Fast-path fields are left out only when the rules explained the whole message; otherwise
+    # (a negation, a correction, free text) they are guesses the LLM may overwrite.
+    fast_fields = state.get("fastpath_fields") or []
+    current = state.get("extracted_data", {})
+    prefilled = set(fast_fields) if state.get("fastpath_confident") else set()
+    guesses = {} if prefilled else {name: current.get(name) for name in fast_fields}
+    target_fields = select_target_fields(state, compiled, prefilled, set(guesses))
+    if target_fields is not None:
+        field_names = target_fields
+    else:
+        field_names = [name for name in compiled.field_names if name not in prefilled] or compiled.field_names
     
-    # Inside agent_node.py
-    system_message = (
-        f"{FORM_FILLER_SYSTEM_PROMPT}\n\n"
-        f"TARGET FIELDS: {', '.join(field_names)}\n"
-        "NOTE: User might say 'CNIC' for 'id_card'. Map it correctly.\n"
-        "Return ONLY JSON."
-    )
+    combined = FOLLOWUP_MODE == "combined"
+    extra_rules = ""
+    if combined:
+        extra_rules = build_followup_rules(
+            compiled.required,
+            [name for name in compiled.field_names if current.get(name) not in (None, "")],
+            [f"{name}: {compiled.rules[name]['regex']}" for name in compiled.patterns],
+        )
+    system_message = build_extraction_prompt(field_names, compiled.alias_hints(), prefilled, extra_rules, guesses)
 
     messages = [("system", system_message)] + trimmed_messages
-    structured_llm = llm.with_structured_output(DynamicModel) 
+    # Delta mode narrows the output schema too, not just the prompt
+    structured_llm = compiled.structured_llm(llm, target_fields, followup=combined)
     
+    bypass_cache = bool((config or {}).get("configurable", {}).get("llm_cache_bypass"))
+    cache_key = None
+    if extraction_cache.is_active(bypass_cache):
+        cache_key = extraction_cache.make_key(
+            getattr(llm, "model_name", type(llm).__name__),
+            compiled.schema_id,
+            system_message,
+            trimmed_messages,
+        )
+
     try:
-        response_model = await structured_llm.ainvoke(messages)
-        new_data_chunk = response_model.model_dump(exclude_none=True)
+        result = await extraction_cache.get(cache_key) if cache_key else None
+        if result is not None:
+            log.info(f"LLM cache HIT (hit rate {extraction_cache.stats()['hit_rate']:.0%}). Skipping OpenAI call.")
+        else:
+            response_model = await llm_scheduler.run(
+                lambda: structured_llm.ainvoke(messages),
+                estimated_tokens=llm_scheduler.estimate_tokens(messages, getattr(llm, "model_name", "gpt-4o-mini")),
+                priority=priority_from_config(config),
+            )
+            result = response_model.model_dump(exclude_none=True)
+            if cache_key:
+                await extraction_cache.put(cache_key, result)
+
+        new_data_chunk = result.get("data", {}) if combined else result
+        draft_followup = {}
+        if combined and result.get("followup_question"):
+            draft_followup = {"fields": result.get("followup_fields", []), "question": result["followup_question"]}
         
-        updated_data = state.get("extracted_data", {}).copy()
+        current_data = state.get("extracted_data", {})
+        updated_data = current_data.copy()
         updated_data.update(new_data_chunk)
 
-        # We return the trimmed messages so the state doesn't grow forever
+        # Add to the fast path's changes so the Inspector re-checks only these
+        changed = list(state.get("changed_fields") or [])
+        changed += [k for k, v in new_data_chunk.items() if current_data.get(k) != v and k not in changed]
+
         return {
+            **context_updates,
             "extracted_data": updated_data,
-            "messages": trimmed_messages + [("assistant", f"Updated: {new_data_chunk}")]
+            "changed_fields": changed,
+            "draft_followup": draft_followup,
+            "messages": [("assistant", f"Updated: {new_data_chunk}")]
         }
     except Exception as e:
         log.error(f"AGENT ERROR: {e}")
-        return state
\ No newline at end of file
+        return {}
\ No newline at end of file
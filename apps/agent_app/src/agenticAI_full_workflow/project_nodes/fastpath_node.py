@@ -0,0 +1,58 @@
+from src.agenticAI_full_workflow.agent_state.state import AgentState
+from src.agenticAI_full_workflow.schemas.compiled_schema import compile_schema, schema_hash
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
+from src.agenticAI_full_workflow.utils.form_loader import peek_form_metadata
+from src.agenticAI_full_workflow.utils.fast_extractor import get_fast_extractor
+from src.agenticAI_full_workflow.project_nodes.inspector_node import collect_issues
+from src.agenticAI_full_workflow.utils.common import latest_user_text
+from shared_core.logger.logging import log
+
+async def speculative_schema(state: AgentState):
+    """
+    (form_schema, schema_ref) to extract against before the Scout has confirmed the version:
+    the thread's current schema, or for a new thread the last one the schema cache saw.
+    """
+    schema, schema_ref = await schema_store.resolve(state)
+    if not schema.get("fields"):
+        schema = await peek_form_metadata() or {}
+        if not schema.get("fields"):
+            return {}, None
+        schema_ref, _ = await schema_store.put(schema)
+    return schema, schema_ref or schema_hash(schema)
+
+async def fastpath_node(state: AgentState):
+    """
+    Deterministic pre-extraction. Fills whatever the schema's own rules can recognize in the
+    latest user message; the Agent (LLM) is skipped when that already completes the form.
+    Starts the turn's speculation: extraction runs on the last known schema while the Scout revalidates.
+    """
+    log.info("--- [NODE]: FAST PATH (Rule-based Extraction) ---")
+
+    base_data = state.get("extracted_data", {})
+    schema, schema_ref = await speculative_schema(state)
+    speculation = {"schema_ref": schema_ref, "base_data": base_data}
+
+    text = latest_user_text(state.get("messages", []))
+    if not schema.get("fields") or not text:
+        return {"fastpath_fields": [], "fastpath_confident": False, "fastpath_complete": False,
+                "changed_fields": [], "speculation": speculation}
+
+    compiled = compile_schema(schema, schema_ref)
+    values, confident = get_fast_extractor(compiled).extract(text)
+
+    updated_data = base_data.copy()
+    updated_data.update(values)
+
+    # Same verdict the Inspector will reach; only skip the LLM if nothing is left for it
+    complete = confident and not collect_issues(compiled, updated_data)
+    log.info(f"FAST PATH: resolved {sorted(values)} | confident={confident} | skip_llm={complete}")
+
+    return {
+        "extracted_data": updated_data,
+        "fastpath_fields": list(values),
+        "fastpath_confident": confident,
+        "fastpath_complete": complete,
+        # First writer of the turn: replaces last turn's list
+        "changed_fields": [name for name, value in values.items() if base_data.get(name) != value],
+        "speculation": speculation,
+    }
@@ -1,8 +1,15 @@
 import re
 from src.agenticAI_full_workflow.agent_state.state import AgentState
+from src.agenticAI_full_workflow.schemas.compiled_schema import compile_schema
+from src.agenticAI_full_workflow.schemas.validator_compiler import issue_text
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
 from shared_core.logger.logging import log
 
-def validate_field(value, field_rule):
+def validate_field(value, field_rule, pattern=None):
+    """
+    Legacy single-value check (int-castability and regex only).
+    The Inspector and the fast path use CompiledSchema.validator instead.
+    """
     f_type = field_rule.get("type", "string")
     
     # 1. Type Check
@@ -12,39 +19,82 @@ def validate_field(value, field_rule):
         except: return False
             
     # 2. Regex Check (The '12345' vs 'XXXXX-XXXXXXX-X' check)
-    pattern = field_rule.get("regex")
-    if pattern:
-        if not re.match(pattern, str(value)):
+    # Prefer the precompiled pattern from CompiledSchema; fall back to the raw rule string
+    if pattern is not None:
+        if not pattern.match(str(value)):
+            return False
+    elif field_rule.get("regex"):
+        if not re.match(field_rule["regex"], str(value)):
             return False
     return True
 
+def issue_field_name(issue: str) -> str:
+    """
+    'age (Missing)' -> 'age', 'quotebasicinfo/pickup_zip (Missing)' -> 'quotebasicinfo'
+    """
+    return issue.split(" (", 1)[0].split("/", 1)[0]
+
+def field_issues(compiled, extracted_data: dict, names=None) -> dict:
+    """
+    name -> issue messages for the top-level fields `names` (default: all of them).
+    """
+    results = {}
+    for name in (compiled.field_names if names is None else names):
+        results[name] = [issue_text(e) for e in compiled.validator.field_errors(name, extracted_data)]
+    return results
+
+def collect_issues(compiled, extracted_data: dict) -> list:
+    """
+    Missing / invalid field messages for `extracted_data`, in schema order.
+    Nested problems carry their JSON-pointer path ('quotebasicinfo/pickup_zip (Missing)').
+    Shared by the Inspector and the rule-based fast path so both reach the same verdict.
+    """
+    missing_or_invalid = []
+    for error in compiled.validator(extracted_data):
+        issue = issue_text(error)
+        log.debug(f"  >> REJECTED: {issue}")
+        missing_or_invalid.append(issue)
+    return missing_or_invalid
+
 async def inspector_node(state: AgentState):
     log.info("--- [NODE]: INSPECTOR (Validating Data) ---")
     
-    schema = state.get("form_schema", {})
+    schema, schema_ref = await schema_store.resolve(state)
     extracted_data = state.get("extracted_data", {})
-    fields_to_check = schema.get("fields", [])
-    
-    missing_or_invalid = []
+    if not schema.get("fields"):
+        return {"missing_fields": []}
 
-    for field in fields_to_check:
-        f_name = field["name"]
-        is_req = field.get("required", False)
-        val = extracted_data.get(f_name)
+    compiled = compile_schema(schema, schema_ref)
 
-        log.debug(f"CHECKING: {f_name} | Value: {val} | Required: {is_req}")
+    # Incremental pass: earlier per-field results stay valid unless the field (or a field its
+    # cross-field rules read) changed this turn. A new schema version forces a full pass.
+    results = dict(state.get("field_results") or {})
+    if state.get("field_results_ref") == compiled.schema_id:
+        recheck = compiled.validator.affected_fields(state.get("changed_fields") or [])
+        results.update(field_issues(compiled, extracted_data, recheck))
+        log.info(f"Re-validated {len(recheck)} of {len(compiled.field_names)} fields: {recheck}")
+    else:
+        results = field_issues(compiled, extracted_data)
+        log.info(f"Full validation pass over {len(compiled.field_names)} fields.")
 
-        # Logic for Missing
-        if val is None or str(val).strip() == "":
-            if is_req:
-                log.info(f"  >> REJECTED: {f_name} is missing")
-                missing_or_invalid.append(f"{f_name} (Missing)")
-            continue
-            
-        # Logic for Invalid
-        if not validate_field(val, field):
-            log.info(f"  >> REJECTED: {f_name} has invalid format")
-            missing_or_invalid.append(f"{f_name} (Invalid Format)")
+    missing_or_invalid = [issue for name in compiled.field_names for issue in results.get(name, [])]
+    for issue in missing_or_invalid:
+        log.debug(f"  >> REJECTED: {issue}")
 
     log.info(f"RESULT: Found {len(missing_or_invalid)} issues.")
-    return {"missing_fields": missing_or_invalid}
\ No newline at end of file
+    updates = {
+        "missing_fields": missing_or_invalid,
+        # Only fields with issues need storing; a missing entry means 'valid'
+        "field_results": {name: issues for name, issues in results.items() if issues},
+        "field_results_ref": compiled.schema_id,
+        "changed_fields": [],
+    }
+
+    # Combined mode: keep the Agent's drafted question only if it asks about exactly these fields
+    draft = state.get("draft_followup") or {}
+    if draft:
+        expected = {issue_field_name(issue) for issue in missing_or_invalid}
+        if set(draft.get("fields", [])) != expected:
+            log.info(f"DRAFT FOLLOW-UP rejected: model expected {sorted(draft.get('fields', []))}, found {sorted(expected)}.")
+            updates["draft_followup"] = {}
+    return updates
\ No newline at end of file
@@ -1,16 +1,27 @@
+from typing import Optional
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from src.agenticAI_full_workflow.agent_state.state import AgentState
-from src.agenticAI_full_workflow.utils.model_loader import ModelLoader
+from src.agenticAI_full_workflow.utils.model_loader import llm_registry
+from src.agenticAI_full_workflow.utils.context_manager import context_manager
+from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler, priority_from_config
 
-model_loader = ModelLoader()
-llm = model_loader.load_llm()
+# Phrasing a question needs less than extraction; may be a cheaper model (llm.nodes.interviewer)
+llm = llm_registry.get("interviewer")
 
-async def interviewer_node(state: AgentState):
+async def interviewer_node(state: AgentState, config: Optional[RunnableConfig] = None):
     """
     The Voice: Takes the list of missing/invalid fields and asks the user.
     """
     print("--- [NODE]: INTERVIEWER (Requesting Clarification) ---")
     
     missing_info = state.get("missing_fields", [])
+
+    # Combined mode: the Inspector kept the Agent's draft, so its question is already correct
+    draft = state.get("draft_followup") or {}
+    if draft.get("question"):
+        print("--- [INTERVIEWER]: Using the drafted follow-up (no extra LLM call) ---")
+        return {"draft_followup": {}, "messages": [AIMessage(draft["question"])]}
     
     # 1. Create a prompt for the LLM to ask naturally
     system_prompt = (
@@ -20,9 +31,17 @@ async def interviewer_node(state: AgentState):
         f"Issues found: {', '.join(missing_info)}"
     )
     
-    messages = [("system", system_prompt)] + state["messages"]
-    response = await llm.ainvoke(messages)
+    # Bounded window instead of the whole history; older turns arrive as a summary
+    window, context_updates = await context_manager.window(state, "interviewer", llm)
+    messages = [("system", system_prompt)] + window
+    response = await llm_scheduler.run(
+        lambda: llm.ainvoke(messages),
+        estimated_tokens=llm_scheduler.estimate_tokens(messages, getattr(llm, "model_name", "gpt-4o-mini")),
+        priority=priority_from_config(config),
+    )
     
     return {
+        **context_updates,
+        "draft_followup": {},
         "messages": [response]
     }
\ No newline at end of file
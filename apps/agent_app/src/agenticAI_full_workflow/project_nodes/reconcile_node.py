@@ -0,0 +1,58 @@
+from typing import Optional
+from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import RunnableConfig
+from src.agenticAI_full_workflow.agent_state.state import AgentState
+from src.agenticAI_full_workflow.project_nodes.fastpath_node import fastpath_node
+from src.agenticAI_full_workflow.project_nodes.agent_node import agent_node
+from shared_core.logger.logging import log
+
+def speculative_messages(messages: list) -> list:
+    """
+    Messages the speculative Agent added this turn (everything after the latest user message).
+    """
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].type == "human":
+            return messages[index + 1:]
+    return []
+
+async def reconcile_node(state: AgentState, config: Optional[RunnableConfig] = None):
+    """
+    Joins the Scout and the speculative extraction. If the schema the extraction ran on is the
+    one the Scout confirmed, its result stands; otherwise it is discarded and extraction reruns.
+    """
+    log.info("--- [NODE]: RECONCILE (Checking Speculative Extraction) ---")
+
+    speculation = state.get("speculation") or {}
+    confirmed_ref = state.get("schema_ref")
+    if speculation.get("schema_ref") == confirmed_ref:
+        log.info("Speculation confirmed: schema unchanged.")
+        return {"speculation": {}}
+
+    log.info(
+        f"Schema changed during extraction ({str(speculation.get('schema_ref'))[:12]} -> "
+        f"{str(confirmed_ref)[:12]}); discarding the speculative result and re-extracting."
+    )
+    stale = speculative_messages(state.get("messages", []))
+    stale_ids = {m.id for m in stale}
+    retry_state = {
+        **state,
+        "messages": [m for m in state.get("messages", []) if m.id not in stale_ids],
+        "extracted_data": speculation.get("base_data", {}),
+        "draft_followup": {},
+        "speculation": {},
+    }
+
+    # Same two steps as the speculative path, now on the confirmed schema
+    fastpath_updates = await fastpath_node(retry_state)
+    retry_state.update(fastpath_updates)
+    agent_updates = await agent_node(retry_state, config)
+
+    return {
+        **fastpath_updates,
+        **agent_updates,
+        "extracted_data": agent_updates.get("extracted_data", retry_state["extracted_data"]),
+        "draft_followup": agent_updates.get("draft_followup", {}),
+        "changed_fields": agent_updates.get("changed_fields", retry_state.get("changed_fields", [])),
+        "speculation": {},
+        "messages": [RemoveMessage(id=m.id) for m in stale] + list(agent_updates.get("messages", [])),
+    }
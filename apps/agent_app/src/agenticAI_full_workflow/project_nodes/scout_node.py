@@ -1,21 +1,43 @@
 from src.agenticAI_full_workflow.agent_state.state import AgentState
 from src.agenticAI_full_workflow.utils.form_loader import fetch_form_metadata
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
 from shared_core.logger.logging import log
 
 async def scout_node(state: AgentState):
     """
     Node to fetch form requirements from the external API.
+    Only the schema reference goes into state; the schema itself lives in the schema store.
+    Runs every turn in parallel with the (speculative) Agent; Reconcile checks the versions match.
     """
     log.info("--- SCOUTING FORM METADATA ---")
-    
-    # Check if we already have the schema in state to avoid redundant API calls
-    if state.get("form_schema"):
-        return state
 
+    current_ref = state.get("schema_ref")
+
+    # Older threads embed the full schema: move it into the store so later checkpoints stay small
+    embedded = state.get("form_schema")
+    if embedded and not current_ref:
+        ref, durable = await schema_store.put(embedded)
+        if durable:
+            return {"schema_ref": ref, "form_schema": {}}
+        return {"schema_ref": ref}
+
+    # Served from the process-wide schema cache; only a miss or an expired entry hits the network
     schema = await fetch_form_metadata()
     
     if not schema:
+        if current_ref:
+            log.warning("Schema revalidation failed; keeping the thread's current schema.")
+            return {}
         # Fallback logic or error handling
         raise ValueError("Could not fetch form schema from API.")
 
-    return {"form_schema": schema}
\ No newline at end of file
+    ref, durable = await schema_store.put(schema)
+    if ref == current_ref:
+        return {}
+    if current_ref:
+        log.info(f"Form schema changed: {current_ref[:12]} -> {ref[:12]}.")
+
+    if not durable:
+        # Without Postgres the reference would not survive a restart; keep the schema inline
+        return {"schema_ref": ref, "form_schema": schema}
+    return {"schema_ref": ref}
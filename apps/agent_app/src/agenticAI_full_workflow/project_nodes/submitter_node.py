@@ -1,84 +1,96 @@
 # apps/agent_app/src/agenticAI_full_workflow/project_nodes/submitter_node.py
-import os
-import yaml
-from pathlib import Path
-from langchain_mcp_adapters.client import MultiServerMCPClient
+import json
+from langchain_core.runnables import RunnableConfig
 from src.agenticAI_full_workflow.agent_state.state import AgentState
+from src.agenticAI_full_workflow.utils.mcp_pool import mcp_pool
+from src.agenticAI_full_workflow.utils.submission_outbox import submission_outbox, DELIVERED
+from src.agenticAI_full_workflow.utils.submission_dedup import submission_dedup, idempotency_key
 from shared_core.logger.logging import log
 
-# Load Config
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent.parent.parent
-CONFIG_PATH = BASE_DIR / "apps" / "agent_app" / "config" / "config.yaml"
+async def submit_inline(form_payload: dict, thread_id: str, key: str) -> dict:
+    """
+    Direct MCP call that waits for the backend (outbox disabled or unreachable).
+    """
+    # Call the specific tool defined in our MCP Server
+    # The tool name matches @mcp.tool() in server.py
+    log.info(f"Calling MCP Tool 'submit_verified_form' with payload: {form_payload}")
+
+    # The session comes from the long-lived pool: no server spawn or handshake per submission
+    result = await mcp_pool.call_tool(
+        "submit_verified_form",
+        arguments={"form_data": form_payload, "idempotency_key": key, "deadline_ms": mcp_pool.deadline_ms()}
+    )
+
+    # The tool answers with a structured status; `message` is only for the user
+    text = result.content[0].text if result.content and hasattr(result.content[0], "text") else str(result.content)
+    if result.isError:
+        report = {"status": "error", "message": f"❌ {text}"}
+    else:
+        report = result.structuredContent or json.loads(text)
+
+    log.info(f"MCP Result: {report.get('status')} ({report.get('status_code')}): {report.get('message')}")
+
+    delivered = report.get("status") == "ok"
+    if delivered:
+        await submission_dedup.put(key, thread_id, {
+            "status": "ok", "status_code": report.get("status_code"), "message": report.get("message"),
+        })
 
-def load_mcp_config():
-    with open(CONFIG_PATH, "r") as f:
-        config = yaml.safe_load(f)
-    
-    mcp_conf = config.get("mcp", {}).get("verification_server", {})
-    script_rel = mcp_conf.get("script_path")
-    python_rel = mcp_conf.get("python_path")
-    
-    if not script_rel or not python_rel:
-        raise ValueError("MCP Configuration missing in config.yaml")
-        
     return {
-        "script": BASE_DIR / script_rel,
-        "python": BASE_DIR / python_rel
+        "submission_status": "delivered" if delivered else "failed",
+        "messages": [("assistant", f"📢 {report.get('message')}")]
     }
 
-async def submitter_node(state: AgentState):
-    log.info("--- [NODE]: SUBMITTER (Executing MCP Tool) ---")
-    
+async def submitter_node(state: AgentState, config: RunnableConfig):
+    log.info("--- [NODE]: SUBMITTER (Queueing approved submission) ---")
+    form_payload = state.get("extracted_data", {})
+    thread_id = config.get("configurable", {}).get("thread_id", "")
+    key = idempotency_key(thread_id, form_payload)
+
     try:
-        paths = load_mcp_config()
-        
-        server_config = {
-            "verification_server": {
-                "command": str(paths["python"]),
-                "args": [str(paths["script"])],
-                "transport": "stdio",
-                "env": dict(os.environ), # Pass environment variables
+        # Same thread, same data, already delivered: answer with the original result, no second call
+        original = await submission_dedup.get(key)
+        if original is not None:
+            log.info(f"Submission for thread {thread_id} already delivered (key {key[:12]}); not resending.")
+            detail = (original.get("message") or "").lstrip("✅ ")
+            return {
+                "submission_id": original.get("submission_id"),
+                "submission_status": DELIVERED,
+                "messages": [("assistant", f"✅ This form was already submitted{': ' + detail if detail else '.'}")]
             }
-        }
-        
-        log.debug(f"MCP Server Config: {server_config}")
 
-        # CRITICAL: Use 'async with' and 'session' to ensure the MCP server starts correctly and resources are cleaned up.
-        # This invokes the "industry standard" pattern for robust resource management.
-        client = MultiServerMCPClient(server_config)
-        
-        async with client.session("verification_server") as session:
-            form_payload = state.get("extracted_data", {})
-            
-            # Call the specific tool defined in our MCP Server
-            # The tool name matches @mcp.tool() in server.py
-            log.info(f"Calling MCP Tool 'submit_verified_form' with payload: {form_payload}")
-            
-            result = await session.call_tool(
-                "submit_verified_form", 
-                arguments={"form_data": form_payload}
-            )
-            
-            # MCP returns a CallToolResult object which has a 'content' attribute (list)
-            result_text = "No response content"
-            if result.content and hasattr(result.content[0], 'text'):
-                 result_text = result.content[0].text
-            elif result.content:
-                 result_text = str(result.content)
+        if submission_outbox.enabled:
+            try:
+                # The approval turn ends here; drain workers deliver it and record the outcome on the thread
+                row = await submission_outbox.enqueue(thread_id, form_payload, key)
+                if row["duplicate"]:
+                    log.info(f"Submission #{row['id']} for thread {thread_id} already in the outbox ({row['status']}).")
+                    if row["status"] == DELIVERED:
+                        return {
+                            "submission_id": row["id"],
+                            "submission_status": DELIVERED,
+                            "messages": [("assistant", f"✅ This form was already submitted (#{row['id']}).")]
+                        }
+                else:
+                    log.info(f"Queued submission #{row['id']} for thread {thread_id}.")
+                return {
+                    "submission_id": row["id"],
+                    "submission_status": "queued",
+                    "messages": [("assistant", f"📨 Approved. Your form is queued for submission (#{row['id']}); you will be notified here once it is delivered.")]
+                }
+            except Exception as e:
+                log.error(f"Outbox unavailable, submitting inline: {e}")
 
-            log.info(f"MCP Result: {result_text}")
+        return await submit_inline(form_payload, thread_id, key)
 
-            return {
-                "messages": [("assistant", f"📢 {result_text}")]
-            }
-            
     except Exception as e:
         error_msg = f"❌ MCP Execution Error: {str(e)}"
         if hasattr(e, 'exceptions'):
             error_msg += f"\nInner Exceptions: {e.exceptions}"
-        
+
         log.error(error_msg, exc_info=True)
-        
+
         return {
+            "submission_status": "failed",
             "messages": [("assistant", error_msg)]
-        }
\ No newline at end of file
+        }
@@ -23,4 +23,36 @@ Your goal is to parse user conversations and extract specific fields defined in
 - Example: {"full_name": "John Doe", "age": 25}
 
 ### CURRENT CONTEXT
-"""
\ No newline at end of file
+"""
+
+def build_extraction_prompt(field_names, alias_hints=(), prefilled=(), extra_rules="", guesses=None):
+    """
+    System message for a structured extraction call over `field_names`.
+    `guesses` are rule-based values the LLM must check against the conversation and may overwrite.
+    """
+    return (
+        f"{FORM_FILLER_SYSTEM_PROMPT}\n\n"
+        f"TARGET FIELDS: {', '.join(field_names)}\n"
+        + (f"ALREADY EXTRACTED (do not repeat): {', '.join(sorted(prefilled))}\n" if prefilled else "")
+        + (f"RULE-BASED GUESSES (return the value the user actually means for each; correct any the user "
+           f"denied or changed): {'; '.join(f'{k}={v}' for k, v in guesses.items())}\n" if guesses else "")
+        + (f"ALIASES (user term -> field): {'; '.join(alias_hints)}\n" if alias_hints else "")
+        + (f"{extra_rules}\n" if extra_rules else "")
+        + "Return ONLY JSON."
+    )
+
+def build_followup_rules(required_fields, filled_fields=(), format_hints=()):
+    """
+    Extra rules for the combined "extract and ask" call: put the extracted values under `data`
+    and draft the Interviewer's question for whatever will still be missing or invalid.
+    """
+    return (
+        "Put the extracted values under `data`.\n"
+        f"REQUIRED FIELDS: {', '.join(required_fields) or '(none)'}\n"
+        + (f"ALREADY FILLED: {', '.join(filled_fields)}\n" if filled_fields else "")
+        + (f"FORMATS (field: regex): {'; '.join(format_hints)}\n" if format_hints else "")
+        + "Then list in `followup_fields` every required field that is still empty after this message, "
+        "and every value (new or already filled) that does not match its format. If that list is not empty, "
+        "write `followup_question`: a friendly, concise question asking the user to provide or correct "
+        "exactly those fields. Otherwise leave both empty."
+    )
\ No newline at end of file
@@ -0,0 +1,379 @@
+import csv
+import json
+import operator
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+from src.agenticAI_full_workflow.schemas.compiled_schema import CompiledSchema, compile_schema
+from src.agenticAI_full_workflow.schemas.validator_compiler import (
+    FORMAT_CHECKS, INT_TEXT, NUMBER_TEXT, issue_text, numeric_bounds, switched_on,
+)
+from shared_core.logger.logging import log
+
+# Cell codes in BatchReport.codes: 0 is valid, otherwise 1 + the index in this tuple
+ERROR_CODES = ("missing", "type", "pattern", "format", "range", "length", "enum", "items", "unique")
+_CODE = {code: index + 1 for index, code in enumerate(ERROR_CODES)}
+
+_COMPARE = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def _blank(value: Any) -> bool:
+    # None, NaN (an empty DataFrame cell) and blank text all count as missing
+    cls = value.__class__
+    if cls is str:
+        return not value or value.isspace()
+    return value is None or (cls is float and value != value)
+
+
+# Per-type cell coercion for present cells; None marks a type error
+def _as_int(value: Any) -> Any:
+    cls = value.__class__
+    if cls is int:
+        return value
+    if cls is str:
+        return int(value) if INT_TEXT.match(value) else None
+    if cls is float and value.is_integer():
+        # pandas stores integer columns that have gaps as float64
+        return int(value)
+    return None
+
+
+def _as_number(value: Any) -> Any:
+    cls = value.__class__
+    if cls is int or cls is float:
+        return value
+    if cls is str:
+        return float(value) if NUMBER_TEXT.match(value) else None
+    return None
+
+
+def _as_bool(value: Any) -> Any:
+    if value.__class__ is bool:
+        return value
+    if value.__class__ is str and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    return None
+
+
+def _as_text(value: Any) -> Any:
+    if value.__class__ is str:
+        return value
+    if isinstance(value, (int, float)) and value.__class__ is not bool:
+        return str(value)
+    return None
+
+
+def _field_type(field: dict) -> str:
+    f_type = str(field.get("type", "string")).lower()
+    return {"int": "integer", "float": "number", "bool": "boolean"}.get(f_type, f_type)
+
+
+def _table_columns(table: Any, names: List[str]) -> Tuple[int, Dict[str, Any]]:
+    """
+    (row count, field name -> column) for a DataFrame, a mapping of column arrays or a list of
+    row dicts. DataFrame columns stay numpy arrays so numeric checks run without Python loops.
+    """
+    if hasattr(table, "columns") and hasattr(table, "iloc"):
+        columns = {name: table[name].to_numpy() for name in names if name in table.columns}
+        return len(table), columns
+
+    if isinstance(table, Mapping):
+        lengths = {len(column) for column in table.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        return (lengths.pop() if lengths else 0), {name: table[name] for name in names if name in table}
+
+    records = list(table)
+    return len(records), {name: [record.get(name) for record in records] for name in names}
+
+
+def _record(compiled: CompiledSchema, columns: Dict[str, Any], index: int) -> dict:
+    """
+    Row `index` as the dict the row validator expects, with the same cell rules as the columnar path.
+    """
+    record = {}
+    for name, column in columns.items():
+        value = column[index]
+        if isinstance(value, np.generic):
+            value = value.item()
+        record[name] = None if _blank(value) else value
+    return record
+
+
+class BatchReport:
+    """
+    Outcome of validating a table: one code per cell (0 = valid, else 1 + index into ERROR_CODES)
+    and a packed per-row bitmap in which bit j is set when fields[j] failed.
+    """
+    def __init__(self, compiled: CompiledSchema, codes: Any, columns: Dict[str, Any], rows: int, elapsed: float):
+        self.fields: List[str] = compiled.field_names
+        self.rows = rows
+        self.elapsed = elapsed
+        # (rows, fields) uint8 matrix
+        self.codes = codes
+        self._compiled = compiled
+        self._columns = columns
+
+        failed = codes != 0
+        self.valid = ~failed.any(axis=1)
+        self.bitmap = np.packbits(failed, axis=1, bitorder="little")
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else float("inf")
+
+    def invalid_rows(self) -> List[int]:
+        return np.flatnonzero(~self.valid).tolist()
+
+    def row_mask(self, index: int) -> int:
+        return int.from_bytes(bytes(self.bitmap[index]), "little")
+
+    def error_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        field -> {error code: rows}, failing fields only.
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        for j, name in enumerate(self.fields):
+            tally = dict(enumerate(np.bincount(self.codes[:, j], minlength=len(ERROR_CODES) + 1).tolist()))
+            failed = {ERROR_CODES[code - 1]: n for code, n in sorted(tally.items()) if code and n}
+            if failed:
+                counts[name] = failed
+        return counts
+
+    def row_issues(self, index: int) -> List[str]:
+        """
+        Inspector-style issues of one row, e.g. ['age (Out of Range: must be >= 18)'].
+        """
+        return [issue_text(e) for e in self._compiled.validator(_record(self._compiled, self._columns, index))]
+
+    def summary(self) -> dict:
+        invalid = len(self.invalid_rows())
+        return {
+            "rows": self.rows,
+            "valid": self.rows - invalid,
+            "invalid": invalid,
+            "elapsed_s": round(self.elapsed, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.error_counts(),
+        }
+
+
+class ColumnarValidator:
+    """
+    Batch counterpart of the generated row validator for imports of historical submissions.
+    Each check runs once per column over numpy arrays and precompiled patterns instead of
+    once per cell. Built once per CompiledSchema.
+    """
+    def __init__(self, compiled: CompiledSchema):
+        self.compiled = compiled
+
+    def validate(self, table: Any) -> BatchReport:
+        started = time.perf_counter()
+        rows, columns = _table_columns(table, self.compiled.field_names)
+        codes = self._validate_columns(rows, columns)
+        report = BatchReport(self.compiled, codes, columns, rows, time.perf_counter() - started)
+        log.info(
+            f"BATCH: {rows} row(s) x {len(self.compiled.fields)} field(s) in {report.elapsed:.3f}s "
+            f"({report.rows_per_second:,.0f} rows/s); {len(report.invalid_rows())} invalid."
+        )
+        return report
+
+    def _validate_columns(self, rows: int, columns: Dict[str, Any]):
+        codes = np.zeros((rows, len(self.compiled.fields)), dtype=np.uint8)
+        prepared, missing = {}, {}
+        booleans = {field["name"] for field in self.compiled.fields if _field_type(field) == "boolean"}
+        for name in self.compiled.field_names:
+            if name in columns:
+                prepared[name] = self._column(columns[name], rows)
+                missing[name] = self._missing(prepared[name])
+            else:
+                missing[name] = np.ones(rows, dtype=bool)
+
+        for j, field in enumerate(self.compiled.fields):
+            name = field["name"]
+            out = codes[:, j]
+            is_missing = missing[name]
+            if field.get("required"):
+                self._mark(out, np.flatnonzero(is_missing), "missing")
+            elif field.get("required_with"):
+                triggered = np.zeros(rows, dtype=bool)
+                for trigger in field["required_with"]:
+                    if trigger in booleans and trigger in prepared:
+                        # Same rule as the row validator: a false boolean trigger does not count
+                        column = prepared[trigger]
+                        if column.dtype.kind != "b":
+                            column = np.frompyfunc(switched_on, 1, 1)(column).astype(bool)
+                        triggered |= column & ~missing[trigger]
+                    elif trigger in missing:
+                        triggered |= ~missing[trigger]
+                self._mark(out, np.flatnonzero(is_missing & triggered), "missing")
+
+            present = np.flatnonzero(~is_missing)
+            if present.size:
+                self._check_values(field, prepared[name][present], present, out)
+        return codes
+
+    @staticmethod
+    def _column(column: Any, rows: int):
+        if isinstance(column, np.ndarray) and column.dtype.kind in "iufbO":
+            return column
+        values = column.tolist() if hasattr(column, "tolist") else column
+        # fromiter keeps list cells (array fields) as single objects
+        return np.fromiter(values, dtype=object, count=rows)
+
+    @staticmethod
+    def _missing(column):
+        kind = column.dtype.kind
+        if kind == "f":
+            return np.isnan(column)
+        if kind in "iub":
+            return np.zeros(len(column), dtype=bool)
+        return np.frompyfunc(_blank, 1, 1)(column).astype(bool)
+
+    @staticmethod
+    def _mark(out, positions, code: str):
+        """
+        Sets `code` on cells at `positions` that have no earlier error, so the first failing check wins.
+        """
+        if positions.size:
+            positions = positions[out[positions] == 0]
+            out[positions] = _CODE[code]
+
+    def _coerce(self, values, positions, out, convert: Callable[[Any], Any]):
+        """
+        Applies a cell coercion to an object column; returns (coerced values, their positions).
+        """
+        coerced = np.frompyfunc(convert, 1, 1)(values) if values.size else values
+        kept = ~np.equal(coerced, None).astype(bool)
+        self._mark(out, positions[~kept], "type")
+        return coerced[kept], positions[kept]
+
+    def _check_values(self, field: dict, values, positions, out):
+        f_type = _field_type(field)
+        kind = values.dtype.kind
+
+        if f_type in ("object", "array"):
+            # Nested shapes are rare in imports; their generated checks run per cell
+            value_errors = self.compiled.validator.value_errors
+            for value, position in zip(values.tolist(), positions.tolist()):
+                errors = value_errors(field["name"], value)
+                if errors:
+                    out[position] = _CODE[errors[0][1]]
+            return
+
+        if f_type in ("integer", "number"):
+            if kind == "b":
+                self._mark(out, positions, "type")
+                return
+            if kind in "iuf":
+                numbers = values.astype(float)
+                if f_type == "integer" and kind == "f":
+                    whole = numbers == np.floor(numbers)
+                    self._mark(out, positions[~whole], "type")
+                    numbers, positions = numbers[whole], positions[whole]
+            else:
+                coerced, positions = self._coerce(values, positions, out, _as_int if f_type == "integer" else _as_number)
+                numbers = coerced.astype(float)
+            for op, bound, _ in numeric_bounds(field):
+                if op == "multipleOf":
+                    ratio = numbers / bound
+                    failed = np.abs(ratio - np.round(ratio)) > 1e-9
+                else:
+                    failed = _COMPARE[op](numbers, bound)
+                self._mark(out, positions[failed], "range")
+            # Same as the row validator: enums compare the converted number, so "2" matches enum [1, 2, 3]
+            self._check_enum(field, numbers, positions, out)
+            return
+
+        if f_type == "boolean":
+            if kind in "iuf":
+                self._mark(out, positions, "type")
+                return
+            if kind != "b":
+                values, positions = self._coerce(values, positions, out, _as_bool)
+            self._check_enum(field, values, positions, out)
+            return
+
+        # Strings
+        if kind == "b":
+            self._mark(out, positions, "type")
+            return
+        if kind in "iuf":
+            texts = np.fromiter(map(str, values.tolist()), dtype=object, count=values.size)
+        else:
+            texts, positions = self._coerce(values, positions, out, _as_text)
+        if not texts.size:
+            return
+        self._check_text(field, texts, positions, out)
+        self._check_enum(field, texts, positions, out)
+
+    def _check_text(self, field: dict, texts, positions, out):
+        count = texts.size
+        min_len, max_len = field.get("minLength"), field.get("maxLength")
+        if (isinstance(min_len, int) and min_len > 0) or isinstance(max_len, int):
+            lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+            if isinstance(min_len, int) and min_len > 0:
+                self._mark(out, positions[lengths < min_len], "length")
+            if isinstance(max_len, int):
+                self._mark(out, positions[lengths > max_len], "length")
+
+        pattern = self.compiled.patterns.get(field["name"])
+        if pattern is not None and pattern.pattern:
+            matched = np.fromiter(map(bool, map(pattern.match, texts)), dtype=bool, count=count)
+            self._mark(out, positions[~matched], "pattern")
+
+        check = FORMAT_CHECKS.get(str(field.get("format", "")).lower())
+        if check is not None:
+            passed = np.fromiter(map(bool, map(check, texts)), dtype=bool, count=count)
+            self._mark(out, positions[~passed], "format")
+
+    def _check_enum(self, field: dict, values, positions, out):
+        enum = field.get("enum")
+        if not (isinstance(enum, list) and enum) or not values.size:
+            return
+        try:
+            allowed = frozenset(enum)
+        except TypeError:
+            allowed = tuple(enum)
+        listed = values.tolist()
+        allowed_cells = np.fromiter(map(allowed.__contains__, listed), dtype=bool, count=len(listed))
+        self._mark(out, positions[~allowed_cells], "enum")
+
+
+def read_table(path: str) -> Dict[str, List[Any]]:
+    """
+    CSV or JSONL file -> column name -> values, ready for validate_batch().
+    CSV cells stay text; the validator coerces them like form input.
+    """
+    columns: Dict[str, List[Any]] = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            records = [json.loads(line) for line in f if line.strip()]
+            for name in dict.fromkeys(k for record in records for k in record):
+                columns[name] = [record.get(name) for record in records]
+        else:
+            reader = csv.DictReader(f)
+            columns = {name: [] for name in reader.fieldnames or []}
+            for row in reader:
+                for name in columns:
+                    columns[name].append(row.get(name))
+    return columns
+
+
+# One batch validator per compiled schema; entries disappear when the schema LRU drops the schema
+_validators: "weakref.WeakKeyDictionary[CompiledSchema, ColumnarValidator]" = weakref.WeakKeyDictionary()
+
+def get_columnar_validator(compiled: CompiledSchema) -> ColumnarValidator:
+    validator = _validators.get(compiled)
+    if validator is None:
+        validator = ColumnarValidator(compiled)
+        _validators[compiled] = validator
+    return validator
+
+
+def validate_batch(table: Any, form_schema: dict, schema_ref: Optional[str] = None) -> BatchReport:
+    """
+    Validates a table of records (DataFrame, column arrays or row dicts) against a parsed form schema.
+    """
+    return get_columnar_validator(compile_schema(form_schema, schema_ref)).validate(table)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Type
+from pydantic import BaseModel
+from src.agenticAI_full_workflow.schemas.form_schema import create_dynamic_model, create_followup_model
+from src.agenticAI_full_workflow.schemas.field_aliases import build_alias_index, field_tokens
+from src.agenticAI_full_workflow.schemas.validator_compiler import CompiledValidator
+from shared_core.logger.logging import log
+
+
+# Distinct narrowed models kept per schema for delta extraction
+SUBMODEL_CACHE_SIZE = 64
+
+
+def schema_hash(form_schema: dict) -> str:
+    """
+    Content hash of a parsed form schema. Identical schemas share one id across threads.
+    """
+    canonical = json.dumps(form_schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompiledSchema:
+    """
+    Everything the nodes derive from a form schema, built once per schema version:
+    the dynamic Pydantic model, its structured-output runnables, precompiled regexes,
+    the generated validator, a name -> rule index and a phrase -> field alias index.
+    """
+    def __init__(self, form_schema: dict, schema_id: Optional[str] = None):
+        self.schema_id = schema_id or schema_hash(form_schema)
+        self.form_schema = form_schema
+        self.fields: List[dict] = list(form_schema.get("fields", []))
+        self.rules: Dict[str, dict] = {f["name"]: f for f in self.fields}
+        self.field_names: List[str] = [f["name"] for f in self.fields]
+        self.required: List[str] = [f["name"] for f in self.fields if f.get("required")]
+        self.patterns: Dict[str, Pattern] = {}
+
+        for field in self.fields:
+            pattern = field.get("regex")
+            if not pattern:
+                continue
+            try:
+                self.patterns[field["name"]] = re.compile(pattern)
+            except re.error as e:
+                # An empty pattern matches everything, so a broken rule from the API never blocks a form
+                log.warning(f"Ignoring invalid regex for field '{field['name']}': {pattern} ({e})")
+                self.patterns[field["name"]] = re.compile("")
+
+        self.validator = CompiledValidator(self.fields, self.patterns)
+        self.aliases: Dict[str, str] = build_alias_index(self.fields)
+        self._mention_pattern: Optional[Pattern] = None
+        self.model: Type[BaseModel] = create_dynamic_model(form_schema)
+        # Narrowed models for delta extraction, keyed by the requested field subset
+        self._submodels: "OrderedDict[FrozenSet[str], Type[BaseModel]]" = OrderedDict()
+        # (llm identity, field subset, followup) -> (llm, runnable); kept per llm so per-node models can share the schema
+        self._structured: Dict[tuple, tuple] = {}
+
+    def alias_hints(self) -> List[str]:
+        """
+        'cnic -> id_card' style hints for aliases that don't simply restate the field name.
+        """
+        hints = []
+        for phrase, name in self.aliases.items():
+            label = str(self.rules[name].get("label") or "").lower()
+            if phrase not in (name.lower(), " ".join(field_tokens(name)), label):
+                hints.append(f"{phrase} -> {name}")
+        return hints
+
+    def mentioned_fields(self, text: str) -> List[str]:
+        """
+        Fields the text refers to by name, label or alias (e.g. 'my CNIC is wrong' -> id_card).
+        """
+        if self._mention_pattern is None:
+            phrases = sorted(self.aliases, key=len, reverse=True)
+            alternation = "|".join(r"[\s_-]*".join(re.escape(w) for w in p.split()) for p in phrases)
+            self._mention_pattern = re.compile(rf"\b(?:{alternation or '(?!)'})\b", re.IGNORECASE)
+
+        found = []
+        for match in self._mention_pattern.finditer(text):
+            name = self.aliases.get(" ".join(match.group(0).lower().replace("_", " ").split()))
+            if name and name not in found:
+                found.append(name)
+        return found
+
+    def submodel(self, names: Iterable[str]) -> Type[BaseModel]:
+        """
+        Structured-output model restricted to `names` (schema order), cached per subset.
+        """
+        key = frozenset(n for n in names if n in self.rules)
+        if not key or key == frozenset(self.field_names):
+            return self.model
+
+        model = self._submodels.get(key)
+        if model is None:
+            model = create_dynamic_model({"fields": [f for f in self.fields if f["name"] in key]})
+            self._submodels[key] = model
+            while len(self._submodels) > SUBMODEL_CACHE_SIZE:
+                evicted, _ = self._submodels.popitem(last=False)
+                for cache_key in [k for k in self._structured if k[1] == evicted]:
+                    del self._structured[cache_key]
+        else:
+            self._submodels.move_to_end(key)
+        return model
+
+    def structured_llm(self, llm: Any, names: Optional[Iterable[str]] = None, followup: bool = False):
+        """
+        Returns `llm.with_structured_output(model)`, built once per llm instance and field subset.
+        Without `names` the model covers the whole form. With `followup` the output wraps the
+        fields as `data` next to a drafted clarification question (combined extract-and-ask mode).
+        """
+        names = list(names) if names is not None else None
+        model = self.submodel(names) if names is not None else self.model
+        subset = None if model is self.model else frozenset(n for n in names if n in self.rules)
+        cache_key = (id(llm), subset, followup)
+
+        cached = self._structured.get(cache_key)
+        if cached is not None and cached[0] is llm:
+            return cached[1]
+        runnable = llm.with_structured_output(create_followup_model(model) if followup else model)
+        self._structured[cache_key] = (llm, runnable)
+        return runnable
+
+
+class CompiledSchemaCache:
+    """
+    Bounded LRU of CompiledSchema objects keyed by schema content hash.
+    """
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, form_schema: dict, schema_id: Optional[str] = None) -> CompiledSchema:
+        schema_id = schema_id or schema_hash(form_schema)
+        with self._lock:
+            compiled = self._items.get(schema_id)
+            if compiled is not None:
+                self._items.move_to_end(schema_id)
+                return compiled
+
+        compiled = CompiledSchema(form_schema, schema_id)
+        log.debug(f"Compiled form schema {schema_id[:12]} ({len(compiled.fields)} fields).")
+
+        with self._lock:
+            self._items[schema_id] = compiled
+            self._items.move_to_end(schema_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+compiled_schemas = CompiledSchemaCache()
+
+def compile_schema(form_schema: dict, schema_id: Optional[str] = None) -> CompiledSchema:
+    return compiled_schemas.get(form_schema, schema_id)
@@ -0,0 +1,60 @@
+import re
+from typing import Dict, List
+
+# Common ways users refer to a field, in English and Roman Urdu.
+# Keys are matched against the tokens of schema field names (e.g. 'id_card', 'full_name').
+CONCEPT_ALIASES: Dict[str, List[str]] = {
+    "name": ["name", "full name", "naam", "pura naam"],
+    "age": ["age", "umar", "umr", "umer"],
+    "email": ["email", "e-mail", "email address", "mail"],
+    "id_card": ["cnic", "nic", "id card", "national id", "id card number", "shanakhti card"],
+    "phone": ["phone", "phone number", "mobile", "mobile number", "cell", "contact number"],
+    "city": ["city", "shehar", "shahar"],
+    "address": ["address", "pata"],
+    "destination": ["destination"],
+    "zip": ["zip", "zip code", "postal code", "postcode"],
+    "gender": ["gender", "jins"],
+    "birth": ["dob", "date of birth", "birthday"],
+}
+
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def field_tokens(name: str) -> List[str]:
+    return [t for t in re.split(r"[_\-\s]+", _CAMEL.sub("_", name).lower()) if t]
+
+
+def _concept_matches(concept: str, tokens: List[str]) -> bool:
+    concept_tokens = concept.split("_")
+    width = len(concept_tokens)
+    return any(tokens[i:i + width] == concept_tokens for i in range(len(tokens) - width + 1))
+
+
+def build_alias_index(fields: List[dict]) -> Dict[str, str]:
+    """
+    phrase -> field name for the top-level scalar fields of a schema.
+    A phrase that could mean more than one field (e.g. 'name' with first_name/last_name) is dropped.
+    """
+    candidates: Dict[str, set] = {}
+
+    def add(phrase: str, field_name: str):
+        phrase = " ".join(phrase.lower().split())
+        if phrase:
+            candidates.setdefault(phrase, set()).add(field_name)
+
+    for field in fields:
+        if field.get("type") in ("object", "array"):
+            continue
+        name = field["name"]
+        tokens = field_tokens(name)
+        add(name, name)
+        add(" ".join(tokens), name)
+        if field.get("label"):
+            add(str(field["label"]), name)
+
+        for concept, phrases in CONCEPT_ALIASES.items():
+            if _concept_matches(concept, tokens):
+                for phrase in phrases:
+                    add(phrase, name)
+
+    return {phrase: next(iter(names)) for phrase, names in candidates.items() if len(names) == 1}
@@ -1,26 +1,55 @@
 from pydantic import BaseModel, Field, create_model, ConfigDict
-from typing import Optional, Type
+from typing import Any, List, Optional, Type
 
-def create_dynamic_model(schema_from_api: dict) -> Type[BaseModel]:
+def _python_type(field: dict, model_name: str) -> Any:
+    f_type = str(field.get("type", "string")).lower()
+
+    # Handle OpenAPI "integer" vs Python "int"
+    if f_type in ["int", "integer"]:
+        return int
+    if f_type in ["number", "float"]:
+        return float
+    if f_type in ["bool", "boolean"]:
+        return bool
+    # Nested objects (e.g. 'quotebasicinfo') become nested models
+    if f_type == "object" and field.get("fields"):
+        return _build_model(field["fields"], model_name)
+    # Arrays (e.g. 'items') become lists of their item type
+    if f_type == "array":
+        item = field.get("items") or {}
+        return List[_python_type(item, f"{model_name}Item")]
+    return str
+
+def _build_model(api_fields: List[dict], model_name: str) -> Type[BaseModel]:
     fields = {}
-    api_fields = schema_from_api.get("fields", [])
-    
     for field in api_fields:
         name = field["name"]
-        f_type = str(field.get("type", "string")).lower()
-        
-        # Handle OpenAPI "integer" vs Python "int"
-        if f_type in ["int", "integer"]:
-            python_type = Optional[int]
-        elif f_type in ["number", "float"]:
-            python_type = Optional[float]
-        else:
-            python_type = Optional[str]
-            
-        fields[name] = (python_type, Field(default=None))
+        nested_name = f"{model_name}_{name}".replace("-", "_")
+        fields[name] = (Optional[_python_type(field, nested_name)], Field(default=None))
 
     return create_model(
-        "UserFormData", 
-        __config__=ConfigDict(extra="forbid"), 
+        model_name,
+        __config__=ConfigDict(extra="forbid"),
         **fields
-    )
\ No newline at end of file
+    )
+
+def create_dynamic_model(schema_from_api: dict) -> Type[BaseModel]:
+    return _build_model(schema_from_api.get("fields", []), "UserFormData")
+
+def create_followup_model(data_model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Combined "extract and ask" output: the extracted fields plus a draft clarification question.
+    """
+    return create_model(
+        "ExtractAndAsk",
+        __config__=ConfigDict(extra="forbid"),
+        data=(data_model, Field(description="Values found in the conversation")),
+        followup_fields=(List[str], Field(
+            default_factory=list,
+            description="Field names still missing or invalid after this extraction",
+        )),
+        followup_question=(Optional[str], Field(
+            default=None,
+            description="Friendly, concise question asking the user for the followup_fields",
+        )),
+    )
@@ -0,0 +1,419 @@
+import datetime
+import ipaddress
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from shared_core.logger.logging import log
+
+# (JSON pointer, code, message)
+ValidationError = Tuple[str, str, str]
+
+# How each error code reads in Inspector issues, e.g. 'age (Missing)'
+ISSUE_LABELS = {
+    "missing": "Missing",
+    "type": "Invalid Type",
+    "pattern": "Invalid Format",
+    "format": "Invalid Format",
+    "range": "Out of Range",
+    "length": "Invalid Length",
+    "enum": "Not Allowed",
+    "items": "Invalid Length",
+    "unique": "Duplicate Items",
+}
+
+INT_TEXT = re.compile(r"^\s*-?\d+\s*$")
+NUMBER_TEXT = re.compile(r"^\s*-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*$")
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_URI = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:\S+$")
+_UUID = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+
+def _is_date(value: str) -> bool:
+    try:
+        datetime.date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_datetime(value: str) -> bool:
+    try:
+        datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_ip(version: int) -> Callable[[str], bool]:
+    def check(value: str) -> bool:
+        try:
+            return ipaddress.ip_address(value).version == version
+        except ValueError:
+            return False
+    return check
+
+
+FORMAT_CHECKS: Dict[str, Callable[[str], bool]] = {
+    "email": _EMAIL.match,
+    "date": _is_date,
+    "date-time": _is_datetime,
+    "uri": _URI.match,
+    "url": _URI.match,
+    "uuid": _UUID.match,
+    "ipv4": _is_ip(4),
+    "ipv6": _is_ip(6),
+}
+
+
+def numeric_bounds(shape: dict) -> List[Tuple[str, float, str]]:
+    """
+    (failing comparison, bound, message) per numeric keyword of `shape`, in check order.
+    The comparison is '<', '<=', '>', '>=' or 'multipleOf'.
+    """
+    minimum, maximum = shape.get("minimum"), shape.get("maximum")
+    ex_min, ex_max = shape.get("exclusiveMinimum"), shape.get("exclusiveMaximum")
+    # OpenAPI 3.0 uses boolean exclusiveMinimum/Maximum next to minimum/maximum
+    if ex_min is True:
+        ex_min, minimum = minimum, None
+    if ex_max is True:
+        ex_max, maximum = maximum, None
+
+    def number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    bounds = []
+    if number(minimum):
+        bounds.append(("<", minimum, f"must be >= {minimum}"))
+    if number(ex_min):
+        bounds.append(("<=", ex_min, f"must be > {ex_min}"))
+    if number(maximum):
+        bounds.append((">", maximum, f"must be <= {maximum}"))
+    if number(ex_max):
+        bounds.append((">=", ex_max, f"must be < {ex_max}"))
+    multiple = shape.get("multipleOf")
+    if number(multiple) and multiple > 0:
+        bounds.append(("multipleOf", multiple, f"must be a multiple of {multiple}"))
+    return bounds
+
+
+def _pointer_token(name: str) -> str:
+    return str(name).replace("~", "~0").replace("/", "~1")
+
+
+def _present(value: Any) -> bool:
+    # The same test as a required field's missing check, so a trigger counts exactly when it would satisfy `required`
+    return not (value is None or (value.__class__ is str and not value.strip()))
+
+
+def switched_on(value: Any) -> bool:
+    # Boolean triggers: False (or "false") is an answer, but it does not switch the dependent field on
+    return value is True or (value.__class__ is str and value.strip().lower() == "true")
+
+
+def _is_boolean(field: dict) -> bool:
+    return str(field.get("type", "string")).lower() in ("bool", "boolean")
+
+
+def _unique(values: list) -> bool:
+    seen = []
+    for value in values:
+        if value in seen:
+            return False
+        seen.append(value)
+    return True
+
+
+class _CodeGen:
+    """
+    Emits one specialised Python function per field (fastjsonschema style): every keyword is
+    decided at compile time, so the generated code only contains the checks a field needs.
+    """
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {
+            "INT_TEXT": INT_TEXT, "NUMBER_TEXT": NUMBER_TEXT, "_unique": _unique, "_present": _present,
+            "switched_on": switched_on,
+        }
+        self._counter = 0
+
+    def name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def const(self, value: Any, prefix: str = "_c") -> str:
+        key = self.name(prefix)
+        self.namespace[key] = value
+        return key
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def error(self, indent: int, path: str, code: str, message: str):
+        self.emit(indent, f"errors.append(({path}, {code!r}, {message!r}))")
+
+    def required_check(self, field: dict, parent: str, path: str, indent: int, booleans=frozenset()):
+        """
+        Missing-value branch: required fields always report, `required_with` ones only when a trigger
+        is present (boolean triggers: only when true). `booleans` are the boolean siblings in `parent`.
+        """
+        if field.get("required"):
+            self.error(indent, path, "missing", "is required")
+            return
+        triggers = field.get("required_with") or []
+        if not triggers:
+            self.emit(indent, "pass")
+            return
+        condition = " or ".join(
+            f"{'switched_on' if t in booleans else '_present'}({parent}.get({t!r}))" for t in triggers
+        )
+        self.emit(indent, f"if {condition}:")
+        self.error(indent + 1, path, "missing", f"is required with {', '.join(triggers)}")
+
+    # --- field bodies ---
+    def missing_check(self, var: str) -> str:
+        return f"{var} is None or ({var}.__class__ is str and not {var}.strip())"
+
+    def value_checks(self, shape: dict, var: str, path: str, indent: int):
+        """
+        Checks for a present (non-missing) value of `shape`.
+        """
+        f_type = str(shape.get("type", "string")).lower()
+
+        if f_type in ("int", "integer"):
+            # Whole floats count as integers (int() always accepted 25.0); text is converted before enum/range
+            self.emit(indent, f"if not ({var}.__class__ is int or ({var}.__class__ is float and {var}.is_integer()) or ({var}.__class__ is str and INT_TEXT.match({var}))):")
+            self.error(indent + 1, path, "type", "must be an integer")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"{var} = int({var})")
+            self.numeric_checks(shape, var, path, indent + 1)
+            self.common_checks(shape, var, path, indent + 1)
+        elif f_type in ("number", "float"):
+            self.emit(indent, f"if {var}.__class__ is bool or not (isinstance({var}, (int, float)) or ({var}.__class__ is str and NUMBER_TEXT.match({var}))):")
+            self.error(indent + 1, path, "type", "must be a number")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"{var} = float({var}) if {var}.__class__ is str else {var}")
+            self.numeric_checks(shape, var, path, indent + 1)
+            self.common_checks(shape, var, path, indent + 1)
+        elif f_type in ("bool", "boolean"):
+            self.emit(indent, f"if not ({var}.__class__ is bool or ({var}.__class__ is str and {var}.strip().lower() in ('true', 'false'))):")
+            self.error(indent + 1, path, "type", "must be true or false")
+            self.emit(indent, "else:")
+            # Text is converted before enum checks, as for numbers: "true" matches enum [true]
+            self.emit(indent + 1, f"{var} = {var}.strip().lower() == 'true' if {var}.__class__ is str else {var}")
+            self.common_checks(shape, var, path, indent + 1)
+        elif f_type == "object":
+            self.emit(indent, f"if not isinstance({var}, dict):")
+            self.error(indent + 1, path, "type", "must be an object")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, "pass")
+            children = shape.get("fields", [])
+            booleans = frozenset(child["name"] for child in children if _is_boolean(child))
+            for child in children:
+                self.child_field(child, var, path, indent + 1, booleans)
+        elif f_type == "array":
+            self.emit(indent, f"if not isinstance({var}, (list, tuple)):")
+            self.error(indent + 1, path, "type", "must be a list")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, "pass")
+            self.array_checks(shape, var, path, indent + 1)
+        else:
+            # Strings: numbers are accepted and checked through their text, as the Inspector always did
+            self.emit(indent, f"if not isinstance({var}, (str, int, float)) or {var}.__class__ is bool:")
+            self.error(indent + 1, path, "type", "must be text")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"{var} = str({var})")
+            self.string_checks(shape, var, path, indent + 1)
+            self.common_checks(shape, var, path, indent + 1)
+
+    def numeric_checks(self, shape: dict, var: str, path: str, indent: int):
+        for op, bound, message in numeric_bounds(shape):
+            if op == "multipleOf":
+                self.emit(indent, f"if abs(({var} / {bound!r}) - round({var} / {bound!r})) > 1e-9:")
+            else:
+                self.emit(indent, f"if {var} {op} {bound!r}:")
+            self.error(indent + 1, path, "range", message)
+
+    def string_checks(self, shape: dict, var: str, path: str, indent: int):
+        min_len, max_len = shape.get("minLength"), shape.get("maxLength")
+        if isinstance(min_len, int) and min_len > 0:
+            self.emit(indent, f"if len({var}) < {min_len}:")
+            self.error(indent + 1, path, "length", f"must be at least {min_len} characters")
+        if isinstance(max_len, int):
+            self.emit(indent, f"if len({var}) > {max_len}:")
+            self.error(indent + 1, path, "length", f"must be at most {max_len} characters")
+
+        pattern = shape.get("_pattern")
+        if pattern is None and shape.get("regex"):
+            try:
+                pattern = re.compile(shape["regex"])
+            except re.error as e:
+                # Same policy as CompiledSchema: a broken rule from the API never blocks a form
+                log.warning(f"Ignoring invalid regex {shape['regex']!r}: {e}")
+        if pattern is not None and pattern.pattern:
+            # match(), not search(): the Inspector has always anchored patterns at the start
+            self.emit(indent, f"if not {self.const(pattern, '_p')}.match({var}):")
+            self.error(indent + 1, path, "pattern", "does not match the required format")
+
+        check = FORMAT_CHECKS.get(str(shape.get("format", "")).lower())
+        if check is not None:
+            self.emit(indent, f"if not {self.const(check, '_f')}({var}):")
+            self.error(indent + 1, path, "format", f"must be a valid {shape['format']}")
+
+    def common_checks(self, shape: dict, var: str, path: str, indent: int):
+        enum = shape.get("enum")
+        if isinstance(enum, list) and enum:
+            try:
+                allowed = frozenset(enum)
+            except TypeError:
+                allowed = tuple(enum)
+            allowed_text = ", ".join(str(v) for v in enum[:10])
+            self.emit(indent, f"if {var} not in {self.const(allowed, '_e')}:")
+            self.error(indent + 1, path, "enum", f"must be one of: {allowed_text}")
+
+    def array_checks(self, shape: dict, var: str, path: str, indent: int):
+        min_items, max_items = shape.get("minItems"), shape.get("maxItems")
+        if isinstance(min_items, int) and min_items > 0:
+            self.emit(indent, f"if len({var}) < {min_items}:")
+            self.error(indent + 1, path, "items", f"must have at least {min_items} items")
+        if isinstance(max_items, int):
+            self.emit(indent, f"if len({var}) > {max_items}:")
+            self.error(indent + 1, path, "items", f"must have at most {max_items} items")
+        if shape.get("uniqueItems") is True:
+            self.emit(indent, f"if not _unique(list({var})):")
+            self.error(indent + 1, path, "unique", "must not contain duplicates")
+
+        items = shape.get("items") or {}
+        if not self._needs_checks(items):
+            return
+        index, item = self.name("i"), self.name("v")
+        item_path = self.name("path")
+        self.emit(indent, f"for {index}, {item} in enumerate({var}):")
+        self.emit(indent + 1, f"{item_path} = {path} + '/' + str({index})")
+        self.emit(indent + 1, f"if {self.missing_check(item)}:")
+        self.error(indent + 2, item_path, "missing", "is required")
+        self.emit(indent + 1, "else:")
+        self.emit(indent + 2, "pass")
+        self.value_checks(items, item, item_path, indent + 2)
+
+    @staticmethod
+    def _needs_checks(shape: dict) -> bool:
+        # Plain strings need no per-item loop; any other type or set keyword does
+        return bool(shape) and (
+            shape.get("type") not in (None, "string") or any(v is not None for k, v in shape.items() if k != "type")
+        )
+
+    def child_field(self, field: dict, parent: str, path: str, indent: int, booleans=frozenset()):
+        var = self.name("v")
+        child_path = self.const(f"/{_pointer_token(field['name'])}", "_k")
+        full_path = self.name("path")
+        self.emit(indent, f"{var} = {parent}.get({field['name']!r})")
+        self.emit(indent, f"if {self.missing_check(var)}:")
+        self.emit(indent + 1, f"{full_path} = {path} + {child_path}")
+        self.required_check(field, parent, full_path, indent + 1, booleans)
+        self.emit(indent, "else:")
+        self.emit(indent + 1, f"{full_path} = {path} + {child_path}")
+        self.value_checks(field, var, full_path, indent + 1)
+
+    def top_level_field(self, field: dict, booleans=frozenset()) -> str:
+        """
+        def _field_N(value, errors, data): ... -> checks one top-level field including required-ness.
+        `data` is the whole record, for cross-field rules.
+        """
+        function = self.name("_field_")
+        self.emit(0, f"def {function}(value, errors, data):")
+        self.emit(1, f"if {self.missing_check('value')}:")
+        self.required_check(field, "data", repr(f"/{_pointer_token(field['name'])}"), 2, booleans)
+        self.emit(1, "else:")
+        self.emit(2, "pass")
+        self.value_checks(field, "value", repr(f"/{_pointer_token(field['name'])}"), 2)
+        self.emit(0, "")
+        return function
+
+
+class CompiledValidator:
+    """
+    Validator generated from a parsed form schema once per schema version.
+    Returns every error as (JSON pointer, code, message), in schema order.
+    """
+    def __init__(self, fields: List[dict], patterns: Optional[Dict[str, re.Pattern]] = None):
+        generator = _CodeGen()
+        self.field_names: List[str] = []
+        function_names: List[str] = []
+        booleans = frozenset(field["name"] for field in fields if _is_boolean(field))
+        for field in fields:
+            # Reuse CompiledSchema's precompiled (and already sanitised) top-level patterns
+            if patterns and field["name"] in patterns:
+                field = {**field, "_pattern": patterns[field["name"]]}
+            self.field_names.append(field["name"])
+            function_names.append(generator.top_level_field(field, booleans))
+
+        generator.emit(0, "def validate(data):")
+        generator.emit(1, "errors = []")
+        generator.emit(1, "get = data.get")
+        for name, function in zip(self.field_names, function_names):
+            generator.emit(1, f"{function}(get({name!r}), errors, data)")
+        generator.emit(1, "return errors")
+
+        self.source = "\n".join(generator.lines)
+        namespace = generator.namespace
+        exec(compile(self.source, "<form validator>", "exec"), namespace)
+        self._validate: Callable[[dict], List[ValidationError]] = namespace["validate"]
+        self._fields: Dict[str, Callable] = {
+            name: namespace[function] for name, function in zip(self.field_names, function_names)
+        }
+        # trigger -> top-level fields whose result depends on it (cross-field rules)
+        self.dependents: Dict[str, List[str]] = {}
+        for field in fields:
+            for trigger in field.get("required_with") or []:
+                self.dependents.setdefault(trigger, []).append(field["name"])
+
+    def __call__(self, data: dict) -> List[ValidationError]:
+        return self._validate(data or {})
+
+    def field_errors(self, name: str, data: dict) -> List[ValidationError]:
+        """
+        Errors of one top-level field of `data`, exactly as a full pass would report them.
+        """
+        errors: List[ValidationError] = []
+        check = self._fields.get(name)
+        if check is not None:
+            check(data.get(name), errors, data)
+        return errors
+
+    def affected_fields(self, changed) -> List[str]:
+        """
+        Fields to re-check after `changed` keys were edited: the keys themselves plus
+        every field with a cross-field rule on them, in schema order.
+        """
+        dirty = set(changed)
+        for name in changed:
+            dirty.update(self.dependents.get(name, ()))
+        return [name for name in self.field_names if name in dirty]
+
+    def value_errors(self, name: str, value: Any) -> List[ValidationError]:
+        """
+        Errors of `value` alone for `name` (cross-field rules aside).
+        """
+        errors: List[ValidationError] = []
+        check = self._fields.get(name)
+        if check is not None:
+            check(value, errors, {})
+        return errors
+
+    def is_valid_value(self, name: str, value: Any) -> bool:
+        """
+        Whether `value` alone is acceptable for `name` (cross-field rules aside).
+        """
+        return not self.value_errors(name, value)
+
+
+def issue_text(error: ValidationError) -> str:
+    """
+    ('/age', 'range', 'must be >= 18') -> 'age (Out of Range: must be >= 18)'.
+    Missing and format errors keep the short 'name (Missing)' / 'name (Invalid Format)' form.
+    """
+    path, code, message = error
+    label = ISSUE_LABELS.get(code, "Invalid")
+    target = path.lstrip("/")
+    if code in ("missing", "pattern", "format"):
+        return f"{target} ({label})"
+    return f"{target} ({label}: {message})"
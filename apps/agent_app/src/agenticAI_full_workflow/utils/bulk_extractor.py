@@ -0,0 +1,137 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/bulk_extractor.py
+import asyncio
+import csv
+import io
+import re
+import time
+from typing import Any, List, Optional
+from src.agenticAI_full_workflow.schemas.compiled_schema import compile_schema
+from src.agenticAI_full_workflow.prompt_library.prompts import build_extraction_prompt
+from src.agenticAI_full_workflow.project_nodes.inspector_node import collect_issues
+from src.agenticAI_full_workflow.utils.fast_extractor import get_fast_extractor
+from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler
+from shared_core.logger.logging import log
+
+BULK_RULES = "The text below describes exactly ONE record. Extract only that record's values."
+# Chunks longer than this are split further so one record never becomes one giant call
+MAX_CHUNK_CHARS = 4000
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+", re.MULTILINE)
+
+
+def _split_table(text: str) -> Optional[List[str]]:
+    """
+    Spreadsheet exports (CSV / TSV / semicolon) -> one "header: value" chunk per row.
+    """
+    lines = [line for line in text.strip().splitlines() if line.strip()]
+    if len(lines) < 2:
+        return None
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines[:20]), delimiters=",\t;|")
+    except csv.Error:
+        return None
+
+    rows = list(csv.reader(io.StringIO("\n".join(lines)), dialect))
+    header = [h.strip() for h in rows[0]]
+    if len(header) < 2:
+        return None
+    consistent = sum(1 for row in rows[1:] if len(row) == len(header))
+    if consistent < 0.8 * (len(rows) - 1):
+        return None
+
+    return [
+        ", ".join(f"{col}: {val.strip()}" for col, val in zip(header, row) if val.strip())
+        for row in rows[1:]
+        if any(v.strip() for v in row)
+    ]
+
+
+def _split_long(chunk: str) -> List[str]:
+    if len(chunk) <= MAX_CHUNK_CHARS:
+        return [chunk]
+    pieces, current = [], ""
+    for line in chunk.splitlines(keepends=True):
+        if current and len(current) + len(line) > MAX_CHUNK_CHARS:
+            pieces.append(current)
+            current = ""
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_records(text: str) -> List[str]:
+    """
+    Best-effort split of a bulk paste into record-sized chunks:
+    table rows, then blank-line separated blocks, then numbered / bulleted list items.
+    """
+    table = _split_table(text)
+    if table:
+        return table
+
+    blocks = [b.strip() for b in _BLANK_LINES.split(text) if b.strip()]
+    if len(blocks) <= 1 and len(_LIST_ITEM.findall(text)) > 1:
+        blocks = [b.strip() for b in _LIST_ITEM.split(text) if b.strip()]
+
+    chunks = []
+    for block in blocks:
+        chunks.extend(_split_long(block))
+    return chunks
+
+
+class BulkExtractor:
+    """
+    Extracts many records concurrently through the same compiled schema the Agent uses.
+    Each chunk tries the rule-based fast path first and only then the LLM.
+    """
+    def __init__(self, llm: Any, concurrency: int = 8):
+        self.llm = llm
+        self.concurrency = max(1, concurrency)
+
+    async def _extract_one(self, index: int, chunk: str, compiled, semaphore: asyncio.Semaphore) -> dict:
+        record = {"index": index, "source": chunk, "data": {}, "missing_fields": [], "error": None}
+
+        values, confident = get_fast_extractor(compiled).extract(chunk)
+        data = dict(values)
+
+        if not (confident and not collect_issues(compiled, data)):
+            prompt = build_extraction_prompt(compiled.field_names, compiled.alias_hints(), extra_rules=BULK_RULES)
+            messages = [("system", prompt), ("user", chunk)]
+            try:
+                async with semaphore:
+                    # Bulk work yields to interactive turns in the shared scheduler
+                    response = await llm_scheduler.run(
+                        lambda: compiled.structured_llm(self.llm).ainvoke(messages),
+                        estimated_tokens=llm_scheduler.estimate_tokens(messages, getattr(self.llm, "model_name", "gpt-4o-mini")),
+                        priority="bulk",
+                    )
+                data.update(response.model_dump(exclude_none=True))
+            except Exception as e:
+                log.error(f"BULK: record {index} failed: {e}")
+                record["error"] = str(e)
+
+        record["data"] = data
+        record["missing_fields"] = collect_issues(compiled, data)
+        return record
+
+    async def extract(self, text: str, form_schema: dict, schema_ref: Optional[str] = None) -> List[dict]:
+        compiled = compile_schema(form_schema, schema_ref)
+        chunks = split_records(text)
+        if not chunks:
+            return []
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+        records = await asyncio.gather(
+            *(self._extract_one(i, chunk, compiled, semaphore) for i, chunk in enumerate(chunks))
+        )
+        elapsed = time.perf_counter() - started
+
+        complete = sum(1 for r in records if not r["missing_fields"] and not r["error"])
+        log.info(
+            f"BULK: {len(records)} record(s) in {elapsed:.2f}s "
+            f"({len(records) / elapsed if elapsed else 0:.1f} rec/s, concurrency={self.concurrency}); "
+            f"{complete} complete."
+        )
+        return list(records)
@@ -1,6 +1,9 @@
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from box import ConfigBox # Optional: Isse dictionary ['key'] ki jagah .key use ho jata hai
+from src.agenticAI_full_workflow.constants import config_path
+from shared_core.logger.logging import log
 
 def read_yaml(path: Path) -> dict:
     try:
@@ -8,4 +11,42 @@ def read_yaml(path: Path) -> dict:
             content = yaml.safe_load(f)
             return content
     except Exception as e:
-        raise Exception(f"Error reading config file at {path}: {e}")
\ No newline at end of file
+        raise Exception(f"Error reading config file at {path}: {e}")
+
+class ConfigLoader:
+    """
+    Handles loading and accessing configuration from the YAML file.
+    """
+    def __init__(self):
+        # Using print as requested instead of logging for now
+        print(f"[INFO]: Loading project configuration from {config_path}")
+        self.config = read_yaml(config_path)
+    
+    def __getitem__(self, key):
+        return self.config.get(key)
+
+@lru_cache(maxsize=1)
+def load_config() -> ConfigLoader:
+    """
+    The process-wide configuration; config.yaml is read once.
+    """
+    return ConfigLoader()
+
+def config_section(name: str) -> dict:
+    """
+    One top-level section of config.yaml as a plain dict; empty when it is missing or the config cannot be read.
+    """
+    try:
+        return dict(load_config()[name] or {})
+    except Exception as e:
+        log.warning(f"Config section '{name}' unavailable, using defaults: {e}")
+        return {}
+
+def latest_user_text(messages: list) -> str:
+    """
+    Content of the most recent human message, or "" if there is none.
+    """
+    for message in reversed(messages):
+        if getattr(message, "type", None) == "human":
+            return str(message.content)
+    return ""
\ No newline at end of file
@@ -0,0 +1,153 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/context_manager.py
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.messages import BaseMessage, SystemMessage, trim_messages
+from src.agenticAI_full_workflow.utils.common import config_section
+from shared_core.logger.logging import log
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tag on summary calls so token streams can tell them apart from the node's own answer
+CONTEXT_SUMMARY_TAG = "context_summary"
+
+# Per-message framing overhead in OpenAI chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a form-filling conversation. Merge the NEW MESSAGES into the "
+    "CURRENT SUMMARY. Keep every fact the user stated (names, numbers, IDs, emails, dates) and every "
+    "correction, with the latest value winning. Drop greetings and small talk. "
+    "Answer with the updated summary only, at most {max_tokens} tokens."
+)
+
+
+@lru_cache(maxsize=16)
+def _encoding(model_name: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use; offline hosts fall back to the estimate
+        log.warning(f"tiktoken encoding unavailable for {model_name}, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(messages: List[Any], model_name: str = "gpt-4o-mini") -> int:
+    """
+    Real token count for the model when tiktoken is available, ~4 chars/token otherwise.
+    """
+    encoding = _encoding(model_name)
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message, BaseMessage) else str(message[1])
+        if not isinstance(content, str):
+            content = str(content)
+        total += MESSAGE_OVERHEAD_TOKENS
+        total += len(encoding.encode(content)) if encoding else len(content) // 4 + 1
+    return total
+
+
+class ContextManager:
+    """
+    Token-budgeted conversation window shared by all nodes.
+
+    Each node gets the newest messages that fit its budget. Messages that fall out of the
+    window are folded once into a rolling summary kept in state (`conversation_summary`,
+    `summarized_upto_id`), so prompt size stays flat however long the session runs.
+    """
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, default_budget: int = 1500,
+                 summary_max_tokens: int = 300, keep_ratio: float = 0.6):
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        self.summary_max_tokens = summary_max_tokens
+        # On overflow, evict down to this share of the budget so summaries are not rewritten every turn
+        self.keep_ratio = keep_ratio
+
+    def budget_for(self, node: str) -> int:
+        return int(self.budgets.get(node, self.default_budget))
+
+    async def window(self, state: dict, node: str, llm: Any) -> Tuple[List[BaseMessage], dict]:
+        """
+        Returns (messages for the prompt, state updates). The updates carry the new summary
+        when older turns had to be evicted; the caller merges them into its return value.
+        """
+        model_name = getattr(llm, "model_name", "gpt-4o-mini")
+        counter = lambda msgs: count_tokens(msgs, model_name)
+
+        messages = list(state.get("messages", []))
+        summary = state.get("conversation_summary") or ""
+        upto_id = state.get("summarized_upto_id")
+
+        # Only messages after the summarized prefix are candidates for the window
+        start = 0
+        if upto_id:
+            for index, message in enumerate(messages):
+                if message.id == upto_id:
+                    start = index + 1
+                    break
+        pending = messages[start:]
+
+        budget = self.budget_for(node)
+        summary_tokens = counter([SystemMessage(summary)]) if summary else 0
+        available = max(budget - summary_tokens, 0)
+
+        updates: dict = {}
+        if counter(pending) > available and len(pending) > 1:
+            kept = self._trim(pending, int(available * self.keep_ratio), counter)
+            kept_ids = {m.id for m in kept}
+            evicted = [m for m in pending if m.id not in kept_ids]
+
+            new_summary = await self._summarize(summary, evicted, llm) if evicted else None
+            if new_summary is not None:
+                summary = new_summary
+                updates = {"conversation_summary": summary, "summarized_upto_id": evicted[-1].id}
+                log.info(f"CONTEXT [{node}]: folded {len(evicted)} message(s) into the rolling summary.")
+            pending = kept
+        else:
+            pending = self._trim(pending, available, counter)
+
+        window = ([SystemMessage(f"Summary of the earlier conversation:\n{summary}")] if summary else []) + pending
+        log.debug(f"CONTEXT [{node}]: {len(pending)} message(s), ~{counter(window)} / {budget} tokens.")
+        return window, updates
+
+    @staticmethod
+    def _trim(messages: List[BaseMessage], max_tokens: int, counter) -> List[BaseMessage]:
+        kept = trim_messages(
+            messages,
+            max_tokens=max_tokens,
+            token_counter=counter,
+            strategy="last",
+            start_on="human",
+            allow_partial=False,
+        )
+        # Never send an empty conversation: the newest message always goes through
+        return kept or messages[-1:]
+
+    async def _summarize(self, summary: str, evicted: List[BaseMessage], llm: Any) -> Optional[str]:
+        transcript = "\n".join(f"{m.type.upper()}: {m.content}" for m in evicted)
+        prompt = [
+            ("system", SUMMARY_PROMPT.format(max_tokens=self.summary_max_tokens)),
+            ("user", f"CURRENT SUMMARY:\n{summary or '(empty)'}\n\nNEW MESSAGES:\n{transcript}"),
+        ]
+        # Imported here: the scheduler itself counts tokens with this module
+        from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler
+        try:
+            response = await llm_scheduler.run(
+                lambda: llm.ainvoke(prompt, config={"tags": [CONTEXT_SUMMARY_TAG]}),
+                estimated_tokens=llm_scheduler.estimate_tokens(prompt, getattr(llm, "model_name", "gpt-4o-mini")),
+            )
+            return str(response.content).strip()
+        except Exception as e:
+            # Keep the old summary; this turn just sees a shorter window
+            log.warning(f"Context summary update failed: {e}")
+            return None
+
+
+context_manager = ContextManager(**config_section("context"))
@@ -0,0 +1,89 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/event_stream.py
+import json
+from typing import Any, AsyncIterator, Optional
+from src.agenticAI_full_workflow.utils.context_manager import CONTEXT_SUMMARY_TAG
+from shared_core.logger.logging import log
+
+# Nodes whose LLM output is user-facing text worth streaming token by token
+TOKEN_NODES = {"Interviewer"}
+
+
+def sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def prepare_turn(graph, config: dict, question: str, approve: bool = False) -> Optional[dict]:
+    """
+    Graph input for the next turn, following the same Review_Gate protocol as app.py:
+    approval resumes with None, anything else is a correction that re-runs extraction.
+    """
+    snapshot = await graph.aget_state(config)
+    if snapshot.next and "Review_Gate" in snapshot.next:
+        if approve:
+            await graph.aupdate_state(config, {"is_approved": True})
+            return None
+        await graph.aupdate_state(config, {"is_approved": False})
+    return {"messages": [("user", question)]}
+
+
+async def graph_event_stream(graph, inputs: Optional[dict], config: dict) -> AsyncIterator[str]:
+    """
+    Runs one graph turn and yields Server-Sent Events:
+    - node:   a node finished (with the state keys it updated)
+    - token:  a token of the Interviewer's reply
+    - review: the Inspector passed the data; summary for the Review_Gate
+    - done / error
+    """
+    thread_id = config["configurable"]["thread_id"]
+    yield sse("start", {"thread_id": thread_id})
+
+    streamed = set()
+    try:
+        # Checkpoint before the run, then follow the nodes' updates: reading state mid-stream
+        # can return the previous step's checkpoint
+        snapshot = await graph.aget_state(config)
+        extracted_data = dict(snapshot.values.get("extracted_data") or {})
+        async for mode, chunk in graph.astream(inputs, config, stream_mode=["updates", "messages"]):
+            if mode == "messages":
+                message, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if node in TOKEN_NODES and CONTEXT_SUMMARY_TAG not in (metadata.get("tags") or []):
+                    if isinstance(message.content, str) and message.content:
+                        streamed.add(node)
+                        yield sse("token", {"node": node, "content": message.content})
+                continue
+
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    continue
+                update = update if isinstance(update, dict) else {}
+                if "extracted_data" in update:
+                    extracted_data = dict(update["extracted_data"] or {})
+                # A drafted follow-up arrives without an LLM call; send it as one token
+                if node in TOKEN_NODES and node not in streamed:
+                    for message in update.get("messages", []):
+                        content = getattr(message, "content", None)
+                        if isinstance(content, str) and content:
+                            yield sse("token", {"node": node, "content": content})
+                payload = {"node": node, "updated": sorted(update)}
+                if node == "Inspector":
+                    payload["missing_fields"] = update.get("missing_fields", [])
+                yield sse("node", payload)
+
+                # The summary is final once the Inspector passes; don't wait for the interrupt
+                if node == "Inspector" and not update.get("missing_fields"):
+                    yield sse("review", {"extracted_data": extracted_data})
+
+    except Exception as e:
+        log.error(f"SSE stream failed for thread {thread_id}: {e}", exc_info=True)
+        yield sse("error", {"error": str(e)})
+        return
+
+    snapshot = await graph.aget_state(config)
+    messages = snapshot.values.get("messages", [])
+    yield sse("done", {
+        "thread_id": thread_id,
+        "next": list(snapshot.next),
+        "awaiting_review": "Review_Gate" in snapshot.next,
+        "last_message": messages[-1].content if messages else None,
+    })
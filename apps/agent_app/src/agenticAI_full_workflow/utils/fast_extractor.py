@@ -0,0 +1,196 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/fast_extractor.py
+import re
+import weakref
+from typing import Dict, List, Optional, Tuple
+from src.agenticAI_full_workflow.schemas.compiled_schema import CompiledSchema
+
+EMAIL_VALUE = r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+INT_VALUE = r"-?\d+"
+NUMBER_VALUE = r"-?\d+(?:\.\d+)?"
+# A value right after one of these is denied or uncertain ("name is not Ali", "age is maybe 25")
+NEGATION_WORDS = (
+    "not", "no", "isn't", "isnt", "wasn't", "never", "nahi", "nahin",
+    "actually", "maybe", "probably", "perhaps", "about", "around", "approximately", "shayad",
+)
+_DOUBT = "|".join(re.escape(w) for w in NEGATION_WORDS)
+# Free text never starts with a copula or a negation/hedge word, and stops at punctuation or a connector ("and", "aur", "hai", ...)
+TEXT_VALUE = (
+    rf"(?!(?:is|are|am|was|n't|{_DOUBT})\b)"
+    r"[^\W\d_][^,;\n]*?(?=\s+(?:and|aur|or|but|not|nahi|hai|he|hay|hoon|hun)\b|[,;\n]|\.(?:\s|$)|$)"
+)
+DOUBT_BEFORE = re.compile(rf"\b(?:{_DOUBT})\W*(?:[\w'-]+\W*)?$", re.IGNORECASE)
+
+# Words that carry no data; anything else left over means the rules did not understand the message
+FILLER_WORDS = {
+    "my", "is", "are", "am", "i", "im", "i'm", "and", "the", "a", "an", "of", "it", "its", "to",
+    "hi", "hello", "salam", "assalam", "o", "alaikum", "please", "thanks", "thank", "you",
+    "mera", "meri", "mere", "hai", "he", "hay", "hoon", "hun", "aur", "ka", "ki", "ke",
+    "also", "here", "details", "years", "year", "old", "yrs", "saal", "sal",
+}
+
+AGE_PHRASE = re.compile(r"(?P<v>\d{1,3})\s*(?:years?\s*old|yrs?\b|saal\b|sal\b)", re.IGNORECASE)
+WORD = re.compile(r"[\w@.'+-]+")
+
+
+def _inner_regex(pattern: str) -> Optional[str]:
+    # '^\d{5}-\d{7}-\d$' -> '\d{5}-\d{7}-\d' so it can be searched inside a sentence
+    inner = pattern
+    for prefix in ("^", r"\A"):
+        inner = inner[len(prefix):] if inner.startswith(prefix) else inner
+    for suffix in ("$", r"\Z"):
+        inner = inner[:-len(suffix)] if inner.endswith(suffix) and not inner.endswith("\\" + suffix) else inner
+    try:
+        re.compile(inner)
+    except re.error:
+        return None
+    return inner
+
+
+class FastExtractor:
+    """
+    Rule-based extraction driven by the schema's own names, labels, types and regexes.
+    Built once per CompiledSchema.
+    """
+    def __init__(self, compiled: CompiledSchema):
+        self.compiled = compiled
+        self.value_patterns: Dict[str, str] = {}
+        self.search_patterns: Dict[str, re.Pattern] = {}
+
+        for field in compiled.fields:
+            name = field["name"]
+            if field.get("type") in ("object", "array"):
+                continue
+            self.value_patterns[name] = self._value_pattern(field)
+            inner = _inner_regex(field["regex"]) if field.get("regex") else None
+            if inner:
+                self.search_patterns[name] = re.compile(rf"(?<![\w-])(?:{inner})(?![\w-])")
+
+        # Longest phrases first so 'id card number' wins over 'id card'
+        self.phrase_patterns: List[Tuple[str, re.Pattern]] = []
+        mentions: Dict[str, List[str]] = {}
+        for phrase in sorted(compiled.aliases, key=len, reverse=True):
+            name = compiled.aliases[phrase]
+            if name not in self.value_patterns:
+                continue
+            words = r"[\s_-]*".join(re.escape(w) for w in phrase.split())
+            mentions.setdefault(name, []).append(words)
+            self.phrase_patterns.append((name, re.compile(
+                rf"\b{words}\b\s*(?:is|=|:|-|hai|he)?\s*:?\s*(?P<v>{self.value_patterns[name]})",
+                re.IGNORECASE,
+            )))
+        # Any alias of the field; two hits in one message usually mean a correction ("age 25 ... I mean age 26")
+        self.mention_patterns: Dict[str, re.Pattern] = {
+            name: re.compile(rf"\b(?:{'|'.join(alternatives)})\b", re.IGNORECASE)
+            for name, alternatives in mentions.items()
+        }
+
+        self.age_field = compiled.aliases.get("age")
+        self.email_field = next(
+            (f["name"] for f in compiled.fields if f.get("format") == "email"),
+            compiled.aliases.get("email"),
+        )
+
+    def _value_pattern(self, field: dict) -> str:
+        f_type = str(field.get("type", "string")).lower()
+        if f_type in ("int", "integer"):
+            return INT_VALUE
+        if f_type in ("number", "float"):
+            return NUMBER_VALUE
+        if field.get("regex") and _inner_regex(field["regex"]):
+            return _inner_regex(field["regex"])
+        if field.get("format") == "email" or "email" in field["name"].lower():
+            return EMAIL_VALUE
+        return TEXT_VALUE
+
+    def _coerce(self, name: str, raw: str):
+        raw = raw.strip().strip(".")
+        f_type = str(self.compiled.rules[name].get("type", "string")).lower()
+        try:
+            if f_type in ("int", "integer"):
+                return int(raw)
+            if f_type in ("number", "float"):
+                return float(raw)
+        except ValueError:
+            return None
+        return raw or None
+
+    def _accept(self, name: str, raw: str) -> Optional[object]:
+        value = self._coerce(name, raw)
+        if value is None:
+            return None
+        if not self.compiled.validator.is_valid_value(name, value):
+            return None
+        return value
+
+    def extract(self, text: str) -> Tuple[Dict[str, object], bool]:
+        """
+        Returns (values, confident). `confident` is True when every word of the message
+        was explained by a rule and no field is mentioned twice (a likely correction),
+        i.e. an LLM would have nothing more to find.
+        """
+        values: Dict[str, object] = {}
+        spans: List[Tuple[int, int]] = []
+
+        def claim(name: str, raw: str, span: Tuple[int, int], value_start: Optional[int] = None) -> bool:
+            if name in values or any(s < span[1] and span[0] < e for s, e in spans):
+                return False
+            if DOUBT_BEFORE.search(text[:span[0] if value_start is None else value_start]):
+                return False
+            value = self._accept(name, raw)
+            if value is None:
+                return False
+            values[name] = value
+            spans.append(span)
+            return True
+
+        # 1. "<alias> is <value>", "mera <alias> <value> hai", "<alias>: <value>"; the last statement wins
+        for name, pattern in self.phrase_patterns:
+            for match in reversed(list(pattern.finditer(text))):
+                if claim(name, match.group("v"), match.span(), match.start("v")):
+                    break
+
+        # 2. "25 years old" / "25 saal"
+        if self.age_field:
+            match = AGE_PHRASE.search(text)
+            if match:
+                claim(self.age_field, match.group("v"), match.span())
+
+        # 3. Values recognizable on their own: emails and anything matching exactly one field's regex
+        if self.email_field:
+            for match in re.finditer(EMAIL_VALUE, text):
+                if claim(self.email_field, match.group(0), match.span()):
+                    break
+        for name, pattern in self.search_patterns.items():
+            if name in values:
+                continue
+            matches = list(pattern.finditer(text))
+            if len(matches) != 1:
+                continue
+            match = matches[0]
+            owners = [n for n, p in self.search_patterns.items() if p.fullmatch(match.group(0))]
+            if owners == [name]:
+                claim(name, match.group(0), match.span())
+
+        leftover = text
+        for start, end in sorted(spans, reverse=True):
+            leftover = leftover[:start] + " " + leftover[end:]
+        unexplained = [
+            w for w in WORD.findall(leftover.lower())
+            if w.strip(".'-") and w.strip(".'-") not in FILLER_WORDS
+        ]
+        restated = [
+            name for name in values
+            if name in self.mention_patterns and len(self.mention_patterns[name].findall(text)) > 1
+        ]
+        return values, bool(values) and not unexplained and not restated
+
+
+# One extractor per compiled schema; entries disappear when the schema LRU drops the schema
+_extractors: "weakref.WeakKeyDictionary[CompiledSchema, FastExtractor]" = weakref.WeakKeyDictionary()
+
+def get_fast_extractor(compiled: CompiledSchema) -> FastExtractor:
+    extractor = _extractors.get(compiled)
+    if extractor is None:
+        extractor = FastExtractor(compiled)
+        _extractors[compiled] = extractor
+    return extractor
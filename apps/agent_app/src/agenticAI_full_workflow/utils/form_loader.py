@@ -1,40 +1,67 @@
 import os
-import httpx
+from typing import IO
 from dotenv import load_dotenv
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.utils.schema_cache import SchemaCache
+from src.agenticAI_full_workflow.utils.openapi_parser import FormRegistry, parse_openapi_registry
+from src.agenticAI_full_workflow.constants import APP_DIR
+from shared_core.logger.logging import log
 
-load_dotenv(override=True)
+load_dotenv()
 
-def parse_openapi_to_fields(openapi_json: dict):
+def parse_openapi_to_fields(openapi_json: dict, operation_id: str = None):
+    """
+    Field list for a single form. Kept for callers that already hold the parsed spec.
+    """
     try:
-        # Navigate to the specific schema
-        schema_path = openapi_json['components']['schemas']['Body_handle_form_submit_post']
-        properties = schema_path.get('properties', {})
-        required_list = schema_path.get('required', [])
-
-        fields = []
-        for name, info in properties.items():
-            # Get the pattern (regex) if it exists in the Swagger
-            pattern = info.get("pattern") or info.get("format")
-            
-            fields.append({
-                "name": name,
-                "type": info.get("type", "string"),
-                "required": name in required_list,
-                "label": info.get("title", name),
-                "regex": pattern  # Now capturing regex from API
-            })
-        return {"fields": fields}
+        form = parse_openapi_registry(openapi_json).select(operation_id)
+        return form or {"fields": []}
     except Exception as e:
-        print(f"[ERROR]: Parser failed: {e}")
+        log.error(f"Parser failed: {e}")
         return {"fields": []}
 
-async def fetch_form_metadata():
+def parse_openapi_spec(body: IO[bytes]) -> dict:
+    """
+    Schema cache parser: the whole spec becomes one registry covering every form.
+    """
+    registry = parse_openapi_registry(body)
+    if not registry.forms:
+        raise ValueError("No form-bearing request bodies found in the spec.")
+    return registry.to_dict()
+
+def load_schema_cache_settings() -> dict:
+    settings = config_section("schema_cache")
+    snapshot = settings.get("snapshot_path")
+    if snapshot:
+        settings["snapshot_path"] = str(APP_DIR / snapshot)
+    return settings
+
+schema_cache = SchemaCache(parse_openapi_spec, **load_schema_cache_settings())
+
+async def fetch_form_registry() -> FormRegistry:
     url = os.getenv("FORM_GET_SCHEMA_URL")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=10.0)
-            response.raise_for_status()
-            return parse_openapi_to_fields(response.json())
-        except Exception as e:
-            print(f"Error fetching schema: {e}")
-            return None
\ No newline at end of file
+    if not url:
+        log.error("FORM_GET_SCHEMA_URL not found in environment variables!")
+        return FormRegistry({})
+    return FormRegistry.from_dict(await schema_cache.get(url))
+
+async def peek_form_metadata(operation_id: str = None):
+    """
+    Like fetch_form_metadata, but only from what the cache already holds (no network).
+    Used to start extraction speculatively while the Scout revalidates.
+    """
+    url = os.getenv("FORM_GET_SCHEMA_URL")
+    cached = await schema_cache.last_known(url) if url else None
+    if not cached:
+        return None
+    return FormRegistry.from_dict(cached).select(operation_id or os.getenv("FORM_OPERATION_ID"))
+
+async def fetch_form_metadata(operation_id: str = None):
+    """
+    Form schema for `operation_id` (default: FORM_OPERATION_ID, then the legacy submit form).
+    """
+    registry = await fetch_form_registry()
+    form = registry.select(operation_id or os.getenv("FORM_OPERATION_ID"))
+    if form is None:
+        log.error(f"Form '{operation_id or os.getenv('FORM_OPERATION_ID')}' not found in the OpenAPI registry.")
+    return form
\ No newline at end of file
@@ -0,0 +1,287 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/llm_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from psycopg.types.json import Jsonb
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.utils.db_manager import db_manager
+from src.agenticAI_full_workflow.constants import APP_DIR
+from shared_core.logger.logging import log
+
+_ROLE_ALIASES = {"user": "human", "assistant": "ai"}
+_WHITESPACE = re.compile(r"\s+")
+# The Postgres backend sweeps expired and over-cap rows once per this many puts
+PRUNE_EVERY_PUTS = 100
+
+
+def normalize_messages(messages: Iterable[Any]) -> list:
+    """
+    (role, content) pairs with message ids and whitespace noise removed,
+    so the same conversation window always produces the same key.
+    """
+    normalized = []
+    for message in messages:
+        if isinstance(message, (tuple, list)):
+            role, content = message[0], message[1]
+        else:
+            role, content = getattr(message, "type", "human"), getattr(message, "content", message)
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        role = _ROLE_ALIASES.get(role, role)
+        normalized.append([role, _WHITESPACE.sub(" ", content).strip()])
+    return normalized
+
+
+class _SQLiteBackend:
+    """
+    Hits only note the access time in memory; the batch is written right before the next
+    put's LRU sweep, the only place `accessed_at` is read, so reads never write or commit.
+    """
+    def __init__(self, path: str, max_entries: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_extraction_cache ("
+            "cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_extraction_cache_created_at_idx ON llm_extraction_cache (created_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_extraction_cache_accessed_at_idx ON llm_extraction_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str, min_created: float) -> Optional[Tuple[float, dict]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_extraction_cache WHERE cache_key = ? AND created_at >= ?",
+                (key, min_created),
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+        return row[1], json.loads(row[0])
+
+    def _put(self, key: str, value: dict, min_created: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_extraction_cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._touched.pop(key, None)
+            if self._touched:
+                self._conn.executemany(
+                    "UPDATE llm_extraction_cache SET accessed_at = ? WHERE cache_key = ?",
+                    [(accessed_at, touched) for touched, accessed_at in self._touched.items()],
+                )
+                self._touched.clear()
+            # TTL first, then LRU by last access
+            self._conn.execute("DELETE FROM llm_extraction_cache WHERE created_at < ?", (min_created,))
+            self._conn.execute(
+                "DELETE FROM llm_extraction_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM llm_extraction_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    async def get(self, key: str, min_created: float) -> Optional[Tuple[float, dict]]:
+        return await asyncio.to_thread(self._get, key, min_created)
+
+    async def put(self, key: str, value: dict, min_created: float):
+        await asyncio.to_thread(self._put, key, value, min_created)
+
+
+class _PostgresBackend:
+    """
+    Same TTL + LRU policy as the SQLite backend, but swept in a background task on the first put
+    and every PRUNE_EVERY_PUTS after it, so the table can exceed `max_entries` by up to that many rows.
+    Hit times are batched in memory and written by the sweep.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._table_ready = False
+        self._touched: Dict[str, float] = {}
+        self._puts = 0
+        self._prune_task: Optional[asyncio.Task] = None
+
+    async def _ensure_table(self, conn):
+        if not self._table_ready:
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_extraction_cache ("
+                "cache_key TEXT PRIMARY KEY, response JSONB NOT NULL, "
+                "created_at TIMESTAMPTZ NOT NULL DEFAULT now(), accessed_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            # Tables created before the LRU cap have no access column yet
+            await conn.execute(
+                "ALTER TABLE llm_extraction_cache ADD COLUMN IF NOT EXISTS accessed_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_extraction_cache_created_at_idx ON llm_extraction_cache (created_at)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_extraction_cache_accessed_at_idx ON llm_extraction_cache (accessed_at)"
+            )
+            self._table_ready = True
+
+    async def get(self, key: str, min_created: float) -> Optional[Tuple[float, dict]]:
+        if db_manager.pool is None:
+            return None
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            cursor = await conn.execute(
+                "SELECT response, extract(epoch FROM created_at) FROM llm_extraction_cache "
+                "WHERE cache_key = %s AND created_at >= to_timestamp(%s)",
+                (key, min_created),
+            )
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        return float(row[1]), row[0]
+
+    async def put(self, key: str, value: dict, min_created: float):
+        if db_manager.pool is None:
+            return
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            await conn.execute(
+                "INSERT INTO llm_extraction_cache (cache_key, response) VALUES (%s, %s) "
+                "ON CONFLICT (cache_key) DO UPDATE SET response = EXCLUDED.response, "
+                "created_at = now(), accessed_at = now()",
+                (key, Jsonb(value)),
+            )
+        self._touched.pop(key, None)
+
+        self._puts += 1
+        if self._puts % PRUNE_EVERY_PUTS == 1 and (self._prune_task is None or self._prune_task.done()):
+            self._prune_task = asyncio.create_task(self._prune(min_created))
+
+    async def _prune(self, min_created: float):
+        touched, self._touched = self._touched, {}
+        try:
+            async with db_manager.pool.connection() as conn:
+                if touched:
+                    await conn.execute(
+                        "UPDATE llm_extraction_cache AS c SET accessed_at = to_timestamp(t.accessed_at) "
+                        "FROM unnest(%s::text[], %s::float8[]) AS t(cache_key, accessed_at) "
+                        "WHERE c.cache_key = t.cache_key",
+                        (list(touched), list(touched.values())),
+                    )
+                # TTL first, then LRU by last access; both walk an index, not the table
+                await conn.execute(
+                    "DELETE FROM llm_extraction_cache WHERE created_at < to_timestamp(%s)", (min_created,)
+                )
+                await conn.execute(
+                    "DELETE FROM llm_extraction_cache WHERE cache_key IN ("
+                    "SELECT cache_key FROM llm_extraction_cache ORDER BY accessed_at DESC OFFSET %s)",
+                    (self.max_entries,),
+                )
+        except Exception as e:
+            log.warning(f"LLM cache prune failed: {e}")
+
+
+class ExtractionCache:
+    """
+    Exact-match cache in front of the structured-output call.
+    Key: (model name, schema hash, system prompt hash, normalized messages).
+    Tier 1 is an in-memory LRU, tier 2 is SQLite or Postgres; both honour the TTL.
+    """
+    def __init__(self, enabled: bool = True, backend: str = "memory", max_entries: int = 2048,
+                 ttl_seconds: float = 86400, sqlite_path: Optional[str] = None):
+        self.enabled = enabled and os.getenv("LLM_CACHE_BYPASS", "").lower() not in ("1", "true", "yes")
+        self.max_entries = max_entries
+        self.ttl = float(ttl_seconds)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "bypassed": 0}
+
+        self._backend = None
+        if backend == "sqlite":
+            self._backend = _SQLiteBackend(sqlite_path or str(APP_DIR / ".cache" / "llm_cache.sqlite3"), max_entries)
+        elif backend == "postgres":
+            self._backend = _PostgresBackend(max_entries)
+
+    @staticmethod
+    def make_key(model_name: str, schema_id: str, system_prompt: str, messages: Iterable[Any]) -> str:
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        payload = json.dumps([model_name, schema_id, prompt_hash, normalize_messages(messages)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_active(self, bypass: bool = False) -> bool:
+        if not self.enabled or bypass:
+            self._counters["bypassed"] += 1
+            return False
+        return True
+
+    async def get(self, key: str) -> Optional[dict]:
+        min_created = time.time() - self.ttl
+
+        item = self._memory.get(key)
+        if item is not None:
+            created_at, value = item
+            if created_at >= min_created:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return value
+            del self._memory[key]
+
+        if self._backend is not None:
+            try:
+                stored = await self._backend.get(key, min_created)
+            except Exception as e:
+                log.warning(f"LLM cache read failed: {e}")
+                stored = None
+            if stored is not None:
+                # Keep the stored creation time: promotion to memory must not extend the TTL
+                created_at, value = stored
+                self._remember(key, value, created_at)
+                self._counters["persistent_hits"] += 1
+                return value
+
+        self._counters["misses"] += 1
+        return None
+
+    async def put(self, key: str, value: dict):
+        self._remember(key, value)
+        if self._backend is not None:
+            try:
+                await self._backend.put(key, value, time.time() - self.ttl)
+            except Exception as e:
+                log.warning(f"LLM cache write failed: {e}")
+
+    def _remember(self, key: str, value: dict, created_at: Optional[float] = None):
+        self._memory[key] = (time.time() if created_at is None else created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        hits = self._counters["memory_hits"] + self._counters["persistent_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "entries_in_memory": len(self._memory),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def load_llm_cache_settings() -> dict:
+    settings = config_section("llm_cache")
+    sqlite_path = settings.get("sqlite_path")
+    if sqlite_path:
+        settings["sqlite_path"] = str(APP_DIR / sqlite_path)
+    return settings
+
+extraction_cache = ExtractionCache(**load_llm_cache_settings())
@@ -0,0 +1,239 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/llm_cassette.py
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, Field
+from src.agenticAI_full_workflow.utils.llm_cache import normalize_messages
+from shared_core.logger.logging import log
+
+PROVIDER_MODES = ("live", "record", "replay", "fake")
+
+FAKE_REPLY = "Could you please share the remaining details?"
+
+
+class Cassette:
+    """
+    JSON file of recorded chat responses keyed by a hash of (model, messages, tools).
+    Shared by every client of the process; each recording is flushed with an atomic write.
+    """
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+                log.info(f"Loaded {len(self._entries)} cassette entries from {self.path}")
+            except Exception as e:
+                log.warning(f"Ignoring unreadable cassette {self.path}: {e}")
+
+    @staticmethod
+    def make_key(model_name: str, messages: Sequence[BaseMessage], tools: Optional[list], tool_choice: Any) -> str:
+        payload = json.dumps(
+            [model_name, normalize_messages(messages), tools or [], tool_choice],
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    def put(self, key: str, entry: dict):
+        with self._lock:
+            self._entries[key] = entry
+            payload = json.dumps(self._entries, indent=1, sort_keys=True)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _message_to_entry(message: AIMessage) -> dict:
+    return {
+        "content": message.content if isinstance(message.content, str) else json.dumps(message.content),
+        "tool_calls": [{"name": c["name"], "args": c["args"]} for c in (message.tool_calls or [])],
+    }
+
+
+def _entry_to_message(entry: dict) -> AIMessage:
+    return AIMessage(
+        content=entry.get("content", ""),
+        tool_calls=[
+            {"name": c["name"], "args": c["args"], "id": f"call_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+            for c in entry.get("tool_calls", [])
+        ],
+    )
+
+
+def _minimal_args(schema: dict, defs: Optional[dict] = None) -> dict:
+    """
+    Smallest arguments that satisfy a JSON schema: required objects recurse, required lists
+    are empty, required scalars get a neutral value, optional keys are left out.
+    """
+    defs = defs if defs is not None else schema.get("$defs", {})
+    args = {}
+    for name in schema.get("required", []):
+        prop = schema.get("properties", {}).get(name, {})
+        if "$ref" in prop:
+            prop = defs.get(prop["$ref"].rsplit("/", 1)[-1], {})
+        p_type = prop.get("type")
+        if p_type == "object" or "properties" in prop:
+            args[name] = _minimal_args(prop, defs)
+        elif p_type == "array":
+            args[name] = []
+        elif p_type in ("integer", "number"):
+            args[name] = 0
+        elif p_type == "boolean":
+            args[name] = False
+        else:
+            args[name] = ""
+    return args
+
+
+class _ToolCallingChatModel(BaseChatModel):
+    """
+    Base for the offline models: `bind_tools` stores OpenAI tool dicts, which is all
+    BaseChatModel.with_structured_output needs.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = "gpt-4o-mini"
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    def _delay(self) -> float:
+        return (self.latency_ms + random.uniform(0, self.latency_jitter_ms)) / 1000
+
+    async def _sleep(self):
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _sleep_sync(self):
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _result(message: AIMessage) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class CassetteChatModel(_ToolCallingChatModel):
+    """
+    "record": forwards every call to `delegate` (the live ChatOpenAI) and stores the answer.
+    "replay": answers from the cassette only, after the configured synthetic latency.
+    Structured-output calls are recorded as function calls, so replay works for both.
+    """
+    cassette: Any
+    mode: str = "replay"
+    delegate: Optional[BaseChatModel] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    def _key(self, messages: List[BaseMessage], kwargs: dict) -> str:
+        return Cassette.make_key(self.model_name, messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+
+    def _replay(self, key: str) -> AIMessage:
+        entry = self.cassette.get(key)
+        if entry is None:
+            raise KeyError(
+                f"No cassette entry for this {self.model_name} call ({key[:12]}). "
+                f"Re-record with LLM_PROVIDER_MODE=record."
+            )
+        return _entry_to_message(entry)
+
+    def _live_model(self, kwargs: dict):
+        tools = kwargs.get("tools")
+        return self.delegate.bind_tools(tools, tool_choice=kwargs.get("tool_choice")) if tools else self.delegate
+
+    def _record(self, key: str, response: AIMessage) -> ChatResult:
+        self.cassette.put(key, _message_to_entry(response))
+        return self._result(response)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages, kwargs)
+        if self.mode == "replay":
+            message = self._replay(key)
+            self._sleep_sync()
+            return self._result(message)
+        return self._record(key, self._live_model(kwargs).invoke(messages))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        key = self._key(messages, kwargs)
+        if self.mode == "replay":
+            message = self._replay(key)
+            await self._sleep()
+            return self._result(message)
+        return self._record(key, await self._live_model(kwargs).ainvoke(messages))
+
+
+class ScriptedChatModel(_ToolCallingChatModel):
+    """
+    Offline stand-in that needs no cassette. Answers come from `script` in order:
+    a string is a chat reply, a dict is the arguments of a structured-output call.
+    Once the script runs out, chat calls get a fixed question and structured calls the
+    smallest arguments their schema accepts (i.e. nothing extracted).
+    """
+    # A deque shared by every client of the registry, so steps follow the graph's call order
+    script: Any = Field(default_factory=deque)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def _next_answer(self, kwargs: dict) -> AIMessage:
+        tools = kwargs.get("tools")
+        step = self.script.popleft() if self.script else None
+
+        if not tools:
+            return AIMessage(content=step if isinstance(step, str) else FAKE_REPLY)
+
+        function = tools[0]["function"]
+        args = step if isinstance(step, dict) else _minimal_args(function.get("parameters", {}))
+        return AIMessage(content="", tool_calls=[
+            {"name": function["name"], "args": args, "id": f"call_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+        ])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self._sleep_sync()
+        return self._result(self._next_answer(kwargs))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await self._sleep()
+        return self._result(self._next_answer(kwargs))
+
+
+def load_script(path: Optional[str]) -> deque:
+    """
+    JSON list of scripted steps for the fake provider.
+    """
+    if not path:
+        return deque()
+    with open(path, "r", encoding="utf-8") as f:
+        return deque(json.load(f))
@@ -0,0 +1,240 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/llm_scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.utils.context_manager import count_tokens
+from shared_core.logger.logging import log
+
+T = TypeVar("T")
+
+# Lower value is served first: live chat turns, then replayed runs, then bulk extraction
+PRIORITIES = {"interactive": 0, "replay": 1, "bulk": 2}
+
+# Successful calls needed (per concurrency slot) before the limit grows by one again
+RECOVERY_FACTOR = 1.0
+# 429s inside this window count as one overload event
+DECREASE_COOLDOWN_SECONDS = 2.0
+
+
+class TokenBucket:
+    """
+    Refills continuously at `per_minute / 60` units per second, up to one minute's worth.
+    """
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def drain(self):
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class _WaitStats:
+    def __init__(self, samples: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=samples)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.recent)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else 0.0
+        return {
+            "requests": self.count,
+            "mean_wait_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "p50_wait_ms": pick(0.5),
+            "p95_wait_ms": pick(0.95),
+            "max_wait_ms": round(self.max * 1000, 1),
+        }
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    - Token buckets for requests/min and tokens/min; a call's cost is its estimated prompt
+      tokens plus `expected_output_tokens`.
+    - Waiting calls are served by priority (interactive, then replay, then bulk), FIFO within a priority.
+    - Concurrency adapts AIMD-style: halved on a 429 (at most once per cooldown), grown by
+      one after a run of successes. Retry-After pauses all dispatching.
+    Overload therefore turns into queueing here instead of retry storms at the API.
+    """
+    def __init__(self, enabled: bool = True, requests_per_minute: float = 500, tokens_per_minute: float = 200000,
+                 max_concurrency: int = 16, min_concurrency: int = 1, expected_output_tokens: int = 256):
+        self.enabled = enabled
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.expected_output_tokens = int(expected_output_tokens)
+
+        self.limit = self.max_concurrency
+        self.active = 0
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._rate_limited = 0
+        self._wait_stats: Dict[str, _WaitStats] = {name: _WaitStats() for name in PRIORITIES}
+
+    def estimate_tokens(self, messages: Any, model_name: str = "gpt-4o-mini") -> int:
+        if isinstance(messages, str):
+            messages = [("user", messages)]
+        return count_tokens(list(messages), model_name) + self.expected_output_tokens
+
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0,
+                  priority: str = "interactive") -> T:
+        """
+        Waits for a slot and bucket capacity, then awaits `call()`.
+        """
+        if not self.enabled:
+            return await call()
+
+        await self._acquire(estimated_tokens, priority)
+        try:
+            result = await call()
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429 or type(e).__name__ == "RateLimitError":
+                self.on_rate_limited()
+            raise
+        else:
+            self._on_success()
+            return result
+        finally:
+            self.active -= 1
+            self._dispatch()
+
+    async def _acquire(self, tokens: int, priority: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        rank = PRIORITIES.get(priority, PRIORITIES["interactive"])
+        heapq.heappush(self._waiters, (rank, next(self._seq), tokens, future, time.monotonic(), priority))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller gave up: hand the slot back
+                self.active -= 1
+                self._dispatch()
+            raise
+
+    def _dispatch(self):
+        while self._waiters and self.active < self.limit:
+            rank, _, tokens, future, queued_at, priority = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            delay = max(
+                self._paused_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(tokens),
+            )
+            if delay > 0:
+                # Head of line waits so lower priorities can't starve it of budget
+                self._schedule(delay)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self.active += 1
+            self._wait_stats[priority if priority in self._wait_stats else "interactive"].add(time.monotonic() - queued_at)
+            future.set_result(None)
+
+    def _schedule(self, delay: float):
+        if self._timer is not None and not self._timer.cancelled():
+            return
+        loop = asyncio.get_running_loop()
+
+        def wake():
+            self._timer = None
+            self._dispatch()
+
+        self._timer = loop.call_later(delay, wake)
+
+    def _on_success(self):
+        self._successes += 1
+        if self.limit < self.max_concurrency and self._successes >= self.limit * RECOVERY_FACTOR:
+            self.limit += 1
+            self._successes = 0
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """
+        Called for every 429, including the client's own retries (see LLMRegistry).
+        """
+        self._rate_limited += 1
+        self._successes = 0
+        now = time.monotonic()
+        if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+            self._last_decrease = now
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            # The API says we're over budget; stop spending what the buckets think is left
+            self.requests.drain()
+            self.tokens.drain()
+            log.warning(f"LLM rate limited (429): concurrency limit -> {self.limit}.")
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def observe_response(self, status_code: int, headers: Any):
+        if status_code != 429:
+            return
+        retry_after = None
+        try:
+            retry_after = float(headers.get("retry-after-ms")) / 1000 if headers.get("retry-after-ms") else float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+        self.on_rate_limited(retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "concurrency_limit": self.limit,
+            "active": self.active,
+            "queued": sum(1 for w in self._waiters if not w[3].done()),
+            "rate_limited": self._rate_limited,
+            "wait": {name: s.to_dict() for name, s in self._wait_stats.items()},
+        }
+
+
+def priority_from_config(config: Optional[dict]) -> str:
+    """
+    `configurable.llm_priority` of a graph run (one of PRIORITIES); unknown values run as interactive.
+    """
+    priority = ((config or {}).get("configurable") or {}).get("llm_priority", "interactive")
+    if priority not in PRIORITIES:
+        log.warning(f"Unknown llm_priority '{priority}', running as interactive.")
+        return "interactive"
+    return priority
+
+
+llm_scheduler = LLMScheduler(**config_section("scheduler"))
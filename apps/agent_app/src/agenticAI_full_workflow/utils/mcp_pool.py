@@ -0,0 +1,291 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/mcp_pool.py
+import asyncio
+import os
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+from langchain_mcp_adapters.sessions import create_session
+from mcp.shared.session import ProgressFnT
+from mcp.types import CallToolResult
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.constants import APP_DIR
+from shared_core.logger.logging import log
+
+# Script and interpreter paths under `mcp:` in config.yaml are relative to the repository root
+REPO_DIR = APP_DIR.parent.parent
+# Slack between a tool's deadline and the client's timeout, for the answer to travel back
+DEADLINE_MARGIN_SECONDS = 1.0
+
+
+def load_mcp_settings(server: str) -> dict:
+    return dict(config_section("mcp").get(server) or {})
+
+
+def server_connection(settings: dict) -> dict:
+    """
+    langchain-mcp-adapters connection for one `mcp:` entry of config.yaml: the shared
+    streamable-HTTP server at `url` when set, otherwise a stdio child process per session.
+    """
+    if settings.get("url"):
+        return {
+            "transport": "streamable_http",
+            "url": settings["url"],
+            "headers": settings.get("headers") or None,
+        }
+
+    script_rel = settings.get("script_path")
+    python_rel = settings.get("python_path")
+    if not script_rel or not python_rel:
+        raise ValueError("MCP Configuration missing in config.yaml")
+
+    return {
+        "command": str(REPO_DIR / python_rel),
+        "args": [str(REPO_DIR / script_rel)],
+        "transport": "stdio",
+        "env": dict(os.environ), # Pass environment variables
+    }
+
+
+class _PooledSession:
+    """
+    One live MCP server connection. Its own task holds the client context open, because the
+    transport's context managers have to be entered and exited in the same task.
+    """
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None
+        self.task: Optional[asyncio.Task] = None
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self.calls = 0
+        self.last_used = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self.task is not None and not self.task.done()
+
+
+class MCPSessionPool:
+    """
+    Fixed-size pool of persistent MCP sessions to one server.
+
+    Sessions are opened once (server process spawned, handshake done) and reused, so a tool call
+    costs one round-trip. Idle sessions are pinged every `health_check_interval` seconds; a session
+    that fails a ping or a call is closed and respawned. `aclose()` waits for in-flight calls
+    before shutting the servers down.
+    """
+    def __init__(self, server: str, size: int = 2, health_check_interval: float = 30.0,
+                 ping_timeout: float = 5.0, call_timeout: float = 60.0, startup_timeout: float = 30.0,
+                 shutdown_timeout: float = 10.0, connection: Optional[dict] = None):
+        self.server = server
+        self.size = max(1, int(size))
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.call_timeout = call_timeout
+        self.startup_timeout = startup_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self._connection = connection
+
+        self._slots: List[_PooledSession] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self._closing = False
+        self.calls = 0
+        self.failures = 0
+        self.respawns = 0
+
+    def connection(self) -> dict:
+        return self._connection or server_connection(load_mcp_settings(self.server))
+
+    # --- lifecycle ---
+    async def start(self):
+        """
+        Opens every session concurrently. Servers that fail to start are logged and retried
+        by the health check or on first use; startup itself never fails.
+        """
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self._closing = False
+            self._idle = asyncio.Queue()
+            self._slots = [_PooledSession(i) for i in range(self.size)]
+            await asyncio.gather(*(self._spawn(slot) for slot in self._slots))
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+            self._health_task = asyncio.create_task(self._health_loop())
+            self._started = True
+
+        alive = sum(1 for slot in self._slots if slot.alive)
+        log.info(f"MCP POOL [{self.server}]: {alive}/{self.size} session(s) ready.")
+
+    async def aclose(self):
+        if not self._started:
+            return
+        self._closing = True
+        if self._health_task:
+            self._health_task.cancel()
+
+        # Let in-flight submissions finish before their servers go away
+        deadline = time.monotonic() + self.shutdown_timeout
+        while (self._idle.qsize() < len(self._slots) or self._background) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        await asyncio.gather(*(self._stop(slot) for slot in self._slots))
+        self._started = False
+        log.info(f"MCP POOL [{self.server}]: shut down after {self.calls} call(s), {self.respawns} respawn(s).")
+
+    async def _run(self, slot: _PooledSession):
+        try:
+            async with create_session(self.connection()) as session:
+                await session.initialize()
+                slot.session = session
+                slot.ready.set()
+                await slot.closing.wait()
+        except Exception as e:
+            slot.error = e
+        finally:
+            slot.session = None
+            slot.ready.set()
+
+    async def _spawn(self, slot: _PooledSession) -> bool:
+        slot.ready, slot.closing, slot.error = asyncio.Event(), asyncio.Event(), None
+        slot.task = asyncio.create_task(self._run(slot), name=f"mcp-{self.server}-{slot.index}")
+        try:
+            await asyncio.wait_for(slot.ready.wait(), self.startup_timeout)
+        except asyncio.TimeoutError:
+            slot.error = TimeoutError(f"no handshake within {self.startup_timeout}s")
+
+        if not slot.alive:
+            await self._stop(slot)
+            log.warning(f"MCP POOL [{self.server}]: session {slot.index} failed to start: {slot.error!r}")
+            return False
+        return True
+
+    async def _stop(self, slot: _PooledSession):
+        task, slot.task = slot.task, None
+        if task is None:
+            return
+        slot.closing.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        slot.session = None
+
+    async def _respawn(self, slot: _PooledSession) -> bool:
+        await self._stop(slot)
+        if self._closing:
+            return False
+        self.respawns += 1
+        log.info(f"MCP POOL [{self.server}]: respawning session {slot.index}.")
+        return await self._spawn(slot)
+
+    async def _recycle(self, slot: _PooledSession):
+        try:
+            await self._respawn(slot)
+        finally:
+            self._idle.put_nowait(slot)
+
+    # --- health ---
+    async def _ping(self, slot: _PooledSession) -> bool:
+        try:
+            await asyncio.wait_for(slot.session.send_ping(), self.ping_timeout)
+            return True
+        except Exception as e:
+            log.warning(f"MCP POOL [{self.server}]: session {slot.index} failed its health check: {e!r}")
+            return False
+
+    async def check_health(self):
+        """
+        Pings the idle sessions one at a time; dead or unresponsive ones are respawned.
+        """
+        for _ in range(self._idle.qsize()):
+            try:
+                slot = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                if not (slot.alive and await self._ping(slot)):
+                    await self._respawn(slot)
+            finally:
+                self._idle.put_nowait(slot)
+
+    async def _health_loop(self):
+        while not self._closing:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                log.error(f"MCP POOL [{self.server}]: health check failed: {e}")
+
+    # --- calls ---
+    async def _acquire(self) -> _PooledSession:
+        if not self._started:
+            await self.start()
+        if self._closing:
+            raise RuntimeError(f"MCP session pool for '{self.server}' is shut down")
+
+        slot = await self._idle.get()
+        if not slot.alive and not await self._respawn(slot):
+            self._idle.put_nowait(slot)
+            raise ConnectionError(f"MCP server '{self.server}' is unavailable: {slot.error!r}")
+        return slot
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any], timeout: Optional[float] = None,
+                        progress_callback: Optional[ProgressFnT] = None) -> CallToolResult:
+        """
+        `progress_callback(progress, total, message)` receives the tool's progress notifications.
+        """
+        slot = await self._acquire()
+        try:
+            result = await slot.session.call_tool(
+                name, arguments=arguments,
+                read_timeout_seconds=timedelta(seconds=timeout or self.call_timeout),
+                progress_callback=progress_callback,
+            )
+        except BaseException:
+            # Whatever state this connection is left in, the next caller gets a fresh one
+            self.failures += 1
+            task = asyncio.create_task(self._recycle(slot))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            raise
+
+        self.calls += 1
+        slot.calls += 1
+        slot.last_used = time.monotonic()
+        self._idle.put_nowait(slot)
+        return result
+
+    def deadline_ms(self, timeout: Optional[float] = None) -> int:
+        """
+        Budget to pass a tool as `deadline_ms` for a call made with `timeout`: the server gives up
+        and answers before this client stops waiting.
+        """
+        return int(max(0.0, (timeout or self.call_timeout) - DEADLINE_MARGIN_SECONDS) * 1000)
+
+    def stats(self) -> dict:
+        return {
+            "server": self.server,
+            "size": self.size,
+            "alive": sum(1 for slot in self._slots if slot.alive),
+            "idle": self._idle.qsize() if self._idle else 0,
+            "calls": self.calls,
+            "failures": self.failures,
+            "respawns": self.respawns,
+        }
+
+
+def build_pool(server: str) -> MCPSessionPool:
+    settings = load_mcp_settings(server).get("pool") or {}
+    return MCPSessionPool(server, **settings)
+
+# Started by AgentWorkflowBuilder.build(), closed in the app lifespan
+mcp_pool = build_pool("verification_server")
@@ -1,31 +1,197 @@
+import asyncio
 import os
 from dotenv import load_dotenv
-from typing import Optional, Any
+from typing import Dict, Optional, Any
+import httpx
 from pydantic import BaseModel, Field
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
 # Importing your custom project modules
-from src.agenticAI_full_workflow.utils.common import read_yaml
-from src.agenticAI_full_workflow.constants import config_path
+from src.agenticAI_full_workflow.utils.common import ConfigLoader, load_config
+from src.agenticAI_full_workflow.constants import APP_DIR
+from src.agenticAI_full_workflow.utils.llm_scheduler import llm_scheduler
+from src.agenticAI_full_workflow.utils.llm_cassette import (
+    PROVIDER_MODES, Cassette, CassetteChatModel, ScriptedChatModel, load_script,
+)
+from shared_core.logger.logging import log
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Load environment variables from .env
-load_dotenv(override=True)
+load_dotenv()
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
 
-class ConfigLoader:
+class LLMRegistry:
     """
-    Handles loading and accessing configuration from the YAML file.
+    Process-wide source of pre-configured chat models.
+
+    Every client shares one tuned httpx connection pool (keep-alive, HTTP/2 when `h2` is
+    installed) and sets explicit timeouts and retries. Nodes ask for a client by name;
+    `llm.nodes.<name>` in config.yaml overrides the defaults from `llm.openai`, so e.g. the
+    Interviewer can run on a cheaper model than the Agent.
+
+    `llm.provider_mode` (or LLM_PROVIDER_MODE) selects where answers come from:
+    live (OpenAI), record (OpenAI, saved to the cassette), replay (cassette only) or
+    fake (scripted, no network). The offline modes add `llm.cassette` synthetic latency.
     """
-    def __init__(self):
-        # Using print as requested instead of logging for now
-        print(f"[INFO]: Loading project configuration from {config_path}")
-        self.config = read_yaml(config_path)
-    
-    def __getitem__(self, key):
-        return self.config.get(key)
+    def __init__(self, config: Optional[ConfigLoader] = None):
+        self.config = config or load_config()
+        llm_config = self.config["llm"] or {}
+        self.defaults: dict = dict(llm_config.get("openai") or {})
+        self.nodes: Dict[str, dict] = dict(llm_config.get("nodes") or {})
+        self.pool: dict = dict(llm_config.get("pool") or {})
+        self.base_url = os.getenv("OPENAI_BASE_URL") or self.defaults.get("base_url") or OPENAI_BASE_URL
+
+        self.cassette_config: dict = dict(llm_config.get("cassette") or {})
+        self.mode = os.getenv("LLM_PROVIDER_MODE") or llm_config.get("provider_mode") or "live"
+        if self.mode not in PROVIDER_MODES:
+            raise ValueError(f"[ERROR]: Unknown llm.provider_mode '{self.mode}' (expected one of {PROVIDER_MODES}).")
+        self._cassette: Optional[Cassette] = None
+        self._script = None
+        self._clients: Dict[str, Any] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+
+    def _http_options(self) -> dict:
+        timeout = float(self.defaults.get("timeout", 60.0))
+        return {
+            "http2": bool(self.pool.get("http2", True)) and HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=int(self.pool.get("max_connections", 50)),
+                max_keepalive_connections=int(self.pool.get("max_keepalive_connections", 20)),
+                keepalive_expiry=float(self.pool.get("keepalive_expiry", 120.0)),
+            ),
+            "timeout": httpx.Timeout(timeout, connect=float(self.pool.get("connect_timeout", 5.0))),
+        }
+
+    @staticmethod
+    async def _observe_response(response: httpx.Response):
+        # Sees every attempt, including the OpenAI client's internal retries
+        llm_scheduler.observe_response(response.status_code, response.headers)
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        if self._http_async_client is None or self._http_async_client.is_closed:
+            self._http_async_client = httpx.AsyncClient(
+                **self._http_options(), event_hooks={"response": [self._observe_response]}
+            )
+        return self._http_async_client
+
+    @property
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.Client(
+                **self._http_options(),
+                event_hooks={"response": [lambda r: llm_scheduler.observe_response(r.status_code, r.headers)]},
+            )
+        return self._http_client
+
+    def settings_for(self, name: str) -> dict:
+        return {**self.defaults, **(self.nodes.get(name) or {})}
+
+    @property
+    def cassette(self) -> Cassette:
+        if self._cassette is None:
+            path = os.getenv("LLM_CASSETTE_PATH") or str(APP_DIR / self.cassette_config.get("path", ".cache/llm_cassette.json"))
+            self._cassette = Cassette(path)
+        return self._cassette
+
+    def get(self, name: str = "default"):
+        """
+        The shared client for `name` (a node name or "default"), built on first use.
+        """
+        client = self._clients.get(name)
+        if client is None:
+            client = self._build(name)
+            self._clients[name] = client
+        return client
+
+    def _build(self, name: str):
+        settings = self.settings_for(name)
+        timing = {
+            "model_name": settings.get("model_name", "gpt-4o-mini"),
+            "latency_ms": float(os.getenv("LLM_SYNTHETIC_LATENCY_MS") or self.cassette_config.get("latency_ms", 0)),
+            "latency_jitter_ms": float(self.cassette_config.get("latency_jitter_ms", 0)),
+        }
+        if self.mode == "fake":
+            if self._script is None:
+                self._script = load_script(os.getenv("LLM_FAKE_SCRIPT") or self.cassette_config.get("script_path"))
+            log.info(f"Using scripted fake model for '{name}'.")
+            return ScriptedChatModel(script=self._script, **timing)
+        if self.mode == "replay":
+            log.info(f"Replaying '{name}' from cassette {self.cassette.path} ({len(self.cassette)} entries).")
+            return CassetteChatModel(cassette=self.cassette, mode="replay", **timing)
+
+        live = self._build_openai(name, settings)
+        if self.mode == "record":
+            log.info(f"Recording '{name}' into cassette {self.cassette.path}.")
+            return CassetteChatModel(cassette=self.cassette, mode="record", delegate=live, model_name=live.model_name)
+        return live
+
+    def _build_openai(self, name: str, settings: dict) -> ChatOpenAI:
+        # Retrieve API Key
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("[ERROR]: OPENAI_API_KEY missing in .env file.")
+
+        try:
+            model_name = settings["model_name"]
+        except KeyError as e:
+            raise KeyError(f"[ERROR]: Missing key in config.yaml: {str(e)}")
+
+        extra = {"temperature": settings["temperature"]} if "temperature" in settings else {}
+        log.info(f"Initializing OpenAI model '{model_name}' for '{name}'.")
+        return ChatOpenAI(
+            model=model_name,
+            api_key=api_key,
+            base_url=self.base_url,
+            timeout=float(settings.get("timeout", 60.0)),
+            max_retries=int(settings.get("max_retries", 2)),
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+            **extra,
+        )
+
+    async def warmup(self):
+        """
+        Opens pooled connections ahead of the first request so it doesn't pay DNS + TLS setup.
+        GET /models is free and needs no request body.
+        """
+        connections = int(self.pool.get("warmup_connections", 2))
+        if connections <= 0 or self.mode in ("replay", "fake") or not os.getenv("OPENAI_API_KEY"):
+            return
+        headers = {"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"}
+
+        async def ping():
+            response = await self.http_async_client.get(f"{self.base_url}/models", headers=headers)
+            await response.aread()
+
+        results = await asyncio.gather(*(ping() for _ in range(connections)), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            log.warning(f"LLM connection warmup failed for {len(failures)}/{connections}: {failures[0]}")
+        else:
+            log.info(f"LLM connection pool warmed ({connections} connection(s), http2={self._http_options()['http2']}).")
+
+    async def aclose(self):
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+        if self._http_client is not None:
+            self._http_client.close()
+        self._clients.clear()
+
+llm_registry = LLMRegistry()
 
 class ModelLoader(BaseModel):
     """
     Orchestrates the loading of the OpenAI LLM based on configuration.
+    Kept for existing callers; clients come from the shared `llm_registry`.
     """
     config: Optional[ConfigLoader] = Field(default=None, exclude=True)
 
@@ -33,37 +199,22 @@ class ModelLoader(BaseModel):
         """
         Automatically initializes the configuration after Pydantic model creation.
         """
-        self.config = ConfigLoader()
+        self.config = load_config()
     
     class Config:
         # Allows Pydantic to accept the ConfigLoader type
         arbitrary_types_allowed = True
     
-    def load_llm(self) -> ChatOpenAI:
+    def load_llm(self, name: str = "default") -> BaseChatModel:
         """
-        Validates environment variables and initializes the OpenAI Chat Model.
+        Validates environment variables and returns the shared chat model for `name`.
         Returns:
-            ChatOpenAI: An instance of the LangChain OpenAI wrapper.
+            BaseChatModel: ChatOpenAI in live mode; a cassette or scripted model when
+            llm.provider_mode is record / replay / fake.
         """
-        # Retrieve API Key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("[ERROR]: OPENAI_API_KEY missing in .env file.")
-
-        # Fetch model parameters from YAML config
         try:
-            openai_config = self.config["llm"]["openai"]
-            model_name = openai_config["model_name"]
-            
-            print(f"[INFO]: Initializing OpenAI Model: {model_name}")
-            
-            return ChatOpenAI(
-                model=model_name, 
-                api_key=api_key,
-            )
-            
-        except KeyError as e:
-            raise KeyError(f"[ERROR]: Missing key in config.yaml: {str(e)}")
+            return llm_registry.get(name)
+        except (KeyError, ValueError):
+            raise
         except Exception as e:
             raise Exception(f"[ERROR]: Failed to load LLM: {str(e)}")
-
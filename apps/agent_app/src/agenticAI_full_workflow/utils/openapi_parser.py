@@ -0,0 +1,314 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/openapi_parser.py
+import io
+from typing import Any, Dict, Iterable, List, Optional, Union
+import ijson
+from ijson.common import ObjectBuilder
+from shared_core.logger.logging import log
+
+# Only these parts of the document are ever needed to build the form registry
+SPEC_SECTIONS = (
+    "paths",
+    "components.schemas",
+    "components.requestBodies",
+    "components.parameters",
+    "definitions",   # Swagger 2.0
+    "parameters",    # Swagger 2.0 global parameters
+)
+
+FORM_METHODS = ("post", "put", "patch")
+FORM_CONTENT_TYPES = (
+    "application/x-www-form-urlencoded",
+    "multipart/form-data",
+    "application/json",
+)
+CONSTRAINT_KEYS = (
+    "format", "enum", "default", "description",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+    "minLength", "maxLength", "minItems", "maxItems", "uniqueItems",
+)
+
+# Legacy target form used before the registry existed
+DEFAULT_SOURCE_SCHEMA = "Body_handle_form_submit_post"
+
+
+def _pick_sections(document: dict, wanted: Iterable[str]) -> Dict[str, dict]:
+    sections = {}
+    for name in wanted:
+        node = document
+        for part in name.split("."):
+            node = node.get(part, {}) if isinstance(node, dict) else {}
+        sections[name] = node if isinstance(node, dict) else {}
+    return sections
+
+
+def _stream_sections(source: Union[bytes, io.IOBase], wanted: Iterable[str]) -> Dict[str, dict]:
+    """
+    Builds only the wanted top-level sections of a JSON document, reading `source` incrementally.
+    The rest of the spec (info, responses, examples...) is scanned but never built.
+    """
+    wanted = set(wanted)
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    sections: Dict[str, dict] = {name: {} for name in wanted}
+
+    section, key, builder, depth = None, None, None, 0
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                sections[section][key] = builder.value
+                builder = None
+            continue
+
+        if event == "map_key" and prefix in wanted:
+            section, key, builder, depth = prefix, value, ObjectBuilder(), 0
+
+    return sections
+
+
+class OpenAPIParser:
+    """
+    Turns OpenAPI 3 / Swagger 2 request bodies into field trees.
+    `$ref` targets are resolved once and memoized, so shared components cost one conversion.
+    """
+    def __init__(self, sections: Dict[str, dict]):
+        self.sections = sections
+        self._memo: Dict[str, dict] = {}
+        self._resolving: set = set()
+
+    # --- $ref handling ---
+    def _lookup(self, ref: str) -> Optional[dict]:
+        if not ref.startswith("#/"):
+            log.warning(f"External $ref not supported: {ref}")
+            return None
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in ref[2:].split("/")]
+
+        # '#/components/schemas/X' lives in section 'components.schemas', '#/definitions/X' in 'definitions'
+        for width in (2, 1):
+            section = self.sections.get(".".join(parts[:width]))
+            if section is None:
+                continue
+            node: Any = section
+            for part in parts[width:]:
+                node = node.get(part) if isinstance(node, dict) else None
+            if isinstance(node, dict):
+                return node
+        log.warning(f"Unresolvable $ref: {ref}")
+        return None
+
+    def _deref(self, schema: dict) -> dict:
+        seen = set()
+        while isinstance(schema, dict) and "$ref" in schema and schema["$ref"] not in seen:
+            seen.add(schema["$ref"])
+            schema = self._lookup(schema["$ref"]) or {}
+        return schema if isinstance(schema, dict) else {}
+
+    def _flatten(self, schema: dict) -> dict:
+        # allOf: merge every part into one object schema
+        if "allOf" in schema:
+            merged = {k: v for k, v in schema.items() if k != "allOf"}
+            properties = dict(merged.get("properties", {}))
+            required = list(merged.get("required", []))
+            for part in schema["allOf"]:
+                part = self._flatten(self._deref(part))
+                properties.update(part.get("properties", {}))
+                required.extend(part.get("required", []))
+                for k, v in part.items():
+                    if k not in ("properties", "required"):
+                        merged.setdefault(k, v)
+            if properties:
+                merged["properties"] = properties
+            if required:
+                merged["required"] = required
+            schema = merged
+
+        # anyOf / oneOf: FastAPI emits Optional[X] as anyOf [X, null]; take the first non-null option
+        for key in ("anyOf", "oneOf"):
+            if key in schema:
+                options = [self._deref(o) for o in schema[key]]
+                options = [o for o in options if o.get("type") != "null"]
+                rest = {k: v for k, v in schema.items() if k != key}
+                if options:
+                    base = self._flatten(options[0])
+                    schema = {**base, **rest}
+                else:
+                    schema = rest
+        return schema
+
+    # --- field trees ---
+    def shape(self, schema: dict) -> dict:
+        """
+        Type, regex, constraints and nested `fields` / `items` of a schema node.
+        """
+        if not isinstance(schema, dict):
+            return {"type": "string", "regex": None}
+
+        ref = schema.get("$ref")
+        if ref:
+            if ref in self._memo:
+                return self._memo[ref]
+            if ref in self._resolving:
+                # Recursive model: stop at one level instead of looping forever
+                return {"type": "object", "regex": None, "fields": []}
+            self._resolving.add(ref)
+            try:
+                result = self.shape(self._lookup(ref) or {})
+            finally:
+                self._resolving.discard(ref)
+            self._memo[ref] = result
+            return result
+
+        schema = self._flatten(schema)
+        f_type = schema.get("type")
+        if isinstance(f_type, list):
+            f_type = next((t for t in f_type if t != "null"), "string")
+        if f_type is None:
+            f_type = "object" if "properties" in schema else "string"
+
+        result = {"type": f_type, "regex": schema.get("pattern")}
+        for key in CONSTRAINT_KEYS:
+            if key in schema:
+                result[key] = schema[key]
+
+        if f_type == "object":
+            result["fields"] = self.object_fields(schema)
+        elif f_type == "array":
+            result["items"] = self.shape(schema.get("items", {}))
+        return result
+
+    def object_fields(self, schema: dict) -> List[dict]:
+        required = set(schema.get("required", []))
+        fields = [
+            self.make_field(name, prop, name in required)
+            for name, prop in schema.get("properties", {}).items()
+        ]
+
+        # dependentRequired (3.1) / array-valued dependencies (Swagger 2, 3.0): "if A is given, B is required"
+        triggers: Dict[str, List[str]] = {}
+        dependencies = {**(schema.get("dependencies") or {}), **(schema.get("dependentRequired") or {})}
+        for trigger, dependents in dependencies.items():
+            if isinstance(dependents, list):
+                for dependent in dependents:
+                    triggers.setdefault(dependent, []).append(trigger)
+        for field in fields:
+            if field["name"] in triggers:
+                field["required_with"] = triggers[field["name"]]
+        return fields
+
+    def make_field(self, name: str, prop: dict, required: bool) -> dict:
+        shape = self.shape(prop)
+        field = {
+            "name": name,
+            "type": shape["type"],
+            "required": required,
+            "label": prop.get("title", name) if isinstance(prop, dict) else name,
+            "regex": shape.get("regex"),
+        }
+        field.update({k: v for k, v in shape.items() if k not in ("type", "regex")})
+        return field
+
+    # --- operations ---
+    def _openapi3_body(self, operation: dict) -> Optional[dict]:
+        body = self._deref(operation.get("requestBody", {}))
+        content = body.get("content", {})
+        for content_type in FORM_CONTENT_TYPES:
+            if content_type in content:
+                schema = content[content_type].get("schema", {})
+                return {
+                    "content_type": content_type,
+                    "source_schema": schema.get("$ref", "").rsplit("/", 1)[-1] or None,
+                    "fields": self.shape(schema).get("fields", []),
+                }
+        return None
+
+    def _swagger2_body(self, operation: dict, shared_params: list) -> Optional[dict]:
+        params = [self._deref(p) for p in shared_params + operation.get("parameters", [])]
+        consumes = operation.get("consumes", [])
+
+        for param in params:
+            if param.get("in") == "body":
+                schema = param.get("schema", {})
+                return {
+                    "content_type": consumes[0] if consumes else "application/json",
+                    "source_schema": schema.get("$ref", "").rsplit("/", 1)[-1] or None,
+                    "fields": self.shape(schema).get("fields", []),
+                }
+
+        form_params = [p for p in params if p.get("in") == "formData"]
+        if form_params:
+            return {
+                "content_type": consumes[0] if consumes else "application/x-www-form-urlencoded",
+                "source_schema": None,
+                "fields": [self.make_field(p["name"], p, p.get("required", False)) for p in form_params],
+            }
+        return None
+
+    def forms(self) -> Dict[str, dict]:
+        registry = {}
+        for path, item in self.sections.get("paths", {}).items():
+            if not isinstance(item, dict):
+                continue
+            shared_params = item.get("parameters", [])
+            for method in FORM_METHODS:
+                operation = item.get(method)
+                if not isinstance(operation, dict):
+                    continue
+                body = (self._openapi3_body(operation)
+                        if "requestBody" in operation
+                        else self._swagger2_body(operation, shared_params))
+                if not body or not body["fields"]:
+                    continue
+                operation_id = operation.get("operationId") or f"{method}_{path}"
+                registry[operation_id] = {"method": method.upper(), "path": path, **body}
+        return registry
+
+
+class FormRegistry:
+    """
+    operationId -> form (method, path, content type, field tree) for one spec.
+    Stored as plain dicts so it can live in the schema cache and its snapshot.
+    """
+    def __init__(self, forms: Dict[str, dict]):
+        self.forms = forms
+
+    def to_dict(self) -> dict:
+        return {"forms": self.forms}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "FormRegistry":
+        return cls((data or {}).get("forms", {}))
+
+    def default_operation_id(self) -> Optional[str]:
+        for operation_id, form in self.forms.items():
+            if form.get("source_schema") == DEFAULT_SOURCE_SCHEMA:
+                return operation_id
+        return next(iter(self.forms), None)
+
+    def select(self, operation_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Form schema in the shape the nodes expect: {"form_id": ..., "fields": [...]}.
+        """
+        operation_id = operation_id or self.default_operation_id()
+        form = self.forms.get(operation_id) if operation_id else None
+        if form is None:
+            return None
+        return {"form_id": operation_id, "fields": form["fields"]}
+
+
+def parse_openapi_registry(source: Union[bytes, dict, io.IOBase]) -> FormRegistry:
+    """
+    One parse of the spec serves every form-bearing operation in it.
+    """
+    if isinstance(source, dict):
+        sections = _pick_sections(source, SPEC_SECTIONS)
+    else:
+        sections = _stream_sections(source, SPEC_SECTIONS)
+
+    registry = FormRegistry(OpenAPIParser(sections).forms())
+    log.info(f"OpenAPI registry built with {len(registry.forms)} form(s).")
+    return registry
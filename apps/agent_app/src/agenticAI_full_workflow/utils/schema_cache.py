@@ -0,0 +1,217 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/schema_cache.py
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Callable, Dict, Optional
+import httpx
+from shared_core.logger.logging import log
+
+# Spec bodies up to this size are spooled in memory, larger ones to a temp file
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+class CacheEntry:
+    """
+    One cached form schema plus the validators needed for a conditional GET.
+    """
+    def __init__(self, schema: dict, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, fetched_at: Optional[float] = None):
+        self.schema = schema
+        self.etag = etag
+        self.last_modified = last_modified
+        # Wall-clock time so the age survives a restart via the snapshot
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def to_dict(self) -> dict:
+        return {
+            "schema": self.schema,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheEntry":
+        return cls(
+            schema=data["schema"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            fetched_at=data.get("fetched_at", 0.0),
+        )
+
+
+class SchemaCache:
+    """
+    Process-wide form schema cache keyed by URL.
+
+    - Fresh (age < ttl): served straight from memory.
+    - Stale (age < ttl + stale): served immediately, revalidated in the background.
+    - Expired / missing: fetched inline. Concurrent misses share one request (single-flight).
+    Revalidation uses ETag / Last-Modified, so an unchanged swagger costs a 304 and no re-parse.
+    `parser` receives the response body as a binary file object and returns the JSON-serializable
+    value to cache; it runs in a worker thread.
+    """
+    def __init__(self, parser: Callable[[IO[bytes]], dict], ttl_seconds: float = 300,
+                 stale_seconds: float = 86400, request_timeout: float = 10.0,
+                 snapshot_path: Optional[str] = None):
+        self.parser = parser
+        self.ttl = float(ttl_seconds)
+        self.stale = float(stale_seconds)
+        self.timeout = float(request_timeout)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+
+        self._entries: Dict[str, CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._snapshot_loaded = False
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One keep-alive client for every revalidation instead of a new one per conversation
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def get(self, url: str) -> Optional[dict]:
+        """
+        Returns the parsed value for `url`, or None if it was never fetchable.
+        """
+        if not self._snapshot_loaded:
+            await self._load_snapshot()
+
+        entry = self._entries.get(url)
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                return entry.schema
+            if age < self.ttl + self.stale:
+                log.debug(f"Schema cache STALE for {url} (age {age:.0f}s). Revalidating in background.")
+                self._start_refresh(url)
+                return entry.schema
+
+        log.debug(f"Schema cache MISS for {url}. Fetching inline.")
+        return await asyncio.shield(self._start_refresh(url))
+
+    async def last_known(self, url: str) -> Optional[dict]:
+        """
+        Last known schema for `url` (memory or snapshot) without any network I/O.
+        """
+        if not self._snapshot_loaded:
+            await self._load_snapshot()
+        return self.peek(url)
+
+    def peek(self, url: str) -> Optional[dict]:
+        """
+        Last known schema for `url` regardless of age, without any network I/O.
+        """
+        entry = self._entries.get(url)
+        return entry.schema if entry else None
+
+    def invalidate(self, url: Optional[str] = None):
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+    def _start_refresh(self, url: str) -> asyncio.Task:
+        # Single-flight: every caller waiting on the same URL shares one task
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._revalidate(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return task
+
+    async def _revalidate(self, url: str) -> Optional[dict]:
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            if url.startswith("file://"):
+                # Local spec for offline runs and benchmarks: re-read every time, nothing to revalidate
+                schema = await asyncio.to_thread(self._parse_file, Path(url[len("file://"):]))
+                if not schema:
+                    raise ValueError("Parser returned an empty schema.")
+                self._entries[url] = CacheEntry(schema=schema)
+                return schema
+
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as body:
+                async with self._get_client().stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and entry is not None:
+                        log.debug(f"Schema unchanged (304) for {url}.")
+                        entry.fetched_at = time.time()
+                        await self._save_snapshot()
+                        return entry.schema
+
+                    response.raise_for_status()
+                    # The body is never held as one buffer: chunks go to the spool as they arrive
+                    async for chunk in response.aiter_bytes():
+                        body.write(chunk)
+                body.seek(0)
+                # Multi-MB specs: parse off the event loop so other sessions keep being served
+                schema = await asyncio.to_thread(self.parser, body)
+            if not schema:
+                raise ValueError("Parser returned an empty schema.")
+
+            self._entries[url] = CacheEntry(
+                schema=schema,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            log.info(f"Schema cache refreshed for {url}.")
+            await self._save_snapshot()
+            return schema
+
+        except Exception as e:
+            if entry is not None:
+                # Keep serving the last good copy rather than failing the turn
+                log.warning(f"Schema revalidation failed for {url}, serving cached copy: {e}")
+                return entry.schema
+            log.error(f"Error fetching schema: {e}")
+            return None
+
+    def _parse_file(self, path: Path) -> dict:
+        with open(path, "rb") as body:
+            return self.parser(body)
+
+    async def _load_snapshot(self):
+        self._snapshot_loaded = True
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            raw = await asyncio.to_thread(self.snapshot_path.read_text, encoding="utf-8")
+            for url, data in json.loads(raw).items():
+                self._entries.setdefault(url, CacheEntry.from_dict(data))
+            log.info(f"Schema cache warm-started with {len(self._entries)} entries from {self.snapshot_path}")
+        except Exception as e:
+            log.warning(f"Ignoring unreadable schema snapshot {self.snapshot_path}: {e}")
+
+    async def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        payload = json.dumps({url: e.to_dict() for url, e in self._entries.items()})
+        try:
+            await asyncio.to_thread(self._write_atomic, payload)
+        except Exception as e:
+            log.warning(f"Could not write schema snapshot {self.snapshot_path}: {e}")
+
+    def _write_atomic(self, payload: str):
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
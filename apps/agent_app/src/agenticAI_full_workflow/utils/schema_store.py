@@ -0,0 +1,111 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/schema_store.py
+from collections import OrderedDict
+from typing import Optional, Tuple
+from psycopg.types.json import Jsonb
+from src.agenticAI_full_workflow.schemas.compiled_schema import schema_hash
+from src.agenticAI_full_workflow.utils.db_manager import db_manager
+from shared_core.logger.logging import log
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS form_schemas (
+    schema_hash TEXT PRIMARY KEY,
+    form_schema JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+class SchemaStore:
+    """
+    Content-addressed form schema store. Checkpoints carry only `schema_ref` (the content hash);
+    the schema itself lives once in memory and once in the `form_schemas` Postgres table.
+    """
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._memory: "OrderedDict[str, dict]" = OrderedDict()
+        self._persisted: set = set()
+        self._table_ready = False
+
+    def _remember(self, ref: str, form_schema: dict):
+        self._memory[ref] = form_schema
+        self._memory.move_to_end(ref)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    async def _ensure_table(self, conn):
+        if not self._table_ready:
+            await conn.execute(CREATE_TABLE_SQL)
+            self._table_ready = True
+
+    async def put(self, form_schema: dict) -> Tuple[str, bool]:
+        """
+        Stores the schema and returns (schema_ref, durable). `durable` is False when
+        Postgres is unavailable and the schema only lives in this process.
+        """
+        ref = schema_hash(form_schema)
+        self._remember(ref, form_schema)
+
+        if ref in self._persisted:
+            return ref, True
+        if db_manager.pool is None:
+            return ref, False
+
+        try:
+            async with db_manager.pool.connection() as conn:
+                await self._ensure_table(conn)
+                await conn.execute(
+                    "INSERT INTO form_schemas (schema_hash, form_schema) VALUES (%s, %s) "
+                    "ON CONFLICT (schema_hash) DO NOTHING",
+                    (ref, Jsonb(form_schema)),
+                )
+            self._persisted.add(ref)
+            return ref, True
+        except Exception as e:
+            log.warning(f"Could not persist form schema {ref[:12]}: {e}")
+            return ref, False
+
+    async def get(self, ref: str) -> Optional[dict]:
+        form_schema = self._memory.get(ref)
+        if form_schema is not None:
+            self._memory.move_to_end(ref)
+            return form_schema
+        if db_manager.pool is None:
+            return None
+
+        try:
+            async with db_manager.pool.connection() as conn:
+                await self._ensure_table(conn)
+                cursor = await conn.execute(
+                    "SELECT form_schema FROM form_schemas WHERE schema_hash = %s", (ref,)
+                )
+                row = await cursor.fetchone()
+        except Exception as e:
+            log.error(f"Could not load form schema {ref[:12]}: {e}")
+            return None
+
+        if row is None:
+            return None
+        self._remember(ref, row[0])
+        self._persisted.add(ref)
+        return row[0]
+
+    async def resolve(self, state: dict, speculative: bool = False) -> Tuple[dict, Optional[str]]:
+        """
+        (form_schema, schema_ref) for a graph state. Threads checkpointed before
+        schemas were stored by reference still embed `form_schema` and keep working.
+        With `speculative`, the version this turn's extraction started on wins over `schema_ref`
+        (the Scout may be replacing it in parallel).
+        """
+        ref = state.get("schema_ref")
+        if speculative:
+            ref = (state.get("speculation") or {}).get("schema_ref") or ref
+        if ref:
+            form_schema = await self.get(ref)
+            if form_schema is not None:
+                return form_schema, ref
+            log.warning(f"schema_ref {ref[:12]} not found in store; falling back to embedded schema.")
+
+        form_schema = state.get("form_schema") or {}
+        return form_schema, None
+
+# Safe to instantiate at module level
+schema_store = SchemaStore()
@@ -0,0 +1,144 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/submission_dedup.py
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+from psycopg.types.json import Jsonb
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.utils.db_manager import db_manager
+from shared_core.logger.logging import log
+
+# Expired keys are swept in the background once per this many Postgres puts
+PRUNE_EVERY_PUTS = 100
+
+
+def canonical_payload(payload: dict) -> str:
+    # Key order and whitespace never make two identical submissions look different
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def idempotency_key(thread_id: str, payload: dict) -> str:
+    """
+    Same thread + same data -> same key, however often it is approved, retried or replayed.
+    """
+    return hashlib.sha256(f"{thread_id}\n{canonical_payload(payload)}".encode("utf-8")).hexdigest()
+
+
+class _PostgresBackend:
+    """
+    Expired rows are swept in a background task on the first put and every PRUNE_EVERY_PUTS
+    after it, so they may outlive the TTL briefly; reads filter them out anyway.
+    """
+    def __init__(self):
+        self._table_ready = False
+        self._puts = 0
+        self._prune_task: Optional[asyncio.Task] = None
+
+    async def _ensure_table(self, conn):
+        if not self._table_ready:
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS submission_dedup ("
+                "idempotency_key TEXT PRIMARY KEY, thread_id TEXT NOT NULL, result JSONB NOT NULL, "
+                "created_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS submission_dedup_created_at_idx ON submission_dedup (created_at)"
+            )
+            self._table_ready = True
+
+    async def get(self, key: str, min_created: float) -> Optional[dict]:
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            cursor = await conn.execute(
+                "SELECT result FROM submission_dedup WHERE idempotency_key = %s AND created_at >= to_timestamp(%s)",
+                (key, min_created),
+            )
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def put(self, key: str, thread_id: str, result: dict, min_created: float):
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            # First result wins: a repeat must never overwrite what the backend originally answered
+            await conn.execute(
+                "INSERT INTO submission_dedup (idempotency_key, thread_id, result) VALUES (%s, %s, %s) "
+                "ON CONFLICT (idempotency_key) DO NOTHING",
+                (key, thread_id, Jsonb(result)),
+            )
+
+        self._puts += 1
+        if self._puts % PRUNE_EVERY_PUTS == 1 and (self._prune_task is None or self._prune_task.done()):
+            self._prune_task = asyncio.create_task(self._prune(min_created))
+
+    async def _prune(self, min_created: float):
+        try:
+            async with db_manager.pool.connection() as conn:
+                await conn.execute("DELETE FROM submission_dedup WHERE created_at < to_timestamp(%s)", (min_created,))
+        except Exception as e:
+            log.warning(f"Submission dedup prune failed: {e}")
+
+
+class SubmissionDedup:
+    """
+    Delivered submissions by idempotency key -> the original result, so repeats are answered
+    without another backend call. Tier 1 is a bounded in-memory LRU, tier 2 the Postgres table
+    `submission_dedup` (when the checkpointer's pool is open); both honour the TTL.
+    """
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 604800):
+        self.max_entries = max_entries
+        self.ttl = float(ttl_seconds)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._postgres = _PostgresBackend()
+        self._counters = {"hits": 0, "misses": 0, "recorded": 0}
+
+    async def get(self, key: str) -> Optional[dict]:
+        min_created = time.time() - self.ttl
+
+        item = self._memory.get(key)
+        if item is not None:
+            created_at, result = item
+            if created_at >= min_created:
+                self._memory.move_to_end(key)
+                self._counters["hits"] += 1
+                return result
+            del self._memory[key]
+
+        if db_manager.pool is not None:
+            try:
+                result = await self._postgres.get(key, min_created)
+            except Exception as e:
+                log.warning(f"Submission dedup read failed: {e}")
+                result = None
+            if result is not None:
+                self._remember(key, result)
+                self._counters["hits"] += 1
+                return result
+
+        self._counters["misses"] += 1
+        return None
+
+    async def put(self, key: str, thread_id: str, result: dict):
+        if key in self._memory:
+            return
+        self._remember(key, result)
+        self._counters["recorded"] += 1
+        if db_manager.pool is not None:
+            try:
+                await self._postgres.put(key, thread_id, result, time.time() - self.ttl)
+            except Exception as e:
+                log.warning(f"Submission dedup write failed: {e}")
+
+    def _remember(self, key: str, result: dict):
+        self._memory[key] = (time.time(), result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {**self._counters, "entries_in_memory": len(self._memory)}
+
+
+# Shared by the Submitter and the outbox workers
+submission_dedup = SubmissionDedup(**config_section("submission_dedup"))
@@ -0,0 +1,413 @@
+# apps/agent_app/src/agenticAI_full_workflow/utils/submission_outbox.py
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Dict, List, Optional
+from psycopg.types.json import Jsonb
+from src.agenticAI_full_workflow.utils.common import config_section
+from src.agenticAI_full_workflow.utils.db_manager import db_manager
+from src.agenticAI_full_workflow.utils.mcp_pool import mcp_pool
+from src.agenticAI_full_workflow.utils.submission_dedup import submission_dedup
+from shared_core.logger.logging import log
+
+QUEUED, IN_FLIGHT, DELIVERED, FAILED = "queued", "in_flight", "delivered", "failed"
+
+BATCH_TOOL = "submit_verified_forms_batch"
+# Backend answers worth retrying; any other 4xx means the record itself was rejected
+RETRYABLE_STATUS = {408, 425, 429}
+
+_FIELDS = ("id", "thread_id", "payload", "status", "attempts", "last_error", "result", "idempotency_key")
+_COLUMNS = ", ".join(_FIELDS)
+
+
+class _MemoryBackend:
+    """
+    Process-local outbox for runs without Postgres. Not durable: queued rows die with the process.
+    """
+    def __init__(self):
+        self._rows: Dict[int, dict] = {}
+        self._by_key: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    async def enqueue(self, thread_id: str, payload: dict, key: Optional[str] = None) -> dict:
+        existing = self._rows.get(self._by_key.get(key)) if key else None
+        if existing is not None:
+            if existing["status"] == FAILED:
+                existing.update(status=QUEUED, attempts=0, last_error=None, next_attempt_at=0.0)
+            return {**self._public(existing), "duplicate": True}
+
+        row_id = next(self._ids)
+        self._rows[row_id] = {
+            "id": row_id, "thread_id": thread_id, "payload": payload, "status": QUEUED, "attempts": 0,
+            "last_error": None, "result": None, "idempotency_key": key, "next_attempt_at": 0.0, "locked_until": 0.0,
+        }
+        if key:
+            self._by_key[key] = row_id
+        return {**self._public(self._rows[row_id]), "duplicate": False}
+
+    async def claim(self, limit: int, lease_seconds: float) -> List[dict]:
+        now = time.time()
+        due = [
+            row for row in self._rows.values()
+            if (row["status"] == QUEUED and row["next_attempt_at"] <= now)
+            or (row["status"] == IN_FLIGHT and row["locked_until"] < now)
+        ]
+        due.sort(key=lambda row: (row["next_attempt_at"], row["id"]))
+        claimed = []
+        for row in due[:limit]:
+            row.update(status=IN_FLIGHT, attempts=row["attempts"] + 1, locked_until=now + lease_seconds)
+            claimed.append(self._public(row))
+        return claimed
+
+    async def renew(self, row_ids: List[int], lease_seconds: float):
+        locked_until = time.time() + lease_seconds
+        for row_id in row_ids:
+            row = self._rows.get(row_id)
+            if row is not None and row["status"] == IN_FLIGHT:
+                row["locked_until"] = locked_until
+
+    async def settle(self, row_id: int, status: str, error: Optional[str] = None,
+                     result: Optional[str] = None, delay: float = 0.0):
+        row = self._rows.get(row_id)
+        if row is not None:
+            row.update(status=status, last_error=error, result=result, next_attempt_at=time.time() + delay)
+
+    async def latest(self, thread_id: str) -> Optional[dict]:
+        rows = [row for row in self._rows.values() if row["thread_id"] == thread_id]
+        return self._public(max(rows, key=lambda row: row["id"])) if rows else None
+
+    async def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for row in self._rows.values():
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+        return counts
+
+    @staticmethod
+    def _public(row: dict) -> dict:
+        return {k: row[k] for k in _FIELDS}
+
+
+class _PostgresBackend:
+    """
+    `submission_outbox` table in the checkpointer's database. Workers claim due rows with
+    FOR UPDATE SKIP LOCKED, so several workers (and API processes) can drain it at once.
+    """
+    def __init__(self):
+        self._table_ready = False
+
+    async def _ensure_table(self, conn):
+        if not self._table_ready:
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS submission_outbox ("
+                "id BIGSERIAL PRIMARY KEY, thread_id TEXT NOT NULL, payload JSONB NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'queued', attempts INT NOT NULL DEFAULT 0, "
+                "next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(), locked_until TIMESTAMPTZ, "
+                "last_error TEXT, result TEXT, created_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+                "updated_at TIMESTAMPTZ NOT NULL DEFAULT now(), delivered_at TIMESTAMPTZ)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS submission_outbox_due ON submission_outbox (status, next_attempt_at)"
+            )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS submission_outbox_thread ON submission_outbox (thread_id, id)"
+            )
+            # Tables created before idempotency keys existed get the column added in place
+            await conn.execute("ALTER TABLE submission_outbox ADD COLUMN IF NOT EXISTS idempotency_key TEXT")
+            await conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS submission_outbox_key ON submission_outbox (idempotency_key)"
+            )
+            self._table_ready = True
+
+    @staticmethod
+    def _row(record) -> dict:
+        return dict(zip(_FIELDS, record))
+
+    async def enqueue(self, thread_id: str, payload: dict, key: Optional[str] = None) -> dict:
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            # A repeat of the same key returns the existing row; only a dead-lettered one is queued again
+            cursor = await conn.execute(
+                "INSERT INTO submission_outbox AS o (thread_id, payload, idempotency_key) VALUES (%s, %s, %s) "
+                "ON CONFLICT (idempotency_key) DO UPDATE SET "
+                "status = CASE WHEN o.status = 'failed' THEN 'queued' ELSE o.status END, "
+                "attempts = CASE WHEN o.status = 'failed' THEN 0 ELSE o.attempts END, "
+                "next_attempt_at = CASE WHEN o.status = 'failed' THEN now() ELSE o.next_attempt_at END, "
+                "updated_at = now() "
+                f"RETURNING {', '.join('o.' + f for f in _FIELDS)}, (o.xmax = 0) AS inserted",
+                (thread_id, Jsonb(payload), key),
+            )
+            record = await cursor.fetchone()
+            return {**self._row(record[:-1]), "duplicate": not record[-1]}
+
+    async def claim(self, limit: int, lease_seconds: float) -> List[dict]:
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            # One statement: the claim is atomic even on an autocommit connection
+            cursor = await conn.execute(
+                "UPDATE submission_outbox SET status = 'in_flight', attempts = attempts + 1, "
+                "locked_until = now() + make_interval(secs => %s), updated_at = now() "
+                "WHERE id IN ("
+                "  SELECT id FROM submission_outbox"
+                "  WHERE (status = 'queued' AND next_attempt_at <= now())"
+                "     OR (status = 'in_flight' AND locked_until < now())"
+                "  ORDER BY next_attempt_at, id LIMIT %s FOR UPDATE SKIP LOCKED"
+                f") RETURNING {_COLUMNS}",
+                (lease_seconds, limit),
+            )
+            return [self._row(record) for record in await cursor.fetchall()]
+
+    async def renew(self, row_ids: List[int], lease_seconds: float):
+        async with db_manager.pool.connection() as conn:
+            await conn.execute(
+                "UPDATE submission_outbox SET locked_until = now() + make_interval(secs => %s) "
+                "WHERE id = ANY(%s) AND status = 'in_flight'",
+                (lease_seconds, row_ids),
+            )
+
+    async def settle(self, row_id: int, status: str, error: Optional[str] = None,
+                     result: Optional[str] = None, delay: float = 0.0):
+        async with db_manager.pool.connection() as conn:
+            await conn.execute(
+                "UPDATE submission_outbox SET status = %s, last_error = %s, result = %s, "
+                "next_attempt_at = now() + make_interval(secs => %s), locked_until = NULL, updated_at = now(), "
+                "delivered_at = CASE WHEN %s THEN now() ELSE delivered_at END "
+                "WHERE id = %s",
+                (status, error, result, delay, status == DELIVERED, row_id),
+            )
+
+    async def latest(self, thread_id: str) -> Optional[dict]:
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            cursor = await conn.execute(
+                f"SELECT {_COLUMNS} FROM submission_outbox WHERE thread_id = %s ORDER BY id DESC LIMIT 1",
+                (thread_id,),
+            )
+            record = await cursor.fetchone()
+        return self._row(record) if record else None
+
+    async def counts(self) -> Dict[str, int]:
+        async with db_manager.pool.connection() as conn:
+            await self._ensure_table(conn)
+            cursor = await conn.execute("SELECT status, count(*) FROM submission_outbox GROUP BY status")
+            return {status: count for status, count in await cursor.fetchall()}
+
+
+class SubmissionOutbox:
+    """
+    Approved payloads are written here by the Submitter and delivered by background workers
+    through the MCP batch tool, so the approval turn never waits on the form backend.
+
+    Workers claim up to `batch_size` due rows per MCP call and renew their lease every
+    `lease_seconds / 3` until the rows are settled, however long the call takes. Transient
+    failures are retried with exponential backoff and jitter; rows the backend rejects (4xx)
+    or that run out of attempts are dead-lettered with status 'failed'. Final outcomes are written back to the thread's state.
+    """
+    def __init__(self, enabled: bool = True, workers: int = 2, batch_size: int = 20, poll_interval: float = 2.0,
+                 lease_seconds: float = 60.0, max_attempts: int = 8, base_delay: float = 2.0,
+                 max_delay: float = 300.0, call_timeout: float = 120.0):
+        self.enabled = enabled
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_timeout = call_timeout
+
+        self._backend = None
+        self._graph = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._counters = {"enqueued": 0, "duplicates": 0, "delivered": 0, "deduplicated": 0,
+                          "retried": 0, "dead_lettered": 0}
+
+    @property
+    def backend(self):
+        # Chosen on first use: Postgres once the checkpointer has opened its pool
+        if self._backend is None:
+            if db_manager.pool is not None:
+                self._backend = _PostgresBackend()
+            else:
+                log.warning("OUTBOX: Postgres unavailable, queued submissions are kept in memory only.")
+                self._backend = _MemoryBackend()
+        return self._backend
+
+    # --- producer side ---
+    async def enqueue(self, thread_id: str, payload: dict, key: Optional[str] = None) -> dict:
+        """
+        Rows are unique per idempotency key: re-approving the same data returns the original row
+        (flagged `duplicate`) instead of queueing a second delivery.
+        """
+        row = await self.backend.enqueue(thread_id, payload, key)
+        self._counters["duplicates" if row["duplicate"] else "enqueued"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return row
+
+    async def status(self, thread_id: str) -> Optional[dict]:
+        return await self.backend.latest(thread_id)
+
+    # --- workers ---
+    async def start(self, graph=None):
+        """
+        Starts the drain workers. With `graph`, final outcomes are written back to each thread.
+        """
+        self._graph = graph or self._graph
+        if not self.enabled or self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i), name=f"outbox-{i}") for i in range(self.workers)]
+        log.info(f"OUTBOX: {self.workers} drain worker(s) started (batch_size={self.batch_size}).")
+
+    async def aclose(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        # A batch cut short here stays 'in_flight' and is re-claimed once its lease expires
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                processed = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"OUTBOX: worker {index} failed to drain: {e}")
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain_once(self) -> int:
+        """
+        Claims one batch of due rows and delivers it. Returns the number of rows processed.
+        """
+        rows = await self.backend.claim(self.batch_size, self.lease_seconds)
+        if not rows:
+            return 0
+
+        renewal = asyncio.create_task(self._renew_lease([row["id"] for row in rows]))
+        try:
+            await self._process(rows)
+        finally:
+            renewal.cancel()
+        return len(rows)
+
+    async def _renew_lease(self, row_ids: List[int]):
+        # A live worker never loses its rows to another one, even when the call outlasts the lease
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.backend.renew(row_ids, self.lease_seconds)
+            except Exception as e:
+                log.warning(f"OUTBOX: could not renew the lease on {len(row_ids)} submission(s): {e}")
+
+    async def _process(self, rows: List[dict]):
+        started = time.perf_counter()
+        pending = []
+        for row in rows:
+            # Already delivered under this key (e.g. a lease expired mid-call): settle without resending
+            original = await submission_dedup.get(row["idempotency_key"]) if row["idempotency_key"] else None
+            if original is not None:
+                self._counters["deduplicated"] += 1
+                await self._settle(row, {**original, "deduplicated": True})
+            else:
+                pending.append(row)
+
+        if pending:
+            try:
+                outcomes = await self._deliver(pending)
+            except Exception as e:
+                # The call itself failed (server down, timeout): nothing is known to have reached the backend
+                log.warning(f"OUTBOX: batch of {len(pending)} failed before delivery: {e}")
+                outcomes = [{"status": "error", "status_code": None, "error": str(e)} for _ in pending]
+
+            for row, outcome in zip(pending, outcomes):
+                await self._settle(row, outcome)
+        log.info(f"OUTBOX: processed {len(rows)} submission(s) in {time.perf_counter() - started:.2f}s.")
+
+    async def _deliver(self, rows: List[dict]) -> List[dict]:
+        arguments = {
+            "records": [row["payload"] for row in rows],
+            "idempotency_keys": [row["idempotency_key"] or "" for row in rows],
+            "deadline_ms": mcp_pool.deadline_ms(self.call_timeout),
+        }
+        result = await mcp_pool.call_tool(BATCH_TOOL, arguments=arguments, timeout=self.call_timeout)
+        if result.isError:
+            text = result.content[0].text if result.content and hasattr(result.content[0], "text") else str(result.content)
+            raise RuntimeError(text)
+        report = result.structuredContent or json.loads(result.content[0].text)
+        outcomes = report.get("results") or []
+        if len(outcomes) != len(rows):
+            raise RuntimeError(f"batch tool returned {len(outcomes)} result(s) for {len(rows)} record(s)")
+        return outcomes
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        # Full jitter keeps retries of one outage from arriving in lockstep
+        return random.uniform(delay / 2, delay)
+
+    async def _settle(self, row: dict, outcome: dict):
+        if outcome.get("status") == "ok":
+            await self.backend.settle(row["id"], DELIVERED, result=f"HTTP {outcome.get('status_code')}")
+            self._counters["delivered"] += 1
+            if row["idempotency_key"] and not outcome.get("deduplicated"):
+                await submission_dedup.put(row["idempotency_key"], row["thread_id"], {
+                    "status": "ok", "status_code": outcome.get("status_code"), "submission_id": row["id"],
+                })
+            await self._notify(row, DELIVERED, "✅ Your form has been delivered.")
+            return
+
+        code = outcome.get("status_code")
+        error = f"HTTP {code}: {outcome.get('error')}" if code else str(outcome.get("error"))
+        retryable = code is None or code >= 500 or code in RETRYABLE_STATUS
+        if retryable and row["attempts"] < self.max_attempts:
+            # An open circuit says when the backend is worth trying again
+            delay = max(self.backoff(row["attempts"]), outcome.get("retry_after") or 0.0)
+            await self.backend.settle(row["id"], QUEUED, error=error, delay=delay)
+            self._counters["retried"] += 1
+            log.warning(f"OUTBOX: submission #{row['id']} attempt {row['attempts']} failed ({error}); retry in {delay:.1f}s.")
+            return
+
+        await self.backend.settle(row["id"], FAILED, error=error)
+        self._counters["dead_lettered"] += 1
+        log.error(f"OUTBOX: submission #{row['id']} dead-lettered after {row['attempts']} attempt(s): {error}")
+        await self._notify(row, FAILED, f"❌ Your form could not be delivered: {error}")
+
+    async def _notify(self, row: dict, status: str, message: str):
+        """
+        Records the final outcome on the thread, unless it has moved on to another submission or turn.
+        """
+        if self._graph is None:
+            return
+        config = {"configurable": {"thread_id": row["thread_id"]}}
+        try:
+            snapshot = await self._graph.aget_state(config)
+            if snapshot.next or snapshot.values.get("submission_id") != row["id"]:
+                return
+            await self._graph.aupdate_state(
+                config,
+                {"submission_status": status, "messages": [("assistant", message)]},
+                as_node="Submitter",
+            )
+        except Exception as e:
+            log.warning(f"OUTBOX: could not record submission #{row['id']} on thread {row['thread_id']}: {e}")
+
+    async def stats(self) -> dict:
+        try:
+            rows = await self.backend.counts()
+        except Exception as e:
+            log.warning(f"OUTBOX: status counts unavailable: {e}")
+            rows = {}
+        return {**self._counters, "rows": rows, "workers": len(self._tasks)}
+
+
+submission_outbox = SubmissionOutbox(**config_section("outbox"))
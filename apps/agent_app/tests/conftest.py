@@ -0,0 +1,97 @@
+import contextlib
+import os
+import re
+import sys
+import pytest
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# `src.agenticAI_full_workflow...` resolves from the app folder, `shared_core` from the repo root
+sys.path.insert(0, APP_ROOT)
+sys.path.insert(0, os.path.abspath(os.path.join(APP_ROOT, "..", "..")))
+
+# Offline: scripted fake models and the local spec, whatever the developer's .env says
+os.environ["LLM_PROVIDER_MODE"] = "fake"
+os.environ["FORM_GET_SCHEMA_URL"] = "file://" + os.path.join(APP_ROOT, "config", "offline_form_spec.json")
+os.environ.pop("FORM_OPERATION_ID", None)
+
+
+@pytest.fixture
+def form_schema() -> dict:
+    # Same shape as the offline spec (config/offline_form_spec.json) after parsing
+    return {
+        "form_id": "handle_form_submit_form_submit_post",
+        "fields": [
+            {"name": "full_name", "type": "string", "required": True, "label": "Full Name", "regex": None},
+            {"name": "age", "type": "integer", "required": True, "label": "Age", "regex": None},
+            {"name": "email", "type": "string", "required": True, "label": "Email", "regex": None, "format": "email"},
+            {"name": "id_card", "type": "string", "required": True, "label": "Id Card", "regex": r"^\d{5}-\d{7}-\d$"},
+        ],
+    }
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows or [])
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakePool:
+    """
+    Stand-in for db_manager.pool: records every statement (whitespace collapsed) and answers
+    each one with whatever `handler(sql, params)` returns as rows.
+    """
+    def __init__(self):
+        self.statements = []
+        self.handler = lambda sql, params: []
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        yield self
+
+    async def execute(self, sql, params=None):
+        sql = re.sub(r"\s+", " ", sql).strip()
+        self.statements.append((sql, params))
+        return FakeCursor(self.handler(sql, params))
+
+    def count(self, prefix: str) -> int:
+        return sum(1 for sql, _ in self.statements if sql.startswith(prefix))
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    from src.agenticAI_full_workflow.utils.db_manager import db_manager
+    pool = FakePool()
+    monkeypatch.setattr(db_manager, "pool", pool)
+    return pool
+
+
+@pytest.fixture
+def no_pool(monkeypatch):
+    from src.agenticAI_full_workflow.utils.db_manager import db_manager
+    monkeypatch.setattr(db_manager, "pool", None)
+
+
+@pytest.fixture
+def agent_llm(monkeypatch):
+    """
+    Scripted model installed as the Agent's LLM; `calls` keeps (messages, kwargs) of every call.
+    Queue answers with `agent_llm.script.append(...)`.
+    """
+    from src.agenticAI_full_workflow.project_nodes import agent_node
+    from src.agenticAI_full_workflow.utils.llm_cassette import ScriptedChatModel
+
+    class RecordingChatModel(ScriptedChatModel):
+        calls: list = []
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            self.calls.append((messages, kwargs))
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+    model = RecordingChatModel(calls=[])
+    monkeypatch.setattr(agent_node, "llm", model)
+    return model
@@ -0,0 +1,48 @@
+import asyncio
+from collections import deque
+from src.agenticAI_full_workflow.utils.bulk_extractor import BulkExtractor, MAX_CHUNK_CHARS, split_records
+from src.agenticAI_full_workflow.utils.llm_cassette import ScriptedChatModel
+
+
+def test_table_rows_become_labelled_chunks():
+    text = "Name,Age,Email\nAli,25,ali@test.com\nSara,31,\n"
+    assert split_records(text) == ["Name: Ali, Age: 25, Email: ali@test.com", "Name: Sara, Age: 31"]
+
+
+def test_blank_line_blocks_and_list_items():
+    assert split_records("name Ali\nage 25\n\nname Sara\nage 31") == ["name Ali\nage 25", "name Sara\nage 31"]
+    assert split_records("1. name Ali\n2. name Sara\n3. name Omar") == ["name Ali", "name Sara", "name Omar"]
+
+
+def test_oversized_chunk_is_split_on_lines():
+    line = "x" * 100 + "\n"
+    chunks = split_records(line * (MAX_CHUNK_CHARS // 50))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= MAX_CHUNK_CHARS for chunk in chunks)
+
+
+def test_only_unresolved_records_reach_the_llm(form_schema):
+    text = (
+        "My name is Ali, age 25, email ali@test.com, CNIC 12345-1234567-1\n\n"
+        "Sara here, thirty one, sara at test dot com"
+    )
+    llm = ScriptedChatModel(script=deque([{"full_name": "Sara", "age": 31}]))
+
+    records = asyncio.run(BulkExtractor(llm, concurrency=2).extract(text, form_schema))
+
+    assert [r["index"] for r in records] == [0, 1]
+    assert records[0]["data"]["full_name"] == "Ali"
+    assert records[0]["missing_fields"] == []
+    assert records[1]["data"] == {"full_name": "Sara", "age": 31}
+    assert "email (Missing)" in records[1]["missing_fields"]
+    assert not llm.script
+
+
+def test_failed_record_reports_its_error(form_schema):
+    class BrokenModel(ScriptedChatModel):
+        async def _agenerate(self, *args, **kwargs):
+            raise RuntimeError("boom")
+
+    records = asyncio.run(BulkExtractor(BrokenModel()).extract("just some text", form_schema))
+    assert records[0]["error"] == "boom"
+    assert records[0]["missing_fields"]
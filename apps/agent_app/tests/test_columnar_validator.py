@@ -0,0 +1,75 @@
+from src.agenticAI_full_workflow.schemas.columnar_validator import ERROR_CODES, validate_batch
+from src.agenticAI_full_workflow.schemas.compiled_schema import compile_schema
+from src.agenticAI_full_workflow.schemas.validator_compiler import issue_text
+
+SCHEMA = {"fields": [
+    {"name": "full_name", "type": "string", "required": True},
+    {"name": "age", "type": "integer", "required": True, "minimum": 18, "enum": [18, 25, 30]},
+    {"name": "newsletter", "type": "boolean", "enum": [True]},
+    {"name": "has_vehicle", "type": "boolean"},
+    {"name": "vehicle_number", "type": "string", "required_with": ["has_vehicle"]},
+]}
+
+ROWS = [
+    {"full_name": "Ali", "age": "25", "newsletter": "true", "has_vehicle": "false"},
+    {"full_name": "Sara", "age": 17, "newsletter": False, "has_vehicle": True},
+    {"full_name": "", "age": "x", "newsletter": "TRUE", "has_vehicle": "true", "vehicle_number": "LEA-123"},
+]
+
+
+def first_codes(report):
+    return [
+        {name: ERROR_CODES[code - 1] for name, code in zip(report.fields, row) if code}
+        for row in (report.codes.tolist() if hasattr(report.codes, "tolist") else [list(r) for r in report.codes])
+    ]
+
+
+def test_matches_the_row_validator():
+    report = validate_batch(ROWS, SCHEMA)
+    compiled = compile_schema(SCHEMA)
+
+    assert first_codes(report) == [
+        {},
+        {"age": "range", "newsletter": "enum", "vehicle_number": "missing"},
+        {"full_name": "missing", "age": "type"},
+    ]
+    # Same verdict per row as the generated validator
+    for index, row in enumerate(ROWS):
+        errors = compiled.validator(row)
+        assert report.row_issues(index) == [issue_text(e) for e in errors]
+        assert (index in report.invalid_rows()) == bool(errors)
+
+
+def test_numpy_columns_are_checked_without_conversion():
+    import numpy as np
+
+    columns = {
+        "full_name": np.array(["Ali", "Sara", "Omar", ""], dtype=object),
+        # Integer column with a gap, as pandas stores it
+        "age": np.array([25.0, np.nan, 18.5, 30.0]),
+        "newsletter": np.array([True, True, False, True]),
+    }
+    report = validate_batch(columns, SCHEMA)
+
+    assert report.invalid_rows() == [1, 2, 3]
+    assert report.error_counts() == {
+        "full_name": {"missing": 1}, "age": {"missing": 1, "type": 1}, "newsletter": {"enum": 1},
+    }
+    # Bit j of a row's mask is fields[j]
+    assert report.row_mask(2) == 0b110
+    assert report.row_issues(1) == ["age (Missing)"]
+    assert report.summary()["valid"] == 1
+
+
+def test_read_table(tmp_path):
+    from src.agenticAI_full_workflow.schemas.columnar_validator import read_table
+
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("full_name,age\nAli,25\nSara,\n", encoding="utf-8")
+    assert read_table(str(csv_path)) == {"full_name": ["Ali", "Sara"], "age": ["25", ""]}
+
+    jsonl_path = tmp_path / "rows.jsonl"
+    jsonl_path.write_text('{"full_name": "Ali", "age": 25}\n\n{"age": 31}\n', encoding="utf-8")
+    table = read_table(str(jsonl_path))
+    assert table == {"full_name": ["Ali", None], "age": [25, 31]}
+    assert validate_batch(table, SCHEMA).invalid_rows() == [1]
@@ -0,0 +1,67 @@
+import asyncio
+from collections import deque
+from langchain_core.messages import HumanMessage
+from src.agenticAI_full_workflow.project_nodes import agent_node as agent_module
+from src.agenticAI_full_workflow.project_nodes import interviewer_nodes
+from src.agenticAI_full_workflow.project_nodes.inspector_node import inspector_node
+from src.agenticAI_full_workflow.utils.llm_cassette import ScriptedChatModel
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
+
+QUESTION = "Thanks Ali! What is your age, email and CNIC?"
+
+
+def run_agent(form_schema, text):
+    async def run():
+        ref, _ = await schema_store.put(form_schema)
+        state = {"messages": [HumanMessage(content=text)], "schema_ref": ref, "extracted_data": {}}
+        state.update(await agent_module.agent_node(state, {"configurable": {"llm_cache_bypass": True}}))
+        return state
+
+    return asyncio.run(run())
+
+
+def test_combined_call_extracts_and_drafts_the_question(no_pool, agent_llm, form_schema, monkeypatch):
+    monkeypatch.setattr(agent_module, "FOLLOWUP_MODE", "combined")
+    agent_llm.script.append({
+        "data": {"full_name": "Ali"},
+        "followup_fields": ["age", "email", "id_card"],
+        "followup_question": QUESTION,
+    })
+
+    state = run_agent(form_schema, "hi, Ali here")
+
+    assert state["extracted_data"] == {"full_name": "Ali"}
+    assert state["draft_followup"] == {"fields": ["age", "email", "id_card"], "question": QUESTION}
+    messages, kwargs = agent_llm.calls[0]
+    assert set(kwargs["tools"][0]["function"]["parameters"]["properties"]) == {"data", "followup_fields", "followup_question"}
+    assert "followup_question" in messages[0].content
+
+    # The Inspector agrees with the draft, so the Interviewer needs no LLM call
+    state.update(asyncio.run(inspector_node(state)))
+    assert state["draft_followup"]["question"] == QUESTION
+    monkeypatch.setattr(interviewer_nodes, "llm", None)
+    update = asyncio.run(interviewer_nodes.interviewer_node(state))
+    assert update["messages"][0].content == QUESTION
+    assert update["draft_followup"] == {}
+
+
+def test_inspector_drops_a_draft_that_disagrees(no_pool, form_schema):
+    async def run():
+        ref, _ = await schema_store.put(form_schema)
+        state = {
+            "schema_ref": ref,
+            "extracted_data": {"full_name": "Ali", "age": 25},
+            "draft_followup": {"fields": ["email"], "question": "What is your email?"},
+        }
+        return await inspector_node(state)
+
+    update = asyncio.run(run())
+    assert update["draft_followup"] == {}
+    assert update["missing_fields"] == ["email (Missing)", "id_card (Missing)"]
+
+
+def test_separate_mode_asks_the_interviewer(no_pool, monkeypatch):
+    monkeypatch.setattr(interviewer_nodes, "llm", ScriptedChatModel(script=deque(["What is your email?"])))
+    state = {"messages": [HumanMessage(content="Ali, 25")], "missing_fields": ["email (Missing)"], "draft_followup": {}}
+    update = asyncio.run(interviewer_nodes.interviewer_node(state))
+    assert update["messages"][0].content == "What is your email?"
@@ -0,0 +1,60 @@
+import copy
+from src.agenticAI_full_workflow.schemas.compiled_schema import CompiledSchema, CompiledSchemaCache, schema_hash
+
+
+class StructuredLLM:
+    def __init__(self):
+        self.built = []
+
+    def with_structured_output(self, model):
+        self.built.append(model)
+        return ("runnable", model)
+
+
+def test_identical_content_compiles_once(form_schema):
+    cache = CompiledSchemaCache()
+    first = cache.get(form_schema)
+    assert cache.get(copy.deepcopy(form_schema)) is first
+    assert first.schema_id == schema_hash(form_schema)
+
+
+def test_cache_is_bounded_lru(form_schema):
+    cache = CompiledSchemaCache(max_size=2)
+    variants = [{**form_schema, "form_id": f"form_{i}"} for i in range(3)]
+    first = cache.get(variants[0])
+    cache.get(variants[1])
+    cache.get(variants[0])
+    cache.get(variants[2])
+    assert cache.get(variants[0]) is first
+    assert schema_hash(variants[1]) not in cache._items
+
+
+def test_indexes_and_patterns(form_schema):
+    compiled = CompiledSchema(form_schema)
+    assert compiled.field_names == ["full_name", "age", "email", "id_card"]
+    assert compiled.required == compiled.field_names
+    assert compiled.patterns["id_card"].match("42201-1234567-1")
+    assert compiled.mentioned_fields("my CNIC is wrong and so is my umar") == ["id_card", "age"]
+
+
+def test_invalid_regex_never_blocks_the_form(form_schema):
+    form_schema["fields"][0]["regex"] = "(["
+    compiled = CompiledSchema(form_schema)
+    assert compiled.patterns["full_name"].match("anything")
+
+
+def test_submodel_is_cached_per_subset(form_schema):
+    compiled = CompiledSchema(form_schema)
+    narrowed = compiled.submodel(["email", "age"])
+    assert set(narrowed.model_fields) == {"email", "age"}
+    assert compiled.submodel(["age", "email"]) is narrowed
+    assert compiled.submodel(compiled.field_names) is compiled.model
+
+
+def test_structured_output_is_built_once_per_llm_and_subset(form_schema):
+    compiled = CompiledSchema(form_schema)
+    llm, other = StructuredLLM(), StructuredLLM()
+    assert compiled.structured_llm(llm) is compiled.structured_llm(llm)
+    compiled.structured_llm(llm, ["age"])
+    compiled.structured_llm(other)
+    assert len(llm.built) == 2 and len(other.built) == 1
@@ -0,0 +1,66 @@
+import asyncio
+from collections import deque
+from langchain_core.messages import AIMessage, HumanMessage
+from src.agenticAI_full_workflow.utils.context_manager import ContextManager, count_tokens
+from src.agenticAI_full_workflow.utils.llm_cassette import ScriptedChatModel
+
+
+def conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"turn {i}: " + "my details are here " * 10, id=f"h{i}"))
+        messages.append(AIMessage(content=f"reply {i}: " + "thanks, noted " * 10, id=f"a{i}"))
+    return messages
+
+
+def test_short_conversation_is_passed_through():
+    manager = ContextManager(default_budget=1500)
+    messages = conversation(2)
+    window, updates = asyncio.run(manager.window({"messages": messages}, "agent", ScriptedChatModel()))
+    assert window == messages
+    assert updates == {}
+
+
+def test_overflow_is_folded_into_the_summary():
+    manager = ContextManager(default_budget=200, keep_ratio=0.5)
+    messages = conversation(10)
+    llm = ScriptedChatModel(script=deque(["User is Ali, 25."]))
+
+    window, updates = asyncio.run(manager.window({"messages": messages}, "agent", llm))
+
+    assert updates["conversation_summary"] == "User is Ali, 25."
+    assert window[0].content.endswith("User is Ali, 25.")
+    # The window keeps the newest messages, starts on a human turn and fits the budget
+    kept = window[1:]
+    assert kept == messages[-len(kept):]
+    assert isinstance(kept[0], HumanMessage)
+    assert count_tokens(window) <= 200
+    assert updates["summarized_upto_id"] == messages[-len(kept) - 1].id
+
+
+def test_summarized_prefix_is_not_resent():
+    manager = ContextManager(default_budget=1500)
+    messages = conversation(4)
+    state = {"messages": messages, "conversation_summary": "Earlier facts.", "summarized_upto_id": "a1"}
+
+    window, updates = asyncio.run(manager.window(state, "agent", ScriptedChatModel()))
+
+    assert updates == {}
+    assert window[1:] == messages[4:]
+
+
+def test_failed_summary_keeps_the_old_one():
+    class BrokenModel(ScriptedChatModel):
+        async def _agenerate(self, *args, **kwargs):
+            raise RuntimeError("rate limited")
+
+    manager = ContextManager(default_budget=200)
+    window, updates = asyncio.run(manager.window({"messages": conversation(10)}, "agent", BrokenModel()))
+    assert updates == {}
+    assert count_tokens(window) <= 200
+
+
+def test_budgets_are_per_node():
+    manager = ContextManager(budgets={"agent": 1200}, default_budget=1500)
+    assert manager.budget_for("agent") == 1200
+    assert manager.budget_for("interviewer") == 1500
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from src.agenticAI_full_workflow.project_nodes import agent_node as agent_module
+from src.agenticAI_full_workflow.schemas.compiled_schema import CompiledSchema
+
+
+@pytest.fixture
+def compiled(form_schema):
+    return CompiledSchema(form_schema)
+
+
+def state_for(text, extracted=None, missing=None, validated=None):
+    """State after an earlier turn the Inspector validated against schema `validated`."""
+    return {
+        "messages": [HumanMessage(content=text)],
+        "extracted_data": extracted or {},
+        "missing_fields": missing or [],
+        "field_results_ref": validated,
+    }
+
+
+def test_targets_are_outstanding_and_mentioned_fields_in_schema_order(compiled):
+    state = state_for("oh and my email changed", {"full_name": "Ali", "email": "a@b.com"},
+                      ["id_card (Invalid format)", "age (Missing)"], compiled.schema_id)
+    assert agent_module.select_target_fields(state, compiled, set()) == ["age", "email", "id_card"]
+
+
+def test_prefilled_fields_are_not_targets(compiled):
+    state = state_for("age 30", {"full_name": "Ali"}, ["age (Missing)", "email (Missing)"], compiled.schema_id)
+    assert agent_module.select_target_fields(state, compiled, {"age"}) == ["email"]
+
+
+def test_first_turn_and_full_mode_extract_the_whole_form(compiled, monkeypatch):
+    assert agent_module.select_target_fields(state_for("hi"), compiled, set()) is None
+    # Fast-path guesses on the first turn must not narrow the call to themselves
+    first_turn = state_for("My name is Ali and I'm twenty five", {"full_name": "Ali"})
+    assert agent_module.select_target_fields(first_turn, compiled, set(), {"full_name"}) is None
+    monkeypatch.setattr(agent_module, "EXTRACTION_MODE", "full")
+    state = state_for("age 30", {"full_name": "Ali"}, ["age (Missing)"], compiled.schema_id)
+    assert agent_module.select_target_fields(state, compiled, set()) is None
+
+
+def test_new_schema_version_extracts_the_whole_form(compiled):
+    state = state_for("age 30", {"full_name": "Ali"}, ["age (Missing)"], "an-older-schema")
+    assert agent_module.select_target_fields(state, compiled, set()) is None
+
+
+def test_agent_narrows_prompt_and_output_schema(no_pool, agent_llm, form_schema):
+    from src.agenticAI_full_workflow.utils.schema_store import schema_store
+
+    async def run():
+        ref, _ = await schema_store.put(form_schema)
+        state = state_for("I'm thirty", {"full_name": "Ali", "email": "a@b.com", "id_card": "12345-1234567-1"},
+                          ["age (Missing)"], ref)
+        state["schema_ref"] = ref
+        return await agent_module.agent_node(state, {"configurable": {"llm_cache_bypass": True}})
+
+    agent_llm.script.append({"age": 30})
+    update = asyncio.run(run())
+
+    assert update["extracted_data"]["age"] == 30
+    assert update["changed_fields"] == ["age"]
+    messages, kwargs = agent_llm.calls[0]
+    assert "TARGET FIELDS: age" in messages[0].content
+    assert set(kwargs["tools"][0]["function"]["parameters"]["properties"]) == {"age"}
@@ -0,0 +1,79 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from langchain_core.messages import AIMessage, AIMessageChunk
+from src.agenticAI_full_workflow.utils.event_stream import graph_event_stream
+
+
+class FakeGraph:
+    """
+    Streams canned chunks; `aget_state` keeps answering with the checkpoint from before the run,
+    like a read that lands before the step's checkpoint is written.
+    """
+    def __init__(self, chunks, values=None, next_nodes=()):
+        self.chunks = chunks
+        self.snapshot = SimpleNamespace(values=values or {}, next=next_nodes)
+
+    async def aget_state(self, config):
+        return self.snapshot
+
+    async def astream(self, inputs, config, stream_mode=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def collect(graph):
+    async def run():
+        config = {"configurable": {"thread_id": "t1"}}
+        return [event async for event in graph_event_stream(graph, {"messages": []}, config)]
+
+    events = []
+    for raw in asyncio.run(run()):
+        head, data = raw.strip().split("\n")
+        events.append((head.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_review_uses_the_streamed_updates_not_a_stale_checkpoint():
+    graph = FakeGraph([
+        ("updates", {"FastPath": {"extracted_data": {"full_name": "Ali"}}}),
+        ("updates", {"Agent": {"extracted_data": {"full_name": "Ali", "age": 25}}}),
+        ("updates", {"Inspector": {"missing_fields": []}}),
+        ("updates", {"__interrupt__": ()}),
+    ], values={"extracted_data": {"full_name": "Old"}}, next_nodes=("Review_Gate",))
+
+    events = collect(graph)
+
+    assert [name for name, _ in events] == ["start", "node", "node", "node", "review", "done"]
+    assert events[4][1] == {"extracted_data": {"full_name": "Ali", "age": 25}}
+    assert events[-1][1]["awaiting_review"] is True
+
+
+def test_resumed_turn_reviews_the_checkpointed_data():
+    graph = FakeGraph([("updates", {"Inspector": {"missing_fields": []}})], values={"extracted_data": {"age": 25}})
+    assert ("review", {"extracted_data": {"age": 25}}) in collect(graph)
+
+
+def test_interviewer_tokens_and_missing_fields():
+    metadata = {"langgraph_node": "Interviewer", "tags": []}
+    graph = FakeGraph([
+        ("updates", {"Inspector": {"missing_fields": ["age (Missing)"]}}),
+        ("messages", (AIMessageChunk(content="How old "), metadata)),
+        ("messages", (AIMessageChunk(content="are you?"), metadata)),
+        ("updates", {"Interviewer": {"messages": [AIMessage(content="How old are you?")]}}),
+    ])
+
+    events = collect(graph)
+
+    assert ("node", {"node": "Inspector", "updated": ["missing_fields"], "missing_fields": ["age (Missing)"]}) in events
+    assert [data["content"] for name, data in events if name == "token"] == ["How old ", "are you?"]
+    assert not any(name == "review" for name, _ in events)
+
+
+def test_failure_ends_with_an_error_event():
+    class BrokenGraph(FakeGraph):
+        async def astream(self, inputs, config, stream_mode=None):
+            raise RuntimeError("checkpointer down")
+            yield
+
+    assert collect(BrokenGraph([]))[-1] == ("error", {"error": "checkpointer down"})
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from src.agenticAI_full_workflow.schemas.compiled_schema import CompiledSchema
+from src.agenticAI_full_workflow.utils.fast_extractor import FastExtractor
+
+FULL = "My name is Ali, age 25, email ali@test.com, CNIC 12345-1234567-1"
+
+@pytest.fixture
+def extractor(form_schema):
+    return FastExtractor(CompiledSchema(form_schema))
+
+
+def test_fully_explained_message_is_confident(extractor):
+    values, confident = extractor.extract(FULL)
+    assert values == {"full_name": "Ali", "age": 25, "email": "ali@test.com", "id_card": "12345-1234567-1"}
+    assert confident
+
+
+def test_roman_urdu_and_age_phrases(extractor):
+    assert extractor.extract("mera naam Ali hai aur umar 25 saal") == ({"full_name": "Ali", "age": 25}, True)
+    assert extractor.extract("I am 25 years old") == ({"age": 25}, True)
+
+
+@pytest.mark.parametrize("text", [
+    "My name is not Ali, age 25, email ali@test.com, CNIC 12345-1234567-1",
+    "My name isn't Ali, age 25, email ali@test.com, CNIC 12345-1234567-1",
+    "My name is actually Ali, age 25, email ali@test.com, CNIC 12345-1234567-1",
+    "My name is maybe Ali, age 25, email ali@test.com, CNIC 12345-1234567-1",
+])
+def test_negated_or_hedged_value_is_rejected(extractor, text):
+    values, confident = extractor.extract(text)
+    assert "full_name" not in values
+    assert values["age"] == 25
+    assert not confident
+
+
+def test_negated_standalone_value_is_rejected(extractor):
+    assert extractor.extract("my email is not bob@x.com") == ({}, False)
+
+
+def test_later_correction_is_not_confident(extractor):
+    values, confident = extractor.extract(FULL + " but age is actually 26")
+    assert not confident
+    values, confident = extractor.extract("My name is Ali, age 25, age 26, email ali@test.com")
+    assert values["age"] == 26
+    assert not confident
+
+
+def run_turn(agent_llm, form_schema, text, answer):
+    """FastPath then Agent for one user message, with the LLM scripted to return `answer`."""
+    from src.agenticAI_full_workflow.project_nodes.agent_node import agent_node
+    from src.agenticAI_full_workflow.project_nodes.fastpath_node import fastpath_node
+    from src.agenticAI_full_workflow.utils.schema_store import schema_store
+
+    async def run():
+        ref, _ = await schema_store.put(form_schema)
+        state = {"messages": [HumanMessage(content=text)], "schema_ref": ref, "extracted_data": {}}
+        state.update(await fastpath_node(state))
+        state.update(await agent_node(state, {"configurable": {"llm_cache_bypass": True}}))
+        return state
+
+    agent_llm.script.append(answer)
+    return asyncio.run(run())
+
+
+def system_prompt(agent_llm) -> str:
+    return agent_llm.calls[0][0][0].content
+
+
+def test_agent_can_overwrite_an_unconfident_fast_path_value(no_pool, agent_llm, form_schema):
+    state = run_turn(agent_llm, form_schema, FULL + " but age is actually 26", {"age": 26})
+    assert not state["fastpath_complete"]
+    assert state["extracted_data"]["age"] == 26
+    assert "RULE-BASED GUESSES" in system_prompt(agent_llm) and "age=25" in system_prompt(agent_llm)
+    assert "ALREADY EXTRACTED" not in system_prompt(agent_llm)
+
+
+def test_negated_name_goes_to_the_agent(no_pool, agent_llm, form_schema):
+    text = "My name is not Ali, it's Bilal. Age 25, email ali@test.com, CNIC 12345-1234567-1"
+    state = run_turn(agent_llm, form_schema, text, {"full_name": "Bilal"})
+    assert not state["fastpath_complete"]
+    assert state["extracted_data"]["full_name"] == "Bilal"
+
+
+def test_confident_fast_path_values_are_excluded_from_the_llm(no_pool, agent_llm, form_schema):
+    state = run_turn(agent_llm, form_schema, "age 25, email ali@test.com, CNIC 12345-1234567-1", {"full_name": "Ali"})
+    assert state["fastpath_confident"] and not state["fastpath_complete"]
+    assert "ALREADY EXTRACTED (do not repeat): age, email, id_card" in system_prompt(agent_llm)
+    assert state["extracted_data"] == {"age": 25, "email": "ali@test.com", "id_card": "12345-1234567-1", "full_name": "Ali"}
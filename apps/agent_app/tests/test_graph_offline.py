@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from src.agenticAI_full_workflow.agent.agent_workflow import AgentWorkflowBuilder
+
+FULL = "My name is Ali, age 25, CNIC 42201-1234567-1, email ali@test.com"
+
+
+@pytest.fixture
+def graph(no_pool):
+    return asyncio.run(AgentWorkflowBuilder().build(checkpointer=MemorySaver(), start_mcp=False))
+
+
+def test_full_message_reaches_review_and_a_correction_loops_back(graph):
+    config = {"configurable": {"thread_id": "offline_review"}}
+
+    async def run():
+        await graph.ainvoke({"messages": [("user", FULL)]}, config)
+        first = await graph.aget_state(config)
+        await graph.aupdate_state(config, {"messages": [("user", "The age is 26")], "is_approved": False})
+        await graph.ainvoke(None, config)
+        return first, await graph.aget_state(config)
+
+    first, corrected = asyncio.run(run())
+
+    assert first.next == ("Review_Gate",)
+    assert first.values["extracted_data"] == {"full_name": "Ali", "age": 25, "email": "ali@test.com", "id_card": "42201-1234567-1"}
+    assert corrected.next == ("Review_Gate",)
+    assert corrected.values["extracted_data"]["age"] == 26
+
+
+def test_incomplete_message_gets_a_question(graph):
+    config = {"configurable": {"thread_id": "offline_interview"}}
+    state = asyncio.run(graph.ainvoke({"messages": [("user", "My name is Ali")]}, config))
+    assert "age (Missing)" in state["missing_fields"]
+    assert state["messages"][-1].type == "ai"
+
+
+def test_bench_runs_at_replay_priority():
+    import bench_workflow
+
+    class RecordingGraph:
+        configs = []
+
+        async def ainvoke(self, inputs, config):
+            self.configs.append(config)
+
+        async def aget_state(self, config):
+            return type("Snapshot", (), {"next": ("Review_Gate",)})()
+
+    graph = RecordingGraph()
+    _, reached = asyncio.run(bench_workflow.run_once(graph, ["hi", "there"], submit=False))
+    assert reached
+    assert {c["configurable"]["llm_priority"] for c in graph.configs} == {"replay"}
@@ -0,0 +1,67 @@
+import asyncio
+import copy
+import pytest
+from src.agenticAI_full_workflow.project_nodes import inspector_node as inspector_module
+from src.agenticAI_full_workflow.project_nodes.inspector_node import inspector_node, issue_field_name
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
+
+COMPLETE = {"full_name": "Ali", "age": 25, "email": "ali@test.com", "id_card": "12345-1234567-1"}
+
+
+@pytest.fixture
+def schema_ref(no_pool, form_schema):
+    schema = copy.deepcopy(form_schema)
+    schema["fields"].append({"name": "vehicle_number", "type": "string", "required_with": ["email"]})
+    ref, _ = asyncio.run(schema_store.put(schema))
+    return ref
+
+
+@pytest.fixture
+def checked(monkeypatch):
+    """Names of the fields each Inspector pass actually validated."""
+    calls = []
+    original = inspector_module.field_issues
+
+    def spy(compiled, data, names=None):
+        calls.append(list(compiled.field_names if names is None else names))
+        return original(compiled, data, names)
+
+    monkeypatch.setattr(inspector_module, "field_issues", spy)
+    return calls
+
+
+def test_issue_field_name():
+    assert issue_field_name("age (Missing)") == "age"
+    assert issue_field_name("quotebasicinfo/pickup_zip (Missing)") == "quotebasicinfo"
+
+
+def test_first_pass_validates_everything(schema_ref, checked):
+    update = asyncio.run(inspector_node({"schema_ref": schema_ref, "extracted_data": {"full_name": "Ali"}}))
+    assert checked == [["full_name", "age", "email", "id_card", "vehicle_number"]]
+    assert update["missing_fields"] == ["age (Missing)", "email (Missing)", "id_card (Missing)"]
+    assert update["field_results_ref"] == schema_ref
+    assert update["changed_fields"] == []
+
+
+def test_later_pass_rechecks_changed_fields_and_their_dependents(schema_ref, checked):
+    state = {"schema_ref": schema_ref, "extracted_data": {"full_name": "Ali"}}
+    state.update(asyncio.run(inspector_node(state)))
+
+    state["extracted_data"] = {**COMPLETE, "id_card": "bad"}
+    state["changed_fields"] = ["age", "email", "id_card"]
+    update = asyncio.run(inspector_node(state))
+
+    assert checked[-1] == ["age", "email", "id_card", "vehicle_number"]
+    # The earlier result for full_name is kept; the new ones replace the old issues
+    assert update["missing_fields"] == ["id_card (Invalid Format)", "vehicle_number (Missing)"]
+    assert set(update["field_results"]) == {"id_card", "vehicle_number"}
+
+
+def test_new_schema_version_forces_a_full_pass(schema_ref, checked):
+    state = {
+        "schema_ref": schema_ref, "extracted_data": COMPLETE, "changed_fields": [],
+        "field_results": {}, "field_results_ref": "an-older-schema",
+    }
+    update = asyncio.run(inspector_node(state))
+    assert len(checked[-1]) == 5
+    assert update["missing_fields"] == ["vehicle_number (Missing)"]
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from langchain_core.messages import AIMessage, HumanMessage
+from src.agenticAI_full_workflow.utils.llm_cache import ExtractionCache
+
+
+def key(text: str = "My name is Ali") -> str:
+    return ExtractionCache.make_key("gpt-4o-mini", "schema", "prompt", [("user", text)])
+
+
+def test_key_ignores_message_ids_whitespace_and_role_spelling():
+    messages = [HumanMessage(content="My  name is\nAli", id="1"), AIMessage(content="Age?", id="2")]
+    same = [("user", "My name is Ali"), ("assistant", " Age? ")]
+    assert ExtractionCache.make_key("m", "s", "p", messages) == ExtractionCache.make_key("m", "s", "p", same)
+    assert ExtractionCache.make_key("m", "other", "p", same) != ExtractionCache.make_key("m", "s", "p", same)
+
+
+def test_memory_tier_is_a_bounded_lru_with_ttl():
+    async def run():
+        cache = ExtractionCache(max_entries=2, ttl_seconds=60)
+        for text in ("a", "b"):
+            await cache.put(key(text), {"v": text})
+        await cache.get(key("a"))
+        await cache.put(key("c"), {"v": "c"})
+        cache._memory[key("c")] = (time.time() - 120, {"v": "c"})
+        return [await cache.get(key(text)) for text in ("a", "b", "c")], cache.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == [{"v": "a"}, None, None]
+    assert stats["memory_hits"] == 2 and stats["misses"] == 2
+
+
+def test_bypass_env_disables_the_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_BYPASS", "1")
+    cache = ExtractionCache()
+    assert not cache.is_active()
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_sqlite_tier_survives_a_restart_and_keeps_the_stored_age(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    async def run():
+        first = ExtractionCache(backend="sqlite", sqlite_path=path, ttl_seconds=60)
+        await first.put(key(), {"full_name": "Ali"})
+        stored_at = first._memory[key()][0]
+        time.sleep(0.05)
+
+        second = ExtractionCache(backend="sqlite", sqlite_path=path, ttl_seconds=60)
+        return stored_at, await second.get(key()), second
+
+    stored_at, value, second = asyncio.run(run())
+    assert value == {"full_name": "Ali"}
+    assert second.stats()["persistent_hits"] == 1
+    assert abs(second._memory[key()][0] - stored_at) < 0.01
+
+
+def test_sqlite_hits_do_not_write_but_still_drive_the_lru(tmp_path):
+    async def run():
+        cache = ExtractionCache(backend="sqlite", sqlite_path=str(tmp_path / "c.sqlite3"), max_entries=2)
+        backend = cache._backend
+        await cache.put(key("a"), {"v": "a"})
+        await cache.put(key("b"), {"v": "b"})
+        cache._memory.clear()
+        changes = backend._conn.total_changes
+        await cache.get(key("a"))
+        hit_changes = backend._conn.total_changes - changes
+        await cache.put(key("c"), {"v": "c"})
+        rows = {row[0] for row in backend._conn.execute("SELECT cache_key FROM llm_extraction_cache")}
+        return hit_changes, rows
+
+    hit_changes, rows = asyncio.run(run())
+    assert hit_changes == 0
+    assert rows == {key("a"), key("c")}
+
+
+def test_postgres_tier_prunes_on_a_sample_of_puts(fake_pool):
+    async def run():
+        cache = ExtractionCache(backend="postgres", max_entries=10)
+        for i in range(201):
+            await cache.put(key(str(i)), {"v": i})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert fake_pool.count("INSERT INTO llm_extraction_cache") == 201
+    assert fake_pool.count("DELETE FROM llm_extraction_cache WHERE created_at") == 3
+    assert fake_pool.count("CREATE INDEX IF NOT EXISTS llm_extraction_cache_created_at_idx") == 1
+
+
+def test_postgres_hits_are_batched_into_the_sweep(fake_pool):
+    stored_at = time.time() - 30
+    fake_pool.handler = lambda sql, params: [({"v": 1}, stored_at)] if sql.startswith("SELECT response") else []
+
+    async def run():
+        cache = ExtractionCache(backend="postgres", ttl_seconds=60)
+        value = await cache.get(key())
+        created_at = cache._memory[key()][0]
+        writes_after_hit = fake_pool.count("UPDATE")
+        await cache.put(key("other"), {"v": 2})
+        await asyncio.sleep(0.01)
+        return value, created_at, writes_after_hit
+
+    value, created_at, writes_after_hit = asyncio.run(run())
+    assert value == {"v": 1}
+    assert created_at == stored_at
+    assert writes_after_hit == 0
+    flushed = [params for sql, params in fake_pool.statements if sql.startswith("UPDATE llm_extraction_cache")]
+    assert flushed and flushed[0][0] == [key()]
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from src.agenticAI_full_workflow.utils.llm_scheduler import LLMScheduler, TokenBucket, priority_from_config
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_waiters_are_served_by_priority_then_fifo():
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def call(name, wait=False):
+            order.append(name)
+            if wait:
+                await gate.wait()
+
+        first = asyncio.create_task(scheduler.run(lambda: call("first", wait=True)))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(scheduler.run(lambda n=name: call(n), priority=priority))
+            for name, priority in [("bulk", "bulk"), ("replay", "replay"), ("chat-1", "interactive"), ("chat-2", "interactive")]
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 4
+        gate.set()
+        await asyncio.gather(first, *waiting)
+
+    asyncio.run(run())
+    assert order == ["first", "chat-1", "chat-2", "replay", "bulk"]
+    assert scheduler.stats()["wait"]["replay"]["requests"] == 1
+
+
+def test_rate_limit_halves_concurrency_and_successes_regrow_it():
+    scheduler = LLMScheduler(max_concurrency=8)
+
+    async def fail():
+        raise RateLimitError()
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        with pytest.raises(RateLimitError):
+            await scheduler.run(fail)
+        assert scheduler.limit == 4
+        # A second 429 inside the cooldown is the same overload event
+        scheduler.on_rate_limited()
+        assert scheduler.limit == 4
+        for _ in range(4):
+            assert await scheduler.run(ok) == "ok"
+
+    asyncio.run(run())
+    assert scheduler.limit == 5
+    assert scheduler.stats()["rate_limited"] == 2
+    assert scheduler.active == 0
+
+
+def test_retry_after_header_pauses_dispatch():
+    scheduler = LLMScheduler()
+    scheduler.observe_response(429, {"retry-after-ms": "1500"})
+    assert scheduler._paused_until > 0
+    assert scheduler.requests.wait_time(1) > 0
+    scheduler.observe_response(200, {})
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.wait_time(60) == 0.0
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+    # Requests larger than a minute's budget still run once the bucket is full
+    assert bucket.wait_time(10_000) == pytest.approx(60.0, abs=0.1)
+
+
+def test_priority_from_config():
+    assert priority_from_config(None) == "interactive"
+    assert priority_from_config({"configurable": {"llm_priority": "replay"}}) == "replay"
+    assert priority_from_config({"configurable": {"llm_priority": "urgent"}}) == "interactive"
+
+
+def test_disabled_scheduler_calls_straight_through():
+    scheduler = LLMScheduler(enabled=False, max_concurrency=1)
+
+    async def ok():
+        return scheduler.active
+
+    assert asyncio.run(scheduler.run(ok)) == 0
@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import pytest
+from src.agenticAI_full_workflow.utils import mcp_pool as pool_module
+from src.agenticAI_full_workflow.utils.mcp_pool import MCPSessionPool, server_connection
+
+
+class FakeSession:
+    opened = 0
+
+    def __init__(self):
+        FakeSession.opened += 1
+        self.id = FakeSession.opened
+        self.fail_next = False
+        self.ping_ok = True
+
+    async def initialize(self):
+        pass
+
+    async def send_ping(self):
+        if not self.ping_ok:
+            raise ConnectionError("gone")
+
+    async def call_tool(self, name, arguments=None, read_timeout_seconds=None, progress_callback=None):
+        if self.fail_next:
+            raise ConnectionError("broken pipe")
+        await asyncio.sleep(0.01)
+        return {"session": self.id, "name": name, "timeout": read_timeout_seconds.total_seconds()}
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    FakeSession.opened = 0
+    opened = []
+
+    @contextlib.asynccontextmanager
+    async def create_session(connection):
+        session = FakeSession()
+        opened.append(session)
+        yield session
+
+    monkeypatch.setattr(pool_module, "create_session", create_session)
+    return opened
+
+
+def run(coro_factory, **settings):
+    async def main():
+        pool = MCPSessionPool("test", connection={"transport": "stdio"}, **settings)
+        try:
+            return await coro_factory(pool)
+        finally:
+            await pool.aclose()
+    return asyncio.run(main())
+
+
+def test_sessions_are_opened_once_and_reused(sessions):
+    async def scenario(pool):
+        await pool.start()
+        results = await asyncio.gather(*(pool.call_tool("submit", {}) for _ in range(6)))
+        return results, pool.stats()
+
+    results, stats = run(scenario, size=2, call_timeout=7.0)
+    assert len(sessions) == 2
+    assert {r["session"] for r in results} == {1, 2}
+    assert results[0]["timeout"] == 7.0
+    assert stats["calls"] == 6 and stats["alive"] == 2 and stats["idle"] == 2
+
+
+def test_failed_call_recycles_the_session(sessions):
+    async def scenario(pool):
+        await pool.start()
+        sessions[0].fail_next = True
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("submit", {})
+        # The broken session is replaced in the background; the pool keeps serving
+        result = await pool.call_tool("submit", {})
+        return result, pool.stats()
+
+    result, stats = run(scenario, size=1)
+    assert len(sessions) == 2
+    assert result["session"] == 2
+    assert stats["failures"] == 1 and stats["respawns"] == 1
+
+
+def test_health_check_respawns_unresponsive_sessions(sessions):
+    async def scenario(pool):
+        await pool.start()
+        sessions[1].ping_ok = False
+        await pool.check_health()
+        return pool.stats()
+
+    stats = run(scenario, size=2)
+    assert len(sessions) == 3
+    assert stats["respawns"] == 1 and stats["alive"] == 2
+
+
+def test_unavailable_server_raises_connection_error(monkeypatch):
+    @contextlib.asynccontextmanager
+    async def refuse(connection):
+        raise FileNotFoundError("python.exe")
+        yield
+
+    monkeypatch.setattr(pool_module, "create_session", refuse)
+
+    async def scenario(pool):
+        await pool.start()
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("submit", {})
+
+    run(scenario, size=1)
+
+
+def test_deadline_leaves_margin_for_the_answer():
+    pool = MCPSessionPool("test", call_timeout=60.0)
+    assert pool.deadline_ms() == 59000
+    assert pool.deadline_ms(0.5) == 0
+
+
+def test_server_connection():
+    assert server_connection({"url": "http://mcp:8000/mcp"})["transport"] == "streamable_http"
+    stdio = server_connection({"script_path": "server.py", "python_path": "python"})
+    assert stdio["transport"] == "stdio" and stdio["args"][0].endswith("server.py")
+    with pytest.raises(ValueError):
+        server_connection({})
@@ -0,0 +1,50 @@
+import pytest
+from src.agenticAI_full_workflow.utils.llm_cassette import CassetteChatModel, ScriptedChatModel
+from src.agenticAI_full_workflow.utils.model_loader import LLMRegistry
+
+
+def registry(monkeypatch, mode, nodes=None):
+    monkeypatch.setenv("LLM_PROVIDER_MODE", mode)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    return LLMRegistry({"llm": {
+        "openai": {"model_name": "gpt-4o-mini", "timeout": 30.0, "max_retries": 2},
+        "nodes": nodes or {},
+        "pool": {"http2": False, "max_connections": 7},
+    }})
+
+
+def test_node_overrides_layer_on_the_defaults(monkeypatch):
+    llms = registry(monkeypatch, "live", {"interviewer": {"model_name": "gpt-4.1-nano"}})
+    assert llms.settings_for("interviewer") == {"model_name": "gpt-4.1-nano", "timeout": 30.0, "max_retries": 2}
+    assert llms.settings_for("agent")["model_name"] == "gpt-4o-mini"
+
+
+def test_clients_are_cached_and_share_one_http_pool(monkeypatch):
+    llms = registry(monkeypatch, "live", {"interviewer": {"model_name": "gpt-4.1-nano"}})
+    agent, interviewer = llms.get("agent"), llms.get("interviewer")
+
+    assert llms.get("agent") is agent
+    assert interviewer.model_name == "gpt-4.1-nano"
+    assert agent.http_async_client is interviewer.http_async_client is llms.http_async_client
+    assert agent.max_retries == 2
+
+
+def test_offline_modes_need_no_network(monkeypatch):
+    fake = registry(monkeypatch, "fake")
+    assert isinstance(fake.get("agent"), ScriptedChatModel)
+    # Every fake client pops from one script, in the graph's call order
+    assert fake.get("agent").script is fake.get("interviewer").script
+    assert isinstance(registry(monkeypatch, "replay").get("agent"), CassetteChatModel)
+
+
+def test_unknown_mode_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        registry(monkeypatch, "offline")
+
+
+def test_shipped_interviewer_override_is_not_a_no_op():
+    from src.agenticAI_full_workflow.utils.common import load_config
+    llm_config = load_config()["llm"]
+    interviewer = llm_config["nodes"].get("interviewer") or {}
+    if "model_name" in interviewer:
+        assert interviewer["model_name"] != llm_config["openai"]["model_name"]
@@ -0,0 +1,121 @@
+import asyncio
+import io
+import json
+import httpx
+from src.agenticAI_full_workflow.utils import schema_cache as schema_cache_module
+from src.agenticAI_full_workflow.utils.form_loader import parse_openapi_spec
+from src.agenticAI_full_workflow.utils.openapi_parser import (
+    SPEC_SECTIONS, FormRegistry, _stream_sections, parse_openapi_registry,
+)
+from src.agenticAI_full_workflow.utils.schema_cache import SchemaCache
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Forms", "version": "1"},
+    "paths": {
+        "/form/submit": {"post": {
+            "operationId": "submit",
+            "requestBody": {"content": {"application/x-www-form-urlencoded": {
+                "schema": {"$ref": "#/components/schemas/Body_handle_form_submit_post"}}}},
+            "responses": {"200": {"description": "ok", "content": {"application/json": {"example": {"big": "x" * 1000}}}}},
+        }},
+        "/travel": {"post": {
+            "operationId": "travel",
+            "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Travel"}}}},
+        }},
+        "/health": {"get": {"operationId": "health"}},
+    },
+    "components": {"schemas": {
+        "Person": {"type": "object", "required": ["full_name"], "properties": {
+            "full_name": {"type": "string", "title": "Full Name", "minLength": 2},
+            "age": {"anyOf": [{"type": "integer", "minimum": 18}, {"type": "null"}]},
+        }},
+        "Body_handle_form_submit_post": {"allOf": [
+            {"$ref": "#/components/schemas/Person"},
+            {"type": "object", "required": ["email"], "properties": {
+                "email": {"type": "string", "format": "email"},
+                "zip": {"type": "string", "pattern": "^\\d{5}$"},
+                "city": {"type": "string"},
+            }, "dependentRequired": {"city": ["zip"]}},
+        ]},
+        "Travel": {"type": "object", "properties": {
+            "traveller": {"$ref": "#/components/schemas/Person"},
+            "companions": {"type": "array", "items": {"$ref": "#/components/schemas/Person"}},
+            "next": {"$ref": "#/components/schemas/Travel"},
+        }},
+    }},
+}
+
+
+def fields_by_name(form: dict) -> dict:
+    return {f["name"]: f for f in form["fields"]}
+
+
+def test_registry_covers_every_form_operation():
+    registry = parse_openapi_registry(json.dumps(SPEC).encode())
+    assert set(registry.forms) == {"submit", "travel"}
+    assert registry.forms["submit"]["content_type"] == "application/x-www-form-urlencoded"
+    assert registry.default_operation_id() == "submit"
+    assert registry.select()["form_id"] == "submit"
+    assert registry.select("missing") is None
+
+
+def test_refs_allof_and_nullable_are_flattened():
+    fields = fields_by_name(parse_openapi_registry(SPEC).select("submit"))
+    assert list(fields) == ["full_name", "age", "email", "zip", "city"]
+    assert fields["full_name"]["required"] and fields["email"]["required"]
+    assert fields["full_name"]["label"] == "Full Name" and fields["full_name"]["minLength"] == 2
+    assert fields["age"]["type"] == "integer" and fields["age"]["minimum"] == 18
+    assert not fields["age"]["required"]
+    assert fields["zip"]["regex"] == "^\\d{5}$"
+    assert fields["zip"]["required_with"] == ["city"]
+
+
+def test_nested_and_recursive_models():
+    fields = fields_by_name(parse_openapi_registry(SPEC).select("travel"))
+    assert [f["name"] for f in fields["traveller"]["fields"]] == ["full_name", "age"]
+    assert fields["companions"]["items"]["type"] == "object"
+    assert fields["next"]["type"] == "object"
+
+
+def test_swagger2_form_data_parameters():
+    spec = {"swagger": "2.0", "paths": {"/legacy": {"post": {
+        "operationId": "legacy",
+        "consumes": ["multipart/form-data"],
+        "parameters": [{"$ref": "#/parameters/Name"}, {"in": "formData", "name": "age", "type": "integer"}],
+    }}}, "parameters": {"Name": {"in": "formData", "name": "name", "type": "string", "required": True}}}
+    form = parse_openapi_registry(spec).forms["legacy"]
+    assert form["content_type"] == "multipart/form-data"
+    assert [(f["name"], f["required"]) for f in form["fields"]] == [("name", True), ("age", False)]
+
+
+def test_streaming_builds_only_the_needed_sections():
+    sections = _stream_sections(io.BytesIO(json.dumps(SPEC).encode()), SPEC_SECTIONS)
+    assert set(sections) == set(SPEC_SECTIONS)
+    assert set(sections["paths"]) == set(SPEC["paths"])
+    assert "info" not in sections
+    assert sections["components.schemas"]["Person"] == SPEC["components"]["schemas"]["Person"]
+
+
+def test_registry_round_trips_through_the_cache_format():
+    registry = parse_openapi_registry(SPEC)
+    assert FormRegistry.from_dict(json.loads(json.dumps(registry.to_dict()))).forms == registry.forms
+
+
+def test_schema_cache_streams_the_body_to_the_parser(monkeypatch):
+    monkeypatch.setattr(schema_cache_module, "SPOOL_MAX_BYTES", 64)
+    body = json.dumps(SPEC).encode()
+    received = []
+
+    def parser(stream):
+        received.append(stream)
+        return parse_openapi_spec(stream)
+
+    async def run():
+        cache = SchemaCache(parser)
+        cache._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body)))
+        return await cache.get("https://forms.example/openapi.json")
+
+    cached = asyncio.run(run())
+    assert set(FormRegistry.from_dict(cached).forms) == {"submit", "travel"}
+    assert not isinstance(received[0], (bytes, bytearray))
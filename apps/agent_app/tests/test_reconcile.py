@@ -0,0 +1,47 @@
+import asyncio
+import copy
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from src.agenticAI_full_workflow.project_nodes.reconcile_node import reconcile_node, speculative_messages
+from src.agenticAI_full_workflow.utils.schema_store import schema_store
+
+TEXT = "My name is Ali, age 25, email ali@test.com, CNIC 12345-1234567-1"
+
+
+def test_speculative_messages_are_those_after_the_last_user_turn():
+    messages = [HumanMessage("hi", id="1"), AIMessage("q", id="2"), HumanMessage("Ali", id="3"), AIMessage("Updated", id="4")]
+    assert speculative_messages(messages) == messages[3:]
+    assert speculative_messages([AIMessage("welcome", id="0")]) == []
+
+
+def test_confirmed_schema_keeps_the_speculative_result(no_pool):
+    state = {"schema_ref": "abc", "speculation": {"schema_ref": "abc", "base_data": {}}, "extracted_data": {"age": 25}}
+    assert asyncio.run(reconcile_node(state)) == {"speculation": {}}
+
+
+def test_changed_schema_discards_and_reextracts(no_pool, agent_llm, form_schema):
+    new_schema = copy.deepcopy(form_schema)
+    new_schema["fields"].append({"name": "city", "type": "string", "required": True, "label": "City"})
+    stale = AIMessage("Updated: {'full_name': 'Ali'}", id="stale")
+
+    async def run():
+        old_ref, _ = await schema_store.put(form_schema)
+        new_ref, _ = await schema_store.put(new_schema)
+        state = {
+            "messages": [HumanMessage(TEXT + ", I live in Lahore", id="human"), stale],
+            "schema_ref": new_ref,
+            "speculation": {"schema_ref": old_ref, "base_data": {"full_name": "Old"}},
+            "extracted_data": {"full_name": "Speculative"},
+        }
+        return new_ref, await reconcile_node(state, {"configurable": {"llm_cache_bypass": True}})
+
+    agent_llm.script.append({"city": "Lahore"})
+    new_ref, update = asyncio.run(run())
+
+    assert update["extracted_data"] == {
+        "full_name": "Ali", "age": 25, "email": "ali@test.com", "id_card": "12345-1234567-1", "city": "Lahore",
+    }
+    assert update["speculation"] == {}
+    assert isinstance(update["messages"][0], RemoveMessage) and update["messages"][0].id == "stale"
+    # The rerun's prompt was built on the confirmed schema
+    tool = agent_llm.calls[0][1]["tools"][0]["function"]
+    assert "city" in tool["parameters"]["properties"]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+from src.agenticAI_full_workflow.utils.schema_cache import SchemaCache
+
+URL = "https://forms.example/openapi.json"
+
+
+def make_cache(handler, **settings) -> SchemaCache:
+    cache = SchemaCache(json.load, **settings)
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return cache
+
+
+def test_fresh_entry_is_served_without_a_request():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"v": len(calls)})
+
+    async def run():
+        cache = make_cache(handler)
+        return await cache.get(URL), await cache.get(URL)
+
+    assert asyncio.run(run()) == ({"v": 1}, {"v": 1})
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_share_one_fetch():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"v": 1})
+
+    async def run():
+        cache = make_cache(handler)
+        return await asyncio.gather(*(cache.get(URL) for _ in range(10)))
+
+    assert asyncio.run(run()) == [{"v": 1}] * 10
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_a_304_revalidates_it():
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if len(seen_headers) == 1:
+            return httpx.Response(200, json={"v": 1}, headers={"ETag": '"a"'})
+        return httpx.Response(304)
+
+    async def run():
+        cache = make_cache(handler, ttl_seconds=60)
+        await cache.get(URL)
+        cache._entries[URL].fetched_at -= 120
+        stale = await cache.get(URL)
+        await asyncio.sleep(0.01)
+        return stale, cache._entries[URL].age()
+
+    stale, age = asyncio.run(run())
+    assert stale == {"v": 1}
+    assert seen_headers == [None, '"a"']
+    assert age < 5
+
+
+def test_failed_revalidation_keeps_the_cached_copy():
+    responses = iter([httpx.Response(200, json={"v": 1}), httpx.Response(500)])
+
+    async def run():
+        cache = make_cache(lambda request: next(responses), ttl_seconds=0, stale_seconds=0)
+        await cache.get(URL)
+        return await cache.get(URL)
+
+    assert asyncio.run(run()) == {"v": 1}
+
+
+def test_unreachable_schema_without_a_copy_is_none():
+    async def run():
+        return await make_cache(lambda request: httpx.Response(503)).get(URL)
+
+    assert asyncio.run(run()) is None
+
+
+def test_snapshot_warm_starts_a_new_process(tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+
+    async def run():
+        first = make_cache(lambda request: httpx.Response(200, json={"v": 1}), snapshot_path=str(snapshot))
+        await first.get(URL)
+
+        def offline(request):
+            raise httpx.ConnectError("offline")
+
+        second = make_cache(offline, snapshot_path=str(snapshot))
+        return await second.get(URL)
+
+    assert asyncio.run(run()) == {"v": 1}
+
+
+def test_parse_runs_off_the_event_loop():
+    loop_threads = []
+
+    def parser(body) -> dict:
+        loop_threads.append(threading.get_ident())
+        time.sleep(0.05)
+        return json.load(body)
+
+    async def run():
+        cache = SchemaCache(parser)
+        cache._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, json={"v": 1})))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await cache.get(URL)
+        task.cancel()
+        return threading.get_ident(), ticks
+
+    loop_thread, ticks = asyncio.run(run())
+    assert loop_threads and loop_threads[0] != loop_thread
+    assert ticks > 3
@@ -0,0 +1,60 @@
+import asyncio
+from src.agenticAI_full_workflow.schemas.compiled_schema import schema_hash
+from src.agenticAI_full_workflow.utils.schema_store import SchemaStore
+
+
+def test_without_postgres_the_schema_lives_in_memory(no_pool, form_schema):
+    async def run():
+        store = SchemaStore()
+        ref, durable = await store.put(form_schema)
+        return ref, durable, await store.get(ref)
+
+    ref, durable, stored = asyncio.run(run())
+    assert ref == schema_hash(form_schema)
+    assert durable is False
+    assert stored == form_schema
+
+
+def test_schema_is_persisted_once(fake_pool, form_schema):
+    async def run():
+        store = SchemaStore()
+        first = await store.put(form_schema)
+        second = await store.put(form_schema)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second and first[1] is True
+    assert fake_pool.count("INSERT INTO form_schemas") == 1
+
+
+def test_evicted_schema_is_read_back_from_postgres(fake_pool, form_schema):
+    ref = schema_hash(form_schema)
+    fake_pool.handler = lambda sql, params: [(form_schema,)] if sql.startswith("SELECT") and params == (ref,) else []
+
+    async def run():
+        store = SchemaStore(max_size=1)
+        await store.put(form_schema)
+        await store.put({"fields": []})
+        return await store.get(ref), await store.get("unknown")
+
+    assert asyncio.run(run()) == (form_schema, None)
+
+
+def test_resolve_prefers_the_reference_and_keeps_legacy_threads_working(no_pool, form_schema):
+    other = {"fields": [{"name": "city", "type": "string"}]}
+
+    async def run():
+        store = SchemaStore()
+        ref, _ = await store.put(form_schema)
+        spec_ref, _ = await store.put(other)
+        by_ref = await store.resolve({"schema_ref": ref})
+        speculative = await store.resolve({"schema_ref": ref, "speculation": {"schema_ref": spec_ref}}, speculative=True)
+        legacy = await store.resolve({"form_schema": other})
+        missing = await store.resolve({"schema_ref": "gone", "form_schema": other})
+        return by_ref, speculative, legacy, missing
+
+    by_ref, speculative, legacy, missing = asyncio.run(run())
+    assert by_ref == (form_schema, schema_hash(form_schema))
+    assert speculative == (other, schema_hash(other))
+    assert legacy == (other, None)
+    assert missing == (other, None)
@@ -0,0 +1,64 @@
+import asyncio
+from src.agenticAI_full_workflow.utils.submission_dedup import (
+    PRUNE_EVERY_PUTS, SubmissionDedup, canonical_payload, idempotency_key,
+)
+
+
+def test_key_ignores_key_order_but_not_thread_or_values():
+    key = idempotency_key("t1", {"full_name": "Jane", "age": 30})
+
+    assert key == idempotency_key("t1", {"age": 30, "full_name": "Jane"})
+    assert key != idempotency_key("t2", {"full_name": "Jane", "age": 30})
+    assert key != idempotency_key("t1", {"full_name": "Jane", "age": 31})
+    assert canonical_payload({"b": 1, "a": "é"}) == '{"a":"é","b":1}'
+
+
+def test_memory_tier_keeps_the_first_result_and_honours_the_ttl(no_pool):
+    dedup = SubmissionDedup(max_entries=2, ttl_seconds=60)
+
+    async def scenario():
+        await dedup.put("k1", "t1", {"status": "ok", "status_code": 200})
+        await dedup.put("k1", "t1", {"status": "ok", "status_code": 201})
+        first = await dedup.get("k1")
+        await dedup.put("k2", "t2", {"status": "ok"})
+        await dedup.put("k3", "t3", {"status": "ok"})
+        evicted = await dedup.get("k1")
+        dedup.ttl = -1
+        expired = await dedup.get("k3")
+        return first, evicted, expired
+
+    first, evicted, expired = asyncio.run(scenario())
+
+    assert first["status_code"] == 200
+    assert evicted is None and expired is None
+    assert dedup.stats()["recorded"] == 3
+
+
+def test_postgres_tier_is_indexed_and_swept_once_per_batch_of_puts(fake_pool):
+    dedup = SubmissionDedup()
+
+    async def scenario():
+        for i in range(PRUNE_EVERY_PUTS + 1):
+            await dedup.put(f"k{i}", "t1", {"status": "ok"})
+            # Let a started sweep finish, as it would between real round-trips
+            await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert fake_pool.count("CREATE INDEX IF NOT EXISTS submission_dedup_created_at_idx") == 1
+    assert fake_pool.count("INSERT INTO submission_dedup") == PRUNE_EVERY_PUTS + 1
+    # First put and the one PRUNE_EVERY_PUTS later, not every insert
+    assert fake_pool.count("DELETE FROM submission_dedup") == 2
+
+
+def test_postgres_hit_is_promoted_to_memory(fake_pool):
+    dedup = SubmissionDedup()
+    fake_pool.handler = lambda sql, params: [({"status": "ok", "submission_id": 7},)] if sql.startswith("SELECT") else []
+
+    async def scenario():
+        return await dedup.get("k1"), await dedup.get("k1")
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == {"status": "ok", "submission_id": 7}
+    assert fake_pool.count("SELECT result FROM submission_dedup") == 1
@@ -0,0 +1,175 @@
+import asyncio
+from mcp.types import CallToolResult
+from src.agenticAI_full_workflow.utils import submission_outbox as outbox_module
+from src.agenticAI_full_workflow.utils.submission_dedup import SubmissionDedup
+from src.agenticAI_full_workflow.utils.submission_outbox import (
+    BATCH_TOOL, DELIVERED, FAILED, IN_FLIGHT, QUEUED, SubmissionOutbox,
+)
+
+
+class FakeMCP:
+    """
+    Batch tool stand-in: each call takes the next list of per-record outcomes from `outcomes`
+    (every record ok once it runs out), after `delay` seconds.
+    """
+    def __init__(self):
+        self.calls = []
+        self.outcomes = []
+        self.delay = 0.0
+
+    def deadline_ms(self, timeout=None):
+        return int((timeout - 1) * 1000)
+
+    async def call_tool(self, name, arguments, timeout=None):
+        self.calls.append((name, arguments, timeout))
+        await asyncio.sleep(self.delay)
+        records = arguments["records"]
+        outcomes = self.outcomes.pop(0) if self.outcomes else [{"status": "ok", "status_code": 200}] * len(records)
+        return CallToolResult(content=[], structuredContent={"results": outcomes}, isError=False)
+
+
+def make_outbox(monkeypatch, **settings) -> tuple:
+    mcp = FakeMCP()
+    monkeypatch.setattr(outbox_module, "mcp_pool", mcp)
+    monkeypatch.setattr(outbox_module, "submission_dedup", SubmissionDedup())
+    outbox = SubmissionOutbox(**{"base_delay": 2.0, "max_delay": 300.0, **settings})
+    return outbox, mcp
+
+
+def row_of(outbox, row_id: int) -> dict:
+    return outbox.backend._rows[row_id]
+
+
+def test_due_rows_are_delivered_in_one_batch_call(monkeypatch, no_pool):
+    outbox, mcp = make_outbox(monkeypatch, call_timeout=30.0)
+
+    async def scenario():
+        first = await outbox.enqueue("t1", {"full_name": "Jane"}, "key-1")
+        second = await outbox.enqueue("t2", {"full_name": "John"}, "key-2")
+        processed = await outbox.drain_once()
+        return first, second, processed, await outbox.status("t1"), await outbox_module.submission_dedup.get("key-1")
+
+    first, second, processed, status, remembered = asyncio.run(scenario())
+
+    assert processed == 2
+    name, arguments, timeout = mcp.calls[0]
+    assert (name, timeout) == (BATCH_TOOL, 30.0)
+    assert arguments["records"] == [{"full_name": "Jane"}, {"full_name": "John"}]
+    assert arguments["idempotency_keys"] == ["key-1", "key-2"]
+    assert arguments["deadline_ms"] == 29000
+    assert status["status"] == DELIVERED and status["attempts"] == 1
+    assert remembered["submission_id"] == first["id"]
+
+
+def test_repeated_key_returns_the_original_row(monkeypatch, no_pool):
+    outbox, _ = make_outbox(monkeypatch)
+
+    async def scenario():
+        first = await outbox.enqueue("t1", {"full_name": "Jane"}, "key-1")
+        again = await outbox.enqueue("t1", {"full_name": "Jane"}, "key-1")
+        return first, again
+
+    first, again = asyncio.run(scenario())
+
+    assert again["id"] == first["id"]
+    assert (first["duplicate"], again["duplicate"]) == (False, True)
+    assert outbox._counters["duplicates"] == 1
+
+
+def test_transient_failures_back_off_and_rejections_dead_letter(monkeypatch, no_pool):
+    outbox, mcp = make_outbox(monkeypatch)
+    mcp.outcomes = [[
+        {"status": "error", "status_code": 503, "error": "busy"},
+        {"status": "error", "status_code": 422, "error": "bad email"},
+        {"status": "error", "status_code": None, "error": "circuit open", "retry_after": 40.0},
+    ]]
+
+    async def scenario():
+        for i in range(3):
+            await outbox.enqueue(f"t{i}", {"n": i}, f"key-{i}")
+        await outbox.drain_once()
+
+    asyncio.run(scenario())
+
+    busy, rejected, open_circuit = row_of(outbox, 1), row_of(outbox, 2), row_of(outbox, 3)
+    assert busy["status"] == QUEUED and busy["last_error"] == "HTTP 503: busy"
+    assert rejected["status"] == FAILED and rejected["last_error"] == "HTTP 422: bad email"
+    assert open_circuit["status"] == QUEUED
+    # Retry-After from the open circuit outweighs the first backoff step (1-2s)
+    assert open_circuit["next_attempt_at"] - busy["next_attempt_at"] > 35
+    assert outbox._counters["retried"] == 2 and outbox._counters["dead_lettered"] == 1
+
+
+def test_rows_out_of_attempts_are_dead_lettered(monkeypatch, no_pool):
+    outbox, mcp = make_outbox(monkeypatch, max_attempts=2, base_delay=0.0, max_delay=0.0)
+    mcp.outcomes = [[{"status": "error", "status_code": 500, "error": "boom"}]] * 2
+
+    async def scenario():
+        await outbox.enqueue("t1", {"n": 1}, "key-1")
+        return [await outbox.drain_once() for _ in range(3)]
+
+    processed = asyncio.run(scenario())
+
+    assert processed == [1, 1, 0]
+    assert row_of(outbox, 1)["status"] == FAILED and row_of(outbox, 1)["attempts"] == 2
+
+
+def test_already_delivered_keys_are_settled_without_a_call(monkeypatch, no_pool):
+    outbox, mcp = make_outbox(monkeypatch)
+
+    async def scenario():
+        await outbox_module.submission_dedup.put("key-1", "t1", {"status": "ok", "status_code": 200})
+        await outbox.enqueue("t1", {"n": 1}, "key-1")
+        return await outbox.drain_once()
+
+    assert asyncio.run(scenario()) == 1
+    assert mcp.calls == []
+    assert row_of(outbox, 1)["status"] == DELIVERED
+    assert outbox._counters["deduplicated"] == 1
+
+
+def test_lease_is_renewed_while_a_slow_call_is_in_flight(monkeypatch, no_pool):
+    outbox, mcp = make_outbox(monkeypatch, lease_seconds=0.15)
+    mcp.delay = 0.5
+
+    async def scenario():
+        await outbox.enqueue("t1", {"n": 1}, "key-1")
+        slow = asyncio.create_task(outbox.drain_once())
+        await asyncio.sleep(0.35)
+        # A second worker past the original lease must not take the row over
+        stolen = await outbox.drain_once()
+        return await slow, stolen
+
+    processed, stolen = asyncio.run(scenario())
+
+    assert (processed, stolen) == (1, 0)
+    assert len(mcp.calls) == 1
+    assert row_of(outbox, 1)["status"] == DELIVERED and row_of(outbox, 1)["attempts"] == 1
+
+
+def test_rows_of_a_dead_worker_are_reclaimed_after_the_lease(monkeypatch, no_pool):
+    outbox, _ = make_outbox(monkeypatch, lease_seconds=0.05)
+
+    async def scenario():
+        await outbox.enqueue("t1", {"n": 1}, "key-1")
+        # Claimed but never settled or renewed: the worker died mid-batch
+        await outbox.backend.claim(10, outbox.lease_seconds)
+        early = await outbox.backend.claim(10, outbox.lease_seconds)
+        await asyncio.sleep(0.1)
+        return early, await outbox.drain_once()
+
+    early, processed = asyncio.run(scenario())
+
+    assert early == [] and processed == 1
+    assert row_of(outbox, 1)["status"] == DELIVERED and row_of(outbox, 1)["attempts"] == 2
+
+
+def test_postgres_renewal_only_extends_rows_still_in_flight(fake_pool):
+    backend = outbox_module._PostgresBackend()
+
+    asyncio.run(backend.renew([4, 5], 60.0))
+
+    sql, params = fake_pool.statements[-1]
+    assert sql.startswith("UPDATE submission_outbox SET locked_until")
+    assert "status = 'in_flight'" in sql
+    assert params == (60.0, [4, 5])
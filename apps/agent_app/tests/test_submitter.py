@@ -0,0 +1,110 @@
+import asyncio
+import json
+from mcp.types import CallToolResult, TextContent
+from src.agenticAI_full_workflow.project_nodes import submitter_node as submitter_module
+from src.agenticAI_full_workflow.project_nodes.submitter_node import submit_inline, submitter_node
+from src.agenticAI_full_workflow.utils.submission_dedup import SubmissionDedup, idempotency_key
+from src.agenticAI_full_workflow.utils.submission_outbox import SubmissionOutbox
+
+CONFIG = {"configurable": {"thread_id": "t1"}}
+PAYLOAD = {"full_name": "Jane Doe", "email": "jane@example.com"}
+
+
+class FakeMCP:
+    def __init__(self, result: CallToolResult):
+        self.result = result
+        self.calls = []
+
+    def deadline_ms(self, timeout=None):
+        return 59000
+
+    async def call_tool(self, name, arguments, timeout=None):
+        self.calls.append((name, arguments))
+        return self.result
+
+
+def tool_result(report: dict, structured: bool = True) -> CallToolResult:
+    return CallToolResult(
+        content=[TextContent(type="text", text=json.dumps(report))],
+        structuredContent=report if structured else None,
+        isError=False,
+    )
+
+
+def install(monkeypatch, result: CallToolResult, outbox_enabled: bool = False) -> FakeMCP:
+    mcp = FakeMCP(result)
+    monkeypatch.setattr(submitter_module, "mcp_pool", mcp)
+    monkeypatch.setattr(submitter_module, "submission_dedup", SubmissionDedup())
+    monkeypatch.setattr(submitter_module, "submission_outbox", SubmissionOutbox(enabled=outbox_enabled))
+    return mcp
+
+
+def test_inline_delivery_follows_the_structured_status(monkeypatch, no_pool):
+    mcp = install(monkeypatch, tool_result({"status": "ok", "status_code": 200, "message": "✅ Success: saved."}))
+    key = idempotency_key("t1", PAYLOAD)
+
+    async def scenario():
+        update = await submit_inline(PAYLOAD, "t1", key)
+        return update, await submitter_module.submission_dedup.get(key)
+
+    update, remembered = asyncio.run(scenario())
+
+    name, arguments = mcp.calls[0]
+    assert name == "submit_verified_form"
+    assert arguments == {"form_data": PAYLOAD, "idempotency_key": key, "deadline_ms": 59000}
+    assert update["submission_status"] == "delivered"
+    assert update["messages"] == [("assistant", "📢 ✅ Success: saved.")]
+    assert remembered == {"status": "ok", "status_code": 200, "message": "✅ Success: saved."}
+
+
+def test_inline_failure_is_not_remembered_whatever_the_message_says(monkeypatch, no_pool):
+    # Only `status` decides: a message that happens to start with ✅ is not a delivery
+    install(monkeypatch, tool_result({"status": "error", "status_code": 503, "message": "✅ looks fine"}, structured=False))
+    key = idempotency_key("t1", PAYLOAD)
+
+    async def scenario():
+        update = await submit_inline(PAYLOAD, "t1", key)
+        return update, await submitter_module.submission_dedup.get(key)
+
+    update, remembered = asyncio.run(scenario())
+
+    assert update["submission_status"] == "failed"
+    assert remembered is None
+
+
+def test_tool_errors_fail_the_submission(monkeypatch, no_pool):
+    error = CallToolResult(content=[TextContent(type="text", text="validation error")], isError=True)
+    install(monkeypatch, error)
+
+    update = asyncio.run(submit_inline(PAYLOAD, "t1", "key"))
+
+    assert update["submission_status"] == "failed"
+    assert update["messages"] == [("assistant", "📢 ❌ validation error")]
+
+
+def test_repeat_approval_is_answered_from_the_dedup_store(monkeypatch, no_pool):
+    mcp = install(monkeypatch, tool_result({"status": "ok", "status_code": 200, "message": "✅ Success: saved."}))
+    state = {"extracted_data": PAYLOAD}
+
+    async def scenario():
+        return await submitter_node(state, CONFIG), await submitter_node(state, CONFIG)
+
+    first, again = asyncio.run(scenario())
+
+    assert len(mcp.calls) == 1
+    assert first["submission_status"] == again["submission_status"] == "delivered"
+    assert again["messages"] == [("assistant", "✅ This form was already submitted: Success: saved.")]
+
+
+def test_outbox_queues_once_per_key(monkeypatch, no_pool):
+    mcp = install(monkeypatch, tool_result({"status": "ok"}), outbox_enabled=True)
+    state = {"extracted_data": PAYLOAD}
+
+    async def scenario():
+        return await submitter_node(state, CONFIG), await submitter_node(state, CONFIG)
+
+    first, again = asyncio.run(scenario())
+
+    assert mcp.calls == []
+    assert first["submission_status"] == again["submission_status"] == "queued"
+    assert first["submission_id"] == again["submission_id"]
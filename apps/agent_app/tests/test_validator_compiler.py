@@ -0,0 +1,92 @@
+import pytest
+from src.agenticAI_full_workflow.schemas.validator_compiler import CompiledValidator, issue_text
+
+FIELDS = [
+    {"name": "full_name", "type": "string", "required": True, "minLength": 2},
+    {"name": "age", "type": "integer", "required": True, "minimum": 18, "enum": [18, 25, 30]},
+    {"name": "score", "type": "number", "maximum": 10, "multipleOf": 0.5},
+    {"name": "email", "type": "string", "format": "email"},
+    {"name": "id_card", "type": "string", "regex": r"^\d{5}-\d{7}-\d$"},
+    {"name": "newsletter", "type": "boolean", "enum": [True]},
+    {"name": "has_vehicle", "type": "boolean"},
+    {"name": "vehicle_number", "type": "string", "required_with": ["has_vehicle"]},
+    {"name": "spouse_name", "type": "string"},
+    {"name": "spouse_age", "type": "integer", "required_with": ["spouse_name"]},
+    {"name": "address", "type": "object", "fields": [
+        {"name": "city", "type": "string", "required": True},
+        {"name": "zip", "type": "string", "regex": r"^\d{5}$"},
+    ]},
+    {"name": "tags", "type": "array", "minItems": 1, "uniqueItems": True, "items": {"type": "string", "enum": ["a", "b"]}},
+]
+
+VALID = {"full_name": "Ali", "age": 25, "address": {"city": "Lahore"}}
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return CompiledValidator(FIELDS)
+
+
+def codes(validator, data):
+    return [(path, code) for path, code, _ in validator(data)]
+
+
+def test_valid_record(validator):
+    assert validator(VALID) == []
+
+
+def test_missing_and_blank_required(validator):
+    assert codes(validator, {"full_name": "  ", "address": {}}) == [
+        ("/full_name", "missing"), ("/age", "missing"), ("/address/city", "missing"),
+    ]
+
+
+@pytest.mark.parametrize("age, expected", [
+    ("25", []), (25.0, []), (" 30 ", []), ("17", ["range", "enum"]), ("twenty", ["type"]), (19, ["enum"]),
+])
+def test_numeric_text_is_converted_before_range_and_enum(validator, age, expected):
+    assert codes(validator, {**VALID, "age": age}) == [("/age", code) for code in expected]
+
+
+@pytest.mark.parametrize("value, code", [(True, None), ("true", None), (" TRUE ", None), ("false", "enum"), (False, "enum"), ("yes", "type")])
+def test_boolean_text_is_converted_before_enum(validator, value, code):
+    errors = codes(validator, {**VALID, "newsletter": value})
+    assert errors == ([] if code is None else [("/newsletter", code)])
+
+
+@pytest.mark.parametrize("has_vehicle, required", [(True, True), ("true", True), (False, False), ("false", False), (None, False)])
+def test_boolean_trigger_requires_only_when_true(validator, has_vehicle, required):
+    errors = codes(validator, {**VALID, "has_vehicle": has_vehicle})
+    assert (("/vehicle_number", "missing") in errors) is required
+
+
+def test_text_trigger_uses_the_required_missing_test(validator):
+    assert ("/spouse_age", "missing") in codes(validator, {**VALID, "spouse_name": "Sara"})
+    assert codes(validator, {**VALID, "spouse_name": "   "}) == []
+    assert validator.affected_fields(["spouse_name"]) == ["spouse_name", "spouse_age"]
+
+
+def test_formats_patterns_and_numbers(validator):
+    data = {**VALID, "email": "nope", "id_card": "12345", "score": 10.25, "address": {"city": "X", "zip": "12"}}
+    assert codes(validator, data) == [
+        ("/score", "range"), ("/score", "range"), ("/email", "format"), ("/id_card", "pattern"), ("/address/zip", "pattern"),
+    ]
+
+
+def test_arrays(validator):
+    assert codes(validator, {**VALID, "tags": []}) == [("/tags", "items")]
+    assert codes(validator, {**VALID, "tags": ["a", "a"]}) == [("/tags", "unique")]
+    assert codes(validator, {**VALID, "tags": ["a", "c"]}) == [("/tags/1", "enum")]
+
+
+def test_field_errors_match_a_full_pass(validator):
+    data = {**VALID, "has_vehicle": True, "age": "17"}
+    full = validator(data)
+    per_field = [e for name in validator.field_names for e in validator.field_errors(name, data)]
+    assert per_field == full
+    assert not validator.is_valid_value("age", "17")
+
+
+def test_issue_text():
+    assert issue_text(("/age", "range", "must be >= 18")) == "age (Out of Range: must be >= 18)"
+    assert issue_text(("/address/city", "missing", "is required")) == "address/city (Missing)"
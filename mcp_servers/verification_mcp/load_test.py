@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "server.py")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test of the verification MCP server over streamable HTTP.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Server worker counts to compare")
+    parser.add_argument("--url", help="Test an already running server instead of starting one per worker count")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32, help="Client sessions calling in parallel")
+    parser.add_argument("--backend-latency-ms", type=float, default=20.0, help="Stub backend delay per POST")
+    parser.add_argument("--batch-size", type=int, default=0, help="Records per call via the batch tool (0: single tool)")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_backend(latency_ms: float) -> str:
+    """
+    Threaded stand-in for FORM_SUBMIT_URL / FORM_SUBMIT_BULK_URL: waits `latency_ms`, answers 200.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes: without this, delayed ACKs add ~40 ms per POST
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_ms / 1000)
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def start_server(workers: int, backend_url: str):
+    port = free_port()
+    env = {
+        **os.environ,
+        "FORM_SUBMIT_URL": f"{backend_url}/submit",
+        "MCP_LOG_LEVEL": "WARNING",
+        # Client concurrency must reach the stub, not queue behind the default connection cap
+        "FORM_SUBMIT_MAX_CONNECTIONS": os.getenv("FORM_SUBMIT_MAX_CONNECTIONS", "100"),
+        "FORM_SUBMIT_MAX_KEEPALIVE": os.getenv("FORM_SUBMIT_MAX_KEEPALIVE", "100"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--transport", "http", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers)],
+        env=env,
+    )
+    wait_healthy(f"http://127.0.0.1:{port}/health", process)
+    return process, f"http://127.0.0.1:{port}/mcp"
+
+
+def wait_healthy(url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"server not healthy after {timeout}s")
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def client(url: str, jobs: asyncio.Queue, latencies: list, errors: list, batch_size: int):
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            while True:
+                try:
+                    index = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    if batch_size:
+                        records = [{"full_name": f"Load Test {index}-{i}"} for i in range(batch_size)]
+                        result = await session.call_tool("submit_verified_forms_batch", {"records": records})
+                        failed = result.isError or (result.structuredContent or {}).get("failed")
+                    else:
+                        result = await session.call_tool("submit_verified_form", {"form_data": {"full_name": f"Load Test {index}"}})
+                        failed = result.isError or (result.structuredContent or {}).get("status") != "ok"
+                    if failed:
+                        errors.append(result.content[0].text if result.content else "error")
+                except Exception as e:
+                    errors.append(str(e))
+                latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_load(url: str, requests: int, concurrency: int, batch_size: int) -> dict:
+    jobs: asyncio.Queue = asyncio.Queue()
+    for index in range(requests):
+        jobs.put_nowait(index)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(url, jobs, latencies, errors, batch_size) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0][:200] if errors else None,
+        "elapsed_s": elapsed,
+        "calls_per_s": len(latencies) / elapsed,
+        "records_per_s": len(latencies) * (batch_size or 1) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+    }
+
+
+def report(label: str, stats: dict):
+    print(f" {label:<12} calls={stats['calls']:<6} errors={stats['errors']:<4} "
+          f"{stats['calls_per_s']:8.1f} calls/s {stats['records_per_s']:9.1f} records/s  "
+          f"p50={stats['p50_ms']:.1f} ms  p95={stats['p95_ms']:.1f} ms")
+    if stats["first_error"]:
+        print(f"   first error: {stats['first_error']}")
+
+
+async def main():
+    args = parse_args()
+    print("==================================================")
+    print(f" requests={args.requests}  concurrency={args.concurrency}  "
+          f"backend latency={args.backend_latency_ms} ms  batch_size={args.batch_size or '-'}")
+
+    if args.url:
+        report("external", await run_load(args.url, args.requests, args.concurrency, args.batch_size))
+    else:
+        backend_url = start_stub_backend(args.backend_latency_ms)
+        for workers in args.workers:
+            process, url = start_server(workers, backend_url)
+            try:
+                # Warm-up: imports, first connections in every worker
+                await run_load(url, args.concurrency, args.concurrency, args.batch_size)
+                report(f"workers={workers}", await run_load(url, args.requests, args.concurrency, args.batch_size))
+            finally:
+                stop_server(process)
+    print("==================================================")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,23 +1,121 @@
 # mcp_servers/verification_mcp/src/server.py
-from fastmcp import FastMCP
+import argparse
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+from fastmcp import Context, FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 try:
-    from .tools.db_handler import post_to_mysql_api
+    from .tools.db_handler import post_to_mysql_api, submit_batch, backend, breakers, retry_settings, deadline_after
 except ImportError:
-    from tools.db_handler import post_to_mysql_api
-from typing import Dict, Any
+    from tools.db_handler import post_to_mysql_api, submit_batch, backend, breakers, retry_settings, deadline_after
+from typing import Dict, Any, List, Optional
+
+# On stdio transport stdout carries the MCP protocol: logs go to stderr only
+logging.basicConfig(
+    stream=sys.stderr,
+    level=os.getenv("MCP_LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+@asynccontextmanager
+async def lifespan(server):
+    # One pooled backend client per server process, closed on shutdown
+    await backend.start()
+    try:
+        yield {}
+    finally:
+        await backend.aclose()
 
 # Initialize FastMCP Server
-mcp = FastMCP("Verification_Server")
+mcp = FastMCP("Verification_Server", lifespan=lifespan)
 
 @mcp.tool()
-async def submit_verified_form(form_data: Dict[str, Any]) -> str:
+async def submit_verified_form(
+    form_data: Dict[str, Any],
+    idempotency_key: Optional[str] = None,
+    deadline_ms: Optional[float] = None,
+) -> Dict[str, Any]:
     """
     Production tool to submit verified form data to the MySQL backend.
     Accepts a dictionary of any size containing user details.
+    Returns status ('ok' / 'error'), HTTP status code, latency in ms, error detail, attempts,
+    whether it was deduplicated, and a `message` to show the user.
+    A repeated `idempotency_key` returns the original result without submitting again.
+    `deadline_ms` is how long the caller will wait: retries stop and the tool answers within it.
     """
     # This tool is only called after Human-in-the-loop approval
-    result = await post_to_mysql_api(form_data)
+    result = await post_to_mysql_api(form_data, idempotency_key, deadline_after(deadline_ms))
     return result
 
+@mcp.tool()
+async def submit_verified_forms_batch(
+    records: List[Dict[str, Any]],
+    ctx: Context,
+    max_concurrency: Optional[int] = None,
+    idempotency_keys: Optional[List[str]] = None,
+    deadline_ms: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Submits many verified records in one call (bulk imports, replays).
+    Returns totals plus, per record in input order: index, status ('ok' / 'error'),
+    HTTP status code, latency in ms, error detail and whether it was deduplicated.
+    `idempotency_keys` (parallel to `records`) skips records already submitted under the same key.
+    `deadline_ms` bounds the whole batch. Sends progress notifications while running.
+    """
+    async def progress(done: int, total: int):
+        await ctx.report_progress(done, total, f"{done}/{total} record(s) submitted")
+
+    deadline = deadline_after(deadline_ms)
+    return await submit_batch(records, max_concurrency, progress, idempotency_keys, deadline)
+
+@mcp.tool()
+async def backend_status() -> Dict[str, Any]:
+    """
+    Health of the form backend as seen by this server process: per-URL circuit breaker state
+    (closed / open / half_open), failure and slow-call rates, seconds until the next probe,
+    call / failure / rejection counters, and the retry policy in force.
+    """
+    return {"pid": os.getpid(), "breakers": breakers.stats(), "retry": retry_settings()}
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    # Liveness for load balancers and orchestrators (HTTP transport only)
+    states = {url: stats["state"] for url, stats in breakers.stats().items()}
+    return JSONResponse({"status": "ok", "pid": os.getpid(), "breakers": states})
+
+def create_app():
+    """
+    ASGI app for the streamable-HTTP transport, built once per uvicorn worker.
+
+    Stateless: every request is self-contained, so any worker behind the shared port can serve
+    any client's call (MCP sessions never pin a client to one process).
+    """
+    return mcp.http_app(path=os.getenv("MCP_HTTP_PATH", "/mcp"), stateless_http=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verification MCP server.")
+    parser.add_argument("--transport", default=os.getenv("MCP_TRANSPORT", "stdio"), choices=["stdio", "http"])
+    parser.add_argument("--host", default=os.getenv("MCP_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "8000")))
+    parser.add_argument("--path", default=os.getenv("MCP_HTTP_PATH", "/mcp"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_WORKERS", "1")),
+                        help="Worker processes sharing the port (HTTP transport)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    args = parse_args()
+    if args.transport == "stdio":
+        # Child process of one agent (default): the protocol runs over stdin/stdout
+        mcp.run()
+    else:
+        import uvicorn
+        # Workers are separate processes that import this module by name: settings travel via env
+        os.environ["MCP_HTTP_PATH"] = args.path
+        uvicorn.run(
+            "server:create_app", factory=True, app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host=args.host, port=args.port, workers=max(1, args.workers),
+            log_level=os.getenv("MCP_LOG_LEVEL", "INFO").lower(),
+        )
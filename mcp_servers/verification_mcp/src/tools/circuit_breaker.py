@@ -0,0 +1,126 @@
+# mcp_servers/verification_mcp/src/tools/circuit_breaker.py
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(f"circuit open for {url}, retry in {retry_after:.1f}s")
+        self.url = url
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate and slow-call breaker for one backend URL.
+
+    Closed: calls pass, outcomes of the last `window` calls are kept. Once `min_calls` are recorded
+    and the failure rate reaches `failure_rate` (or the share slower than `slow_call_ms` reaches
+    `slow_call_rate`) it opens. Open: calls are rejected at once for `open_seconds`. Half-open:
+    up to `half_open_probes` calls probe the backend; all succeeding closes it, any failing reopens it.
+    """
+    def __init__(self, url: str, window: int = 20, min_calls: int = 10, failure_rate: float = 0.5,
+                 slow_call_ms: float = 5000.0, slow_call_rate: float = 0.8, open_seconds: float = 30.0,
+                 half_open_probes: int = 1):
+        self.url = url
+        self.window = max(1, int(window))
+        self.min_calls = max(1, min(int(min_calls), self.window))
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, int(half_open_probes))
+
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=self.window)  # (failed, slow)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    def acquire(self):
+        """
+        Admits one call or raises CircuitOpenError. Every admitted call must end in `record` or `release`.
+        """
+        if self.state == OPEN:
+            retry_after = self._opened_at + self.open_seconds - time.monotonic()
+            if retry_after > 0:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.url, retry_after)
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes - self._probe_successes:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.url, 0.0)
+            self._probes_in_flight += 1
+
+    def release(self):
+        # Admitted call that ended without a verdict (cancelled): frees its probe slot
+        if self.state == HALF_OPEN and self._probes_in_flight:
+            self._probes_in_flight -= 1
+
+    def record(self, success: bool, latency_ms: float):
+        slow = latency_ms >= self.slow_call_ms
+        self.counters["calls"] += 1
+        self.counters["failures"] += not success
+        self.counters["slow_calls"] += slow
+
+        if self.state == HALF_OPEN:
+            self.release()
+            if not success:
+                self._transition(OPEN)
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+            return
+
+        self._outcomes.append((not success, slow))
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate or slow_rate >= self.slow_call_rate:
+                self._transition(OPEN)
+
+    def _rates(self) -> Tuple[float, float]:
+        total = len(self._outcomes) or 1
+        failed = sum(1 for f, _ in self._outcomes if f)
+        slow = sum(1 for _, s in self._outcomes if s)
+        return failed / total, slow / total
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        failure_rate, slow_rate = self._rates()
+        logger.warning(
+            f"Circuit for {self.url}: {self.state} -> {state} "
+            f"(failure rate {failure_rate:.0%}, slow rate {slow_rate:.0%} over {len(self._outcomes)} call(s))."
+        )
+        self.state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.counters["opened"] += 1
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        retry_after: Optional[float] = None
+        if self.state == OPEN:
+            retry_after = round(max(0.0, self._opened_at + self.open_seconds - time.monotonic()), 1)
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "retry_after": retry_after,
+            **self.counters,
+        }
@@ -1,37 +1,457 @@
 # mcp_servers/verification_mcp/src/tools/db_handler.py
+import asyncio
 import httpx
 import os
 import logging
-from typing import Dict, Any
+import random
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
-async def post_to_mysql_api(data: Dict[str, Any]) -> str:
-    url = os.getenv("FORM_SUBMIT_URL")
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            # INDUSTRY TIP: Some backends say they want Form but actually need JSON 
-            # or vice versa. We will force headers to be safe.
-            print(f"[MCP DEBUG]: Posting data to {url}: {data}")
-            
-            # Try sending as Form Data first (matches your Swagger screenshot)
-            response = await client.post(
-                url, 
-                data=data, 
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=15.0
+try:
+    import h2  # noqa: F401  httpx only speaks HTTP/2 when this is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.getenv(name)!r}, using {default}")
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(_env_float(name, default))
+
+
+class BackendClient:
+    """
+    One keep-alive httpx client to FORM_SUBMIT_URL for the life of the server process, so
+    submissions reuse pooled connections instead of paying a TCP+TLS handshake each.
+    Opened and closed by the FastMCP lifespan (created on first use otherwise).
+
+    Tunables (env): FORM_SUBMIT_TIMEOUT, FORM_SUBMIT_CONNECT_TIMEOUT, FORM_SUBMIT_MAX_CONNECTIONS,
+    FORM_SUBMIT_MAX_KEEPALIVE, FORM_SUBMIT_KEEPALIVE_EXPIRY, FORM_SUBMIT_HTTP2.
+    """
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def settings() -> Dict[str, Any]:
+        return {
+            "timeout": _env_float("FORM_SUBMIT_TIMEOUT", 15.0),
+            "connect_timeout": _env_float("FORM_SUBMIT_CONNECT_TIMEOUT", 5.0),
+            "max_connections": _env_int("FORM_SUBMIT_MAX_CONNECTIONS", 20),
+            "max_keepalive_connections": _env_int("FORM_SUBMIT_MAX_KEEPALIVE", 10),
+            "keepalive_expiry": _env_float("FORM_SUBMIT_KEEPALIVE_EXPIRY", 120.0),
+            "http2": os.getenv("FORM_SUBMIT_HTTP2", "true").strip().lower() in ("1", "true", "yes"),
+        }
+
+    async def start(self) -> httpx.AsyncClient:
+        if self.client is None or self.client.is_closed:
+            settings = self.settings()
+            self.client = httpx.AsyncClient(
+                http2=settings["http2"] and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings["max_connections"],
+                    max_keepalive_connections=settings["max_keepalive_connections"],
+                    keepalive_expiry=settings["keepalive_expiry"],
+                ),
+                timeout=httpx.Timeout(settings["timeout"], connect=settings["connect_timeout"]),
+            )
+            logger.info(
+                f"Backend client ready (http2={settings['http2'] and HTTP2_AVAILABLE}, "
+                f"max_connections={settings['max_connections']}, timeout={settings['timeout']}s)."
             )
-            
-            # If the backend actually wanted JSON, a 422 might happen. 
-            # Let's handle that or just raise for status.
-            response.raise_for_status()
-            
-            return f"✅ Success: Data for {data.get('full_name')} saved."
-
-        except httpx.HTTPStatusError as e:
-            # Catch the 422 and explain it
-            error_detail = e.response.text
-            return f"❌ Backend Error ({e.response.status_code}): {error_detail}"
+        return self.client
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+# Shared by every tool call in this server process
+backend = BackendClient()
+
+
+class RecentSubmissions:
+    """
+    Successful results by idempotency key for this server process (bounded LRU with a TTL), so a
+    repeated key is answered with the original result instead of a second POST. Concurrent calls
+    with the same key share the one request in flight. Failures are not kept: they may be retried.
+
+    Tunables (env): SUBMIT_DEDUP_MAX_ENTRIES, SUBMIT_DEDUP_TTL (seconds).
+    """
+    def __init__(self):
+        self.max_entries = _env_int("SUBMIT_DEDUP_MAX_ENTRIES", 10000)
+        self.ttl = _env_float("SUBMIT_DEDUP_TTL", 86400.0)
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        item = self._results.get(key)
+        if item is None:
+            return None
+        stored_at, result = item
+        if time.monotonic() - stored_at > self.ttl:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return {**result, "latency_ms": 0.0, "deduplicated": True}
+
+    def remember(self, key: str, result: Dict[str, Any]):
+        if result["status"] != "ok":
+            return
+        self._results[key] = (time.monotonic(), result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(self, key: Optional[str], submit: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        if not key:
+            return await submit()
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                return {**await asyncio.shield(pending), "deduplicated": True}
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The first caller was cancelled mid-request: nothing is known, so submit ourselves
+                return await self.run(key, submit)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await submit()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+        future.set_result(result)
+        self.remember(key, result)
+        return result
+
+# Shared by both submission tools in this server process
+recent = RecentSubmissions()
+
+
+class Breakers:
+    """
+    One CircuitBreaker per backend URL (single and bulk endpoints trip independently).
+
+    Tunables (env): FORM_BREAKER_WINDOW, FORM_BREAKER_MIN_CALLS, FORM_BREAKER_FAILURE_RATE,
+    FORM_BREAKER_SLOW_CALL_MS, FORM_BREAKER_SLOW_CALL_RATE, FORM_BREAKER_OPEN_SECONDS,
+    FORM_BREAKER_HALF_OPEN_PROBES.
+    """
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def settings() -> Dict[str, Any]:
+        return {
+            "window": _env_int("FORM_BREAKER_WINDOW", 20),
+            "min_calls": _env_int("FORM_BREAKER_MIN_CALLS", 10),
+            "failure_rate": _env_float("FORM_BREAKER_FAILURE_RATE", 0.5),
+            "slow_call_ms": _env_float("FORM_BREAKER_SLOW_CALL_MS", 5000.0),
+            "slow_call_rate": _env_float("FORM_BREAKER_SLOW_CALL_RATE", 0.8),
+            "open_seconds": _env_float("FORM_BREAKER_OPEN_SECONDS", 30.0),
+            "half_open_probes": _env_int("FORM_BREAKER_HALF_OPEN_PROBES", 1),
+        }
+
+    def get(self, url: str) -> CircuitBreaker:
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = self._breakers[url] = CircuitBreaker(url, **self.settings())
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {url: breaker.stats() for url, breaker in self._breakers.items()}
+
+# Shared by every tool call in this server process
+breakers = Breakers()
+
+
+def retry_settings() -> Dict[str, Any]:
+    return {
+        "retries": max(0, _env_int("FORM_SUBMIT_RETRIES", 2)),
+        "base_delay": _env_float("FORM_SUBMIT_RETRY_BASE_DELAY", 0.25),
+        "max_delay": _env_float("FORM_SUBMIT_RETRY_MAX_DELAY", 4.0),
+    }
+
+
+def deadline_after(budget_ms: Optional[float]) -> Optional[float]:
+    """
+    Caller's remaining budget (ms) -> absolute time.monotonic() deadline, or None for no deadline.
+    """
+    return time.monotonic() + budget_ms / 1000 if budget_ms else None
+
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+# Backend error bodies are cut to this length in batch results
+ERROR_DETAIL_CHARS = 500
+# Answers meaning the request was not processed: always safe to send again
+SAFE_RETRY_STATUS = {408, 425, 429, 503}
+# The request may have been processed: sent again only when it carries an idempotency key
+AMBIGUOUS_RETRY_STATUS = {500, 502, 504}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+async def _call_backend(
+    url: Optional[str],
+    send: Callable[[httpx.Timeout], Awaitable[httpx.Response]],
+    resend_ambiguous: bool,
+    deadline: Optional[float],
+) -> Dict[str, Any]:
+    """
+    Sends one request through the URL's circuit breaker, retrying retryable failures with
+    jittered exponential backoff (or the backend's Retry-After) while the deadline allows.
+    Each attempt's timeout is cut to the time left, and no retry starts that could not finish.
+    """
+    started = time.perf_counter()
+    if not url:
+        return _result("error", None, started, "backend URL is not configured", attempts=0)
+
+    breaker = breakers.get(url)
+    policy = retry_settings()
+    settings = backend.settings()
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return _result("error", None, started, "deadline exceeded before the backend answered", attempt - 1)
+        try:
+            breaker.acquire()
+        except CircuitOpenError as e:
+            # Fail fast: the backend is known to be sick, don't tie up this session waiting on it
+            return {**_result("error", None, started, str(e), attempt - 1), "retry_after": round(e.retry_after, 1)}
+
+        timeout = settings["timeout"] if remaining is None else min(settings["timeout"], remaining)
+        attempt_started = time.perf_counter()
+        response, retry_after = None, None
+        try:
+            response = await send(httpx.Timeout(timeout, connect=min(settings["connect_timeout"], timeout)))
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # Never reached the backend
+            error, retry = str(e) or type(e).__name__, True
+        except httpx.TransportError as e:
+            # Sent, but the answer was lost: the backend may have processed it
+            error, retry = str(e) or type(e).__name__, resend_ambiguous
         except Exception as e:
-            return f"❌ Connection Error: {str(e)}"
\ No newline at end of file
+            breaker.release()
+            return _result("error", None, started, str(e), attempt)
+        latency_ms = (time.perf_counter() - attempt_started) * 1000
+
+        if response is None:
+            breaker.record(False, latency_ms)
+            code = None
+        else:
+            code = response.status_code
+            # A 4xx rejection is the record's fault, not a sign of a sick backend
+            breaker.record(code < 500 and code not in SAFE_RETRY_STATUS, latency_ms)
+            if response.is_success:
+                return _result("ok", code, started, attempts=attempt)
+            error = response.text
+            retry = code in SAFE_RETRY_STATUS or (resend_ambiguous and code in AMBIGUOUS_RETRY_STATUS)
+            retry_after = _retry_after(response)
+
+        if not retry or attempt > policy["retries"]:
+            return _result("error", code, started, error, attempt)
+        backoff = random.uniform(0, policy["base_delay"] * 2 ** (attempt - 1))
+        delay = min(policy["max_delay"], retry_after if retry_after is not None else backoff)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return _result("error", code, started, error, attempt)
+        logger.info(f"Attempt {attempt} to {url} failed ({code or error}); retrying in {delay:.2f}s.")
+        await asyncio.sleep(delay)
+
+
+async def submit_record(data: Dict[str, Any], idempotency_key: Optional[str] = None,
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    POSTs one record to FORM_SUBMIT_URL -> {status, status_code, latency_ms, error, attempts, deduplicated}
+    (plus `retry_after` when the circuit is open). With `idempotency_key`, the key is sent as the
+    Idempotency-Key header, ambiguous failures may be retried, and a repeat within this process
+    returns the original result without posting again. `deadline` is a time.monotonic() value.
+    """
+    return await recent.run(idempotency_key, lambda: _post_record(data, idempotency_key, deadline))
+
+
+async def _post_record(data: Dict[str, Any], idempotency_key: Optional[str], deadline: Optional[float]) -> Dict[str, Any]:
+    url = os.getenv("FORM_SUBMIT_URL")
+    headers = {**FORM_HEADERS, "Idempotency-Key": idempotency_key} if idempotency_key else FORM_HEADERS
+    client = await backend.start()
+
+    # INDUSTRY TIP: Some backends say they want Form but actually need JSON 
+    # or vice versa. We will force headers to be safe.
+    # Field names only: on stdio transport stdout is the MCP channel, and values are personal data
+    logger.debug(f"Posting {len(data)} field(s) to {url}: {sorted(data)}")
+
+    # Try sending as Form Data first (matches your Swagger screenshot)
+    # If the backend actually wanted JSON, a 422 comes back as a non-retryable error.
+    return await _call_backend(
+        url,
+        lambda timeout: client.post(url, data=data, headers=headers, timeout=timeout),
+        resend_ambiguous=bool(idempotency_key),
+        deadline=deadline,
+    )
+
+
+def _result(status: str, status_code: Optional[int], started: float, error: Optional[str] = None,
+            attempts: int = 1) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "status_code": status_code,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "error": error,
+        "attempts": attempts,
+        "deduplicated": False,
+    }
+
+
+async def post_to_mysql_api(data: Dict[str, Any], idempotency_key: Optional[str] = None,
+                            deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    `submit_record`'s result plus a `message` for the user; callers branch on `status`, never on the text.
+    """
+    result = await submit_record(data, idempotency_key, deadline)
+    return {**result, "message": _describe(result, data)}
+
+
+def _describe(result: Dict[str, Any], data: Dict[str, Any]) -> str:
+    if result["status"] == "ok":
+        if result["deduplicated"]:
+            return f"✅ Success: Data for {data.get('full_name')} was already saved."
+        return f"✅ Success: Data for {data.get('full_name')} saved."
+    if result.get("retry_after") is not None:
+        return f"❌ Backend Unavailable: {result['error']}"
+    if result["status_code"] is not None:
+        # Catch the 422 and explain it
+        return f"❌ Backend Error ({result['status_code']}): {result['error']}"
+    return f"❌ Connection Error: {result['error']}"
+
+
+async def _submit_chunk(records: List[Dict[str, Any]], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    One POST of many records to FORM_SUBMIT_BULK_URL (JSON array); the outcome applies to every record in it.
+    """
+    url = os.getenv("FORM_SUBMIT_BULK_URL")
+    client = await backend.start()
+    # The bulk body carries no idempotency keys, so a possibly-processed chunk is never resent
+    result = await _call_backend(
+        url, lambda timeout: client.post(url, json=records, timeout=timeout),
+        resend_ambiguous=False, deadline=deadline,
+    )
+    return [dict(result) for _ in records]
+
+
+async def submit_batch(
+    records: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    idempotency_keys: Optional[List[str]] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Submits many records with bounded concurrency: one POST each, or chunks of
+    FORM_SUBMIT_BULK_SIZE to FORM_SUBMIT_BULK_URL when a bulk endpoint is configured.
+    `idempotency_keys[i]` (optional, "" for none) dedups record i like `submit_record`;
+    `deadline` (time.monotonic()) bounds the whole batch, queueing included.
+    `progress(done, total)` is awaited about every 5% of the batch.
+    """
+    total = len(records)
+    keys = list(idempotency_keys or [])[:total]
+    keys += [""] * (total - len(keys))
+    limit = max_concurrency or _env_int("FORM_SUBMIT_BATCH_CONCURRENCY", 8)
+    # More parallel requests than pooled connections would only queue inside httpx
+    semaphore = asyncio.Semaphore(max(1, min(limit, backend.settings()["max_connections"])))
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    done = 0
+    step = max(1, total // 20)
+    started = time.perf_counter()
+
+    async def report(count: int):
+        nonlocal done
+        before, done = done, done + count
+        if progress is not None and (done // step > before // step or done == total):
+            try:
+                await progress(done, total)
+            except Exception as e:
+                logger.warning(f"Batch progress notification failed: {e}")
+
+    async def one(index: int, record: Any):
+        if not isinstance(record, dict):
+            results[index] = {"status": "error", "status_code": None, "latency_ms": 0.0,
+                              "error": "record is not an object", "attempts": 0, "deduplicated": False}
+        else:
+            async with semaphore:
+                results[index] = await submit_record(record, keys[index], deadline)
+        await report(1)
+
+    async def chunk(indexes: List[int]):
+        async with semaphore:
+            outcomes = await _submit_chunk([records[i] for i in indexes], deadline)
+        for index, outcome in zip(indexes, outcomes):
+            results[index] = outcome
+            if keys[index]:
+                recent.remember(keys[index], outcome)
+        await report(len(indexes))
+
+    if os.getenv("FORM_SUBMIT_BULK_URL"):
+        size = max(1, _env_int("FORM_SUBMIT_BULK_SIZE", 100))
+        valid = []
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                continue
+            # The bulk body has no per-record header, so repeats are filtered out before chunking
+            cached = recent.get(keys[i]) if keys[i] else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                valid.append(i)
+        if len(valid) < total:
+            await report(sum(1 for r in results if r is not None))
+        jobs = [chunk(valid[i:i + size]) for i in range(0, len(valid), size)]
+        jobs += [one(i, record) for i, record in enumerate(records) if not isinstance(record, dict)]
+    else:
+        jobs = [one(i, record) for i, record in enumerate(records)]
+    await asyncio.gather(*jobs)
+
+    for index, result in enumerate(results):
+        error = result["error"]
+        results[index] = {"index": index, **result, "error": error[:ERROR_DETAIL_CHARS] if error else None}
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    deduplicated = sum(1 for r in results if r["deduplicated"])
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Batch of {total} record(s): {succeeded} ok ({deduplicated} deduplicated), "
+        f"{total - succeeded} failed in {elapsed:.2f}s."
+    )
+    return {
+        "total": total,
+        "succeeded": succeeded,
+        "failed": total - succeeded,
+        "deduplicated": deduplicated,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "results": results,
+    }
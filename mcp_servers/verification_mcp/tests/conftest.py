@@ -0,0 +1,67 @@
+import asyncio
+from collections import OrderedDict
+import os
+import sys
+import httpx
+import pytest
+
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# `server` and `tools.db_handler` import the way the server does when launched as a script
+sys.path.insert(0, os.path.join(SERVER_ROOT, "src"))
+
+from tools import db_handler
+
+SUBMIT_URL = "http://backend.test/form-submit"
+BULK_URL = "http://backend.test/form-submit/bulk"
+
+
+class FakeBackend:
+    """
+    Stands in for the form backend behind httpx.MockTransport.
+    `responses` is consumed first (a status code, an httpx.Response or an exception to raise),
+    then every request gets 200.
+    """
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            outcome = self.responses.pop(0) if self.responses else 200
+            if isinstance(outcome, Exception):
+                raise outcome
+            if isinstance(outcome, httpx.Response):
+                return outcome
+            return httpx.Response(outcome, text="ok" if outcome < 400 else f"error {outcome}")
+        finally:
+            self.in_flight -= 1
+
+    def to(self, url: str) -> list:
+        return [r for r in self.requests if str(r.url) == url]
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """
+    Fresh process-wide state (client, breakers, dedup store) wired to a FakeBackend,
+    with no retry backoff so tests never sleep.
+    """
+    fake = FakeBackend()
+    monkeypatch.setenv("FORM_SUBMIT_URL", SUBMIT_URL)
+    monkeypatch.delenv("FORM_SUBMIT_BULK_URL", raising=False)
+    monkeypatch.setenv("FORM_SUBMIT_RETRY_BASE_DELAY", "0")
+    # Emptied in place: server.py holds its own references to these singletons
+    monkeypatch.setattr(db_handler.breakers, "_breakers", {})
+    monkeypatch.setattr(db_handler.recent, "_results", OrderedDict())
+    monkeypatch.setattr(db_handler.recent, "_in_flight", {})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(db_handler.backend, "client", client)
+    return fake
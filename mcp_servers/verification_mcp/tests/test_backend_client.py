@@ -0,0 +1,75 @@
+import asyncio
+import urllib.parse
+import server
+from tools import db_handler
+from tools.db_handler import BackendClient
+from conftest import SUBMIT_URL
+
+
+def test_settings_come_from_env_with_defaults_for_bad_values(monkeypatch):
+    monkeypatch.setenv("FORM_SUBMIT_TIMEOUT", "3.5")
+    monkeypatch.setenv("FORM_SUBMIT_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("FORM_SUBMIT_MAX_KEEPALIVE", "not-a-number")
+    monkeypatch.setenv("FORM_SUBMIT_HTTP2", "false")
+
+    settings = BackendClient.settings()
+
+    assert settings["timeout"] == 3.5
+    assert settings["max_connections"] == 7
+    assert settings["max_keepalive_connections"] == 10
+    assert settings["http2"] is False
+
+
+def test_one_client_is_reused_until_closed(monkeypatch):
+    monkeypatch.setenv("FORM_SUBMIT_TIMEOUT", "4")
+    monkeypatch.setenv("FORM_SUBMIT_CONNECT_TIMEOUT", "1.5")
+
+    async def scenario():
+        backend = BackendClient()
+        first = await backend.start()
+        second = await backend.start()
+        timeout = first.timeout
+        await backend.aclose()
+        closed_client = backend.client
+        third = await backend.start()
+        await backend.aclose()
+        return first, second, third, timeout, closed_client, first.is_closed
+
+    first, second, third, timeout, closed_client, first_closed = asyncio.run(scenario())
+
+    assert first is second
+    assert (timeout.read, timeout.connect) == (4.0, 1.5)
+    assert closed_client is None and first_closed
+    assert third is not first
+
+
+def test_lifespan_opens_and_closes_the_shared_client(monkeypatch):
+    monkeypatch.setattr(db_handler.backend, "client", None)
+
+    async def scenario():
+        async with server.lifespan(server.mcp):
+            client = db_handler.backend.client
+            opened = client is not None and not client.is_closed
+        return opened, client.is_closed, db_handler.backend.client
+
+    opened, closed, after = asyncio.run(scenario())
+
+    assert opened and closed
+    assert after is None
+
+
+def test_submissions_share_the_client_and_keep_stdout_clean(fake_backend, capsys):
+    record = {"full_name": "Jane Doe", "email": "jane@example.com"}
+
+    async def scenario():
+        return [await db_handler.submit_record(record) for _ in range(3)]
+
+    results = asyncio.run(scenario())
+
+    assert [r["status"] for r in results] == ["ok"] * 3
+    assert len(fake_backend.to(SUBMIT_URL)) == 3
+    request = fake_backend.requests[0]
+    assert request.headers["content-type"] == "application/x-www-form-urlencoded"
+    assert dict(urllib.parse.parse_qsl(request.content.decode())) == record
+    # stdout is the MCP channel on stdio transport
+    assert capsys.readouterr().out == ""
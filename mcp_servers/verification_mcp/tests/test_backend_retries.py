@@ -0,0 +1,105 @@
+import asyncio
+import time
+import httpx
+from fastmcp import Client
+import server
+from tools import db_handler
+from conftest import SUBMIT_URL
+
+RECORD = {"full_name": "Jane Doe"}
+
+
+def submit(key=None, deadline_s=None) -> dict:
+    async def scenario():
+        deadline = time.monotonic() + deadline_s if deadline_s else None
+        return await db_handler.submit_record(RECORD, key, deadline)
+
+    return asyncio.run(scenario())
+
+
+def test_unprocessed_answers_are_retried(fake_backend):
+    fake_backend.responses = [503, 429]
+
+    result = submit()
+
+    assert (result["status"], result["attempts"]) == ("ok", 3)
+
+
+def test_retries_stop_at_the_configured_count(fake_backend, monkeypatch):
+    monkeypatch.setenv("FORM_SUBMIT_RETRIES", "1")
+    fake_backend.responses = [503, 503, 503]
+
+    result = submit()
+
+    assert (result["status"], result["status_code"], result["attempts"]) == ("error", 503, 2)
+
+
+def test_rejections_are_not_retried(fake_backend):
+    fake_backend.responses = [422]
+
+    result = submit()
+
+    assert (result["status"], result["status_code"], result["attempts"]) == ("error", 422, 1)
+    # The record's fault, not the backend's
+    assert db_handler.breakers.get(SUBMIT_URL).stats()["failures"] == 0
+
+
+def test_possibly_processed_requests_are_resent_only_with_a_key(fake_backend):
+    lost = httpx.ReadTimeout("lost answer")
+    fake_backend.responses = [500, lost, 500, lost]
+
+    without_key = submit()
+    lost_without_key = submit()
+    with_key = submit(key="key-1")
+
+    assert (without_key["status"], without_key["attempts"]) == ("error", 1)
+    assert (with_key["status"], with_key["attempts"]) == ("ok", 3)
+    assert (lost_without_key["status"], lost_without_key["attempts"]) == ("error", 1)
+
+
+def test_connection_failures_are_always_retried(fake_backend):
+    fake_backend.responses = [httpx.ConnectError("refused")]
+
+    result = submit()
+
+    assert (result["status"], result["attempts"]) == ("ok", 2)
+
+
+def test_retry_after_past_the_deadline_gives_up_at_once(fake_backend):
+    fake_backend.responses = [httpx.Response(503, headers={"Retry-After": "3"}, text="busy")]
+
+    started = time.monotonic()
+    result = submit(deadline_s=1.0)
+
+    assert (result["status"], result["attempts"]) == ("error", 1)
+    assert time.monotonic() - started < 0.5
+
+
+def test_attempt_timeout_is_cut_to_the_deadline(fake_backend):
+    submit(deadline_s=2.0)
+
+    timeout = fake_backend.requests[0].extensions["timeout"]
+    assert 0 < timeout["read"] <= 2.0
+    assert timeout["connect"] <= 2.0
+
+
+def test_open_circuit_fails_fast_without_calling_the_backend(fake_backend, monkeypatch):
+    monkeypatch.setenv("FORM_BREAKER_MIN_CALLS", "2")
+    monkeypatch.setenv("FORM_SUBMIT_RETRIES", "0")
+    fake_backend.responses = [503, 503]
+
+    async def scenario():
+        outcomes = [await db_handler.post_to_mysql_api(RECORD) for _ in range(3)]
+        async with Client(server.mcp) as client:
+            status = (await client.call_tool("backend_status", {})).structured_content
+        return outcomes, status
+
+    outcomes, status = asyncio.run(scenario())
+
+    rejected = outcomes[-1]
+    assert len(fake_backend.requests) == 2
+    assert rejected["attempts"] == 0 and rejected["retry_after"] > 0
+    assert rejected["message"].startswith("❌ Backend Unavailable: circuit open")
+    breaker = status["breakers"][SUBMIT_URL]
+    assert (breaker["state"], breaker["rejected"], breaker["failures"]) == ("open", 1, 2)
+    assert status["retry"]["retries"] == 0
@@ -0,0 +1,85 @@
+import asyncio
+import json
+from fastmcp import Client
+import server
+from tools import db_handler
+from conftest import BULK_URL, SUBMIT_URL
+
+
+def records(count: int) -> list:
+    return [{"full_name": f"Person {i}", "email": f"p{i}@example.com"} for i in range(count)]
+
+
+def test_concurrency_is_bounded_and_results_keep_input_order(fake_backend):
+    fake_backend.delay = 0.01
+    # Record 2 is rejected by the backend, record 4 is not an object
+    fake_backend.responses = [200, 200, 422]
+    batch = records(4) + ["not a record"] + records(3)
+
+    report = asyncio.run(db_handler.submit_batch(batch, max_concurrency=2))
+
+    assert fake_backend.max_in_flight == 2
+    assert len(fake_backend.to(SUBMIT_URL)) == 7
+    assert [r["index"] for r in report["results"]] == list(range(8))
+    assert report["results"][2]["status"] == "error"
+    assert report["results"][2]["status_code"] == 422
+    assert report["results"][4] == {
+        "index": 4, "status": "error", "status_code": None, "latency_ms": 0.0,
+        "error": "record is not an object", "attempts": 0, "deduplicated": False,
+    }
+    assert (report["total"], report["succeeded"], report["failed"]) == (8, 6, 2)
+
+
+def test_bulk_endpoint_gets_chunks_and_skips_known_keys(fake_backend, monkeypatch):
+    monkeypatch.setenv("FORM_SUBMIT_BULK_URL", BULK_URL)
+    monkeypatch.setenv("FORM_SUBMIT_BULK_SIZE", "2")
+    batch = records(5)
+    keys = ["k0", "k1", "k2", "k3", "k4"]
+
+    async def scenario():
+        first = await db_handler.submit_batch(batch, idempotency_keys=keys)
+        # Same keys again plus one new record: only the new one is sent
+        second = await db_handler.submit_batch(batch + records(1), idempotency_keys=keys)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    posts = fake_backend.to(BULK_URL)
+    assert [len(json.loads(p.content)) for p in posts] == [2, 2, 1, 1]
+    assert fake_backend.to(SUBMIT_URL) == []
+    assert first["succeeded"] == 5 and first["deduplicated"] == 0
+    assert second["succeeded"] == 6 and second["deduplicated"] == 5
+    assert second["results"][5]["deduplicated"] is False
+
+
+def test_progress_is_reported_in_steps_up_to_the_total(fake_backend):
+    seen = []
+
+    async def progress(done, total):
+        seen.append((done, total))
+
+    asyncio.run(db_handler.submit_batch(records(40), max_concurrency=4, progress=progress))
+
+    assert seen[-1] == (40, 40)
+    assert [done for done, _ in seen] == sorted(done for done, _ in seen)
+    # About every 5% of the batch, not once per record
+    assert len(seen) == 20
+
+
+def test_batch_tool_streams_progress_to_the_client(fake_backend):
+    seen = []
+
+    async def on_progress(progress, total, message):
+        seen.append((progress, total, message))
+
+    async def scenario():
+        async with Client(server.mcp) as client:
+            return await client.call_tool(
+                "submit_verified_forms_batch", {"records": records(3)}, progress_handler=on_progress,
+            )
+
+    result = asyncio.run(scenario())
+
+    assert result.structured_content["succeeded"] == 3
+    assert [r["status"] for r in result.structured_content["results"]] == ["ok"] * 3
+    assert seen[-1] == (3, 3, "3/3 record(s) submitted")
@@ -0,0 +1,98 @@
+import pytest
+from tools import circuit_breaker
+from tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def calls(breaker: CircuitBreaker, outcomes, latency_ms: float = 10.0):
+    for success in outcomes:
+        breaker.acquire()
+        breaker.record(success, latency_ms)
+
+
+def test_stays_closed_until_min_calls_then_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker("u", window=10, min_calls=4, failure_rate=0.5)
+
+    calls(breaker, [False, False, False])
+    assert breaker.state == CLOSED
+    calls(breaker, [True])
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.acquire()
+    assert rejected.value.retry_after == pytest.approx(30.0)
+    assert breaker.stats()["rejected"] == 1 and breaker.stats()["opened"] == 1
+
+
+def test_slow_calls_open_it_even_when_they_succeed(clock):
+    breaker = CircuitBreaker("u", window=4, min_calls=4, slow_call_ms=100, slow_call_rate=0.75)
+
+    calls(breaker, [True, True, True], latency_ms=250)
+    calls(breaker, [True], latency_ms=5)
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["slow_calls"] == 3
+
+
+def test_only_the_last_window_counts(clock):
+    breaker = CircuitBreaker("u", window=4, min_calls=4, failure_rate=0.5)
+
+    calls(breaker, [False, True, True, True, True, True])
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["failure_rate"] == 0.0
+
+
+def test_half_open_probe_success_closes_it(clock):
+    breaker = CircuitBreaker("u", window=2, min_calls=2, open_seconds=30, half_open_probes=1)
+    calls(breaker, [False, False])
+
+    clock.now += 30
+    breaker.acquire()
+    assert breaker.state == HALF_OPEN
+    # One probe at a time: everyone else still fails fast
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record(True, 10)
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_half_open_probe_failure_reopens_it(clock):
+    breaker = CircuitBreaker("u", window=2, min_calls=2, open_seconds=30)
+    calls(breaker, [False, False])
+
+    clock.now += 31
+    breaker.acquire()
+    breaker.record(False, 10)
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["retry_after"] == 30.0
+    assert breaker.stats()["opened"] == 2
+
+
+def test_released_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker("u", window=2, min_calls=2, open_seconds=30)
+    calls(breaker, [False, False])
+    clock.now += 30
+
+    breaker.acquire()
+    breaker.release()
+    breaker.acquire()
+
+    assert breaker.state == HALF_OPEN
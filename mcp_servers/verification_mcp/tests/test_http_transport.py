@@ -0,0 +1,85 @@
+import asyncio
+import json
+import sys
+import httpx
+import server
+from conftest import SUBMIT_URL
+
+ACCEPT = {"Accept": "application/json, text/event-stream"}
+
+
+def tool_call(name: str, arguments: dict, request_id: int = 1) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+
+def sse_result(response: httpx.Response) -> dict:
+    data = next(line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: "))
+    return json.loads(data)["result"]
+
+
+async def serve(app, requests):
+    """
+    Runs the app's lifespan (session manager, backend client) around `requests(client)`.
+    """
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mcp.test") as client:
+            return await requests(client)
+
+
+def test_calls_need_no_session_so_any_worker_can_serve_them(fake_backend):
+    async def requests(client):
+        # No initialize and no Mcp-Session-Id: each POST stands alone
+        return [
+            await client.post("/mcp", json=tool_call("submit_verified_form", {"form_data": {"full_name": f"P{i}"}}, i),
+                              headers=ACCEPT)
+            for i in range(2)
+        ]
+
+    responses = asyncio.run(serve(server.create_app(), requests))
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert all("mcp-session-id" not in r.headers for r in responses)
+    assert [sse_result(r)["structuredContent"]["status"] for r in responses] == ["ok", "ok"]
+    assert len(fake_backend.to(SUBMIT_URL)) == 2
+
+
+def test_health_reports_breaker_states(fake_backend):
+    async def requests(client):
+        await client.post("/mcp", json=tool_call("submit_verified_form", {"form_data": {"full_name": "P"}}),
+                          headers=ACCEPT)
+        return await client.get("/health")
+
+    health = asyncio.run(serve(server.create_app(), requests)).json()
+
+    assert health["status"] == "ok"
+    assert health["breakers"] == {SUBMIT_URL: "closed"}
+
+
+def test_endpoint_path_comes_from_env(fake_backend, monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_PATH", "/verification")
+
+    async def requests(client):
+        listed = await client.post("/verification", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+                                   headers=ACCEPT)
+        missing = await client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=ACCEPT)
+        return listed, missing
+
+    listed, missing = asyncio.run(serve(server.create_app(), requests))
+
+    names = {tool["name"] for tool in sse_result(listed)["tools"]}
+    assert {"submit_verified_form", "submit_verified_forms_batch", "backend_status"} <= names
+    assert missing.status_code == 404
+
+
+def test_cli_defaults_come_from_env(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["server.py"])
+    monkeypatch.setenv("MCP_TRANSPORT", "http")
+    monkeypatch.setenv("MCP_PORT", "9100")
+    monkeypatch.setenv("MCP_WORKERS", "4")
+
+    args = server.parse_args()
+
+    assert (args.transport, args.port, args.workers, args.path) == ("http", 9100, 4, "/mcp")
+    monkeypatch.setattr(sys, "argv", ["server.py", "--transport", "stdio", "--workers", "2"])
+    assert (server.parse_args().transport, server.parse_args().workers) == ("stdio", 2)
@@ -0,0 +1,67 @@
+import asyncio
+from fastmcp import Client
+import server
+from tools import db_handler
+from conftest import SUBMIT_URL
+
+RECORD = {"full_name": "Jane Doe", "email": "jane@example.com"}
+
+
+def call(arguments: dict) -> dict:
+    async def scenario():
+        async with Client(server.mcp) as client:
+            return (await client.call_tool("submit_verified_form", arguments)).structured_content
+
+    return asyncio.run(scenario())
+
+
+def test_tool_returns_a_structured_status(fake_backend):
+    result = call({"form_data": RECORD})
+
+    assert result["status"] == "ok"
+    assert result["status_code"] == 200
+    assert result["deduplicated"] is False
+    assert result["message"] == "✅ Success: Data for Jane Doe saved."
+
+
+def test_rejection_is_an_error_status_with_the_backend_detail(fake_backend):
+    fake_backend.responses = [422]
+
+    result = call({"form_data": RECORD})
+
+    assert (result["status"], result["status_code"], result["attempts"]) == ("error", 422, 1)
+    assert result["message"] == "❌ Backend Error (422): error 422"
+
+
+def test_repeated_idempotency_key_is_answered_without_posting(fake_backend):
+    first = call({"form_data": RECORD, "idempotency_key": "key-1"})
+    again = call({"form_data": RECORD, "idempotency_key": "key-1"})
+
+    assert len(fake_backend.to(SUBMIT_URL)) == 1
+    assert fake_backend.requests[0].headers["idempotency-key"] == "key-1"
+    assert first["deduplicated"] is False and again["deduplicated"] is True
+    assert again["message"] == "✅ Success: Data for Jane Doe was already saved."
+
+
+def test_concurrent_repeats_share_one_request(fake_backend):
+    fake_backend.delay = 0.05
+
+    async def scenario():
+        return await asyncio.gather(*(db_handler.submit_record(RECORD, "key-1") for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert len(fake_backend.requests) == 1
+    assert [r["deduplicated"] for r in results] == [False, True, True]
+
+
+def test_failures_are_not_remembered(fake_backend):
+    fake_backend.responses = [422]
+
+    async def scenario():
+        return [await db_handler.submit_record(RECORD, "key-1") for _ in range(2)]
+
+    failed, retried = asyncio.run(scenario())
+
+    assert failed["status"] == "error" and retried["status"] == "ok"
+    assert len(fake_backend.requests) == 2